@@ -23,6 +23,20 @@ SCRAPER_ITEMS_SCRAPED_TOTAL = Counter(
     ['site', 'type']
 )
 
+# Counter for SPA static probe outcomes, labeled by site and the path chosen (static, spa)
+SCRAPER_STATIC_PROBE_TOTAL = Counter(
+    'scraper_static_probe_total',
+    'Total number of SPA scrapes by whether a plain HTTP fetch was enough or the browser was needed',
+    ['site', 'path']
+)
+
+# Counter for the browser time saved by serving SPA sites statically, labeled by site
+SCRAPER_BROWSER_SECONDS_SAVED_TOTAL = Counter(
+    'scraper_browser_seconds_saved_total',
+    'Estimated browser rendering seconds saved by scraping SPA sites over plain HTTP',
+    ['site']
+)
+
 # --- Crawler Metrics ---
 
 # Counter for total URLs discovered, labeled by site
@@ -39,6 +53,28 @@ CRAWLER_URLS_VISITED_TOTAL = Counter(
     ['site']
 )
 
+# Counter for items scraped from crawled pages, labeled by site and crawl strategy
+CRAWLER_ITEMS_FOUND_TOTAL = Counter(
+    'crawler_items_found_total',
+    'Total number of items scraped from pages visited by the crawler',
+    ['site', 'strategy']
+)
+
+# Histogram of items scraped per fetched page, for comparing crawl strategies
+CRAWLER_ITEMS_PER_PAGE = Histogram(
+    'crawler_items_per_page',
+    'Histogram of items scraped per page fetched by the crawler',
+    ['site', 'strategy'],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100)
+)
+
+# Counter for crawled pages skipped as near-duplicates of earlier pages, labeled by site
+CRAWLER_NEAR_DUPLICATES_TOTAL = Counter(
+    'crawler_near_duplicates_total',
+    'Total number of crawled pages not parsed because they nearly duplicate an earlier page',
+    ['site']
+)
+
 # --- API Metrics (example) ---
 
 # Counter for total API requests, labeled by endpoint and status code
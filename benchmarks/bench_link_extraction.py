@@ -0,0 +1,65 @@
+"""
+Benchmark: BeautifulSoup link extraction vs. the lxml LinkExtractor.
+
+Builds synthetic listing pages of increasing size, checks that both
+extractors return the same set of absolute URLs and reports the time per
+page and the speedup.
+
+Usage:
+    python -m benchmarks.bench_link_extraction
+"""
+import timeit
+from typing import Set
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup
+
+from crawler.link_extractor import LinkExtractor
+
+BASE_URL = "https://shop.example.com/catalog/phones/"
+
+
+def build_listing_page(num_items: int) -> str:
+    """Builds a product listing page with navigation, cards and a footer."""
+    nav = "".join(f'<li><a href="/catalog/category-{i}/">Category {i}</a></li>' for i in range(50))
+    cards = "".join(
+        f'<article class="prd"><a class="core" href="/product-{i}-sku{i}.html?ref=listing#reviews">'
+        f'<img src="/img/{i}.jpg" alt="Product {i}"><h3 class="name">Phone model {i}</h3></a>'
+        f'<div class="prc">KSh {1000 + i}</div><a href="/seller/{i % 40}" rel="nofollow">Seller</a>'
+        f'<p>Free delivery on orders above KSh 2,000. <b>Official store</b></p></article>'
+        for i in range(num_items)
+    )
+    footer = "".join(f'<a href="https://partner{i}.example.org/">Partner {i}</a>' for i in range(30))
+    return (
+        f"<!DOCTYPE html><html><head><title>Phones</title></head><body>"
+        f"<nav><ul>{nav}</ul></nav><main>{cards}</main><footer>{footer}</footer></body></html>"
+    )
+
+
+def extract_links_bs4(html_content: str, base_url: str) -> Set[str]:
+    """The original CrawlerEngine._extract_links implementation."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    links: Set[str] = set()
+    for a_tag in soup.find_all('a', href=True):
+        absolute_link = urljoin(base_url, a_tag['href'])
+        links.add(urlparse(absolute_link)._replace(fragment="").geturl())
+    return links
+
+
+def main():
+    extractor = LinkExtractor()
+    print(f"{'items':>6} {'page KB':>8} {'links':>6} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8}")
+    for num_items in (100, 500, 2000, 5000):
+        page = build_listing_page(num_items)
+        expected = extract_links_bs4(page, BASE_URL)
+        assert extractor.extract(page, BASE_URL) == expected, "extractors disagree"
+
+        repeats = max(3, 2000 // num_items)
+        bs4_time = min(timeit.repeat(lambda: extract_links_bs4(page, BASE_URL), number=repeats, repeat=3)) / repeats
+        lxml_time = min(timeit.repeat(lambda: extractor.extract(page, BASE_URL), number=repeats, repeat=3)) / repeats
+        print(f"{num_items:>6} {len(page) / 1024:>8.0f} {len(expected):>6} "
+              f"{bs4_time * 1000:>9.2f} {lxml_time * 1000:>9.2f} {bs4_time / lxml_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: per-pattern regex loop vs. the combined PatternMatcher.
+
+Generates include/exclude rule sets of increasing size in the style of the
+site configs (literal path segments, product URL regexes, file-type
+suffixes), checks that both approaches accept the same URLs and reports the
+cost per link.
+
+Usage:
+    python -m benchmarks.bench_url_filter
+"""
+import random
+import re
+import timeit
+from typing import List
+
+from crawler.pattern_matcher import PatternMatcher
+
+SECTIONS = ["phones", "laptops", "fashion", "home", "beauty", "toys", "garden", "sports", "books", "audio"]
+
+
+def build_patterns(count: int) -> List[str]:
+    """Builds a mix of literal, prefix-plus-regex and suffix patterns."""
+    patterns = []
+    for i in range(count):
+        section = SECTIONS[i % len(SECTIONS)]
+        kind = i % 4
+        if kind == 0:
+            patterns.append(f"/{section}-{i}/")
+        elif kind == 1:
+            patterns.append(rf"/{section}/[a-z0-9-]+-{i}\.html$")
+        elif kind == 2:
+            patterns.append(rf"^https://shop\.example\.com/{section}/page/{i}")
+        else:
+            patterns.append(rf"\.{section[:3]}{i}$")
+    return patterns
+
+
+def build_urls(count: int) -> List[str]:
+    rng = random.Random(7)
+    urls = []
+    for _ in range(count):
+        section = rng.choice(SECTIONS)
+        i = rng.randrange(600)
+        urls.append(rng.choice([
+            f"https://shop.example.com/{section}-{i}/?page=2",
+            f"https://shop.example.com/{section}/red-item-{i}.html",
+            f"https://shop.example.com/{section}/page/{i}",
+            f"https://cdn.example.com/files/manual.{section[:3]}{i}",
+            f"https://shop.example.com/customer/account/login?next=/{section}",
+        ]))
+    return urls
+
+
+def main():
+    urls = build_urls(2000)
+    print(f"{'patterns':>8} {'loop us/link':>13} {'matcher us/link':>16} {'speedup':>8}")
+    for count in (5, 20, 100, 500):
+        patterns = build_patterns(count)
+        compiled = [re.compile(p) for p in patterns]
+        matcher = PatternMatcher(patterns)
+        for url in urls:
+            assert matcher.search(url) == any(p.search(url) for p in compiled), f"disagree on {url}"
+
+        loop_time = min(timeit.repeat(
+            lambda: [any(p.search(url) for p in compiled) for url in urls], number=3, repeat=3)) / 3
+        matcher_time = min(timeit.repeat(
+            lambda: [matcher.search(url) for url in urls], number=3, repeat=3)) / 3
+        print(f"{count:>8} {loop_time / len(urls) * 1e6:>13.2f} {matcher_time / len(urls) * 1e6:>16.2f} "
+              f"{loop_time / matcher_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
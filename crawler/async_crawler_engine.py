@@ -0,0 +1,239 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from sqlalchemy.orm import Session
+
+from crawler.crawler_engine import CrawlerEngine
+from crawler.rate_controller import is_retryable
+from fetchers.charset import resolve_encoding
+from fetchers.streaming import ContentSkipped, check_headers, check_prefix
+
+logger = logging.getLogger(__name__)
+
+class AsyncCrawlerEngine(CrawlerEngine):
+    """
+    An asyncio variant of the CrawlerEngine that fetches many URLs concurrently.
+
+    Frontier handling, depth limits, robots.txt checks and URLFilter
+    deduplication are inherited unchanged from CrawlerEngine; only the
+    fetching is different. All requests share one aiohttp connection pool,
+    bounded by a global concurrency cap and a per-domain concurrency cap, so
+    a slow domain no longer holds back the rest of the crawl. Requests are
+    dispatched from the DomainScheduler frontier as soon as their domain's
+    rate limit allows.
+    """
+
+    def __init__(self, seed_urls: List[str], config: Dict[str, Any], db_session: Optional[Session] = None):
+        """
+        Initializes the AsyncCrawlerEngine.
+
+        Args:
+            seed_urls: A list of starting URLs for the crawl.
+            db_session: The SQLAlchemy session, required when frontier is 'database'.
+            config: The CrawlerEngine configuration, plus:
+                - concurrency: Maximum number of requests in flight overall.
+                - per_domain_concurrency: Maximum requests in flight per domain. Each
+                  domain starts at one and the RateController raises it while the
+                  domain responds quickly.
+                - request_timeout: Total timeout in seconds for a single request.
+        """
+        super().__init__(seed_urls, config, db_session)
+        self.concurrency = config.get('concurrency', 10)
+        self.per_domain_concurrency = config.get('per_domain_concurrency', 2)
+        self.request_timeout = config.get('request_timeout', 15)
+        # Upper bound on scheduled tasks, including those queued on a busy domain
+        self.max_pending = config.get('max_pending', self.concurrency * 4)
+
+        # Per-domain concurrency is adapted by the RateController, up to per_domain_concurrency
+        self.rate_controller.max_concurrency = self.per_domain_concurrency
+
+        self._global_semaphore: asyncio.Semaphore = None
+        self._domain_conditions: Dict[str, asyncio.Condition] = {}
+        self._domain_in_flight: Dict[str, int] = {}
+
+    async def crawl(self) -> AsyncIterator[str]:
+        """
+        Starts the crawling process and yields discovered URLs as they are scheduled.
+
+        Returns:
+            An async iterator that yields valid, discovered URLs.
+        """
+        self._global_semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_domain_concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        pending: Set[asyncio.Task] = set()
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={'User-Agent': self.user_agent},
+        ) as session:
+            try:
+                while True:
+                    if self._needs_sitemap_urls():
+                        # Sitemaps are read with blocking requests, so keep them off the event loop
+                        await asyncio.get_running_loop().run_in_executor(None, self._feed_from_sitemaps)
+                    if not (self.frontier or pending):
+                        break
+                    while len(pending) < self.max_pending:
+                        next_item = self.frontier.pop()
+                        if next_item is None:
+                            break
+                        current_url, depth = next_item
+                        # A URL fetched again (throttled, or failed and claimed back from the
+                        # frontier) is already marked as visited, by its first attempt
+                        requeued = self._take_requeued(current_url)
+                        retrying = requeued or self.frontier.is_retry(current_url)
+
+                        if not retrying and not self.url_filter.is_valid_and_new(current_url):
+                            self.frontier.skip(current_url)
+                            continue
+
+                        if depth > self.max_depth:
+                            logger.info(f"Skipping {current_url}, max depth {self.max_depth} exceeded.")
+                            self.frontier.skip(current_url)
+                            continue
+
+                        domain = urlparse(current_url).netloc
+                        if not await self._can_fetch_async(domain, current_url):
+                            logger.info(f"Skipping {current_url} due to robots.txt restrictions.")
+                            self.frontier.skip(current_url)
+                            continue
+
+                        if not self.url_filter.mark_as_visited(current_url) and not retrying:
+                            # Claimed by another worker sharing the visited set
+                            self.frontier.skip(current_url)
+                            continue
+                        self.frontier.record_fetch(domain)
+                        logger.info(f"Crawling [Depth: {depth}]: {current_url}")
+
+                        if not requeued:
+                            yield current_url
+
+                        pending.add(asyncio.create_task(
+                            self._fetch_and_extract(session, domain, current_url, depth)
+                        ))
+
+                    # Wake up when a fetch completes or the next rate-limited domain becomes ready
+                    if self.frontier and len(pending) < self.max_pending:
+                        wait_time = self.frontier.time_until_ready()
+                    else:
+                        wait_time = None
+                    if not pending:
+                        if wait_time:
+                            await asyncio.sleep(wait_time)
+                            self.idle_seconds += wait_time
+                        continue
+
+                    done, pending = await asyncio.wait(
+                        pending, timeout=wait_time, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        url, new_links, depth, success, status_code = task.result()
+                        if not success and self._requeue_if_throttled(url, depth, status_code):
+                            continue
+                        for link in new_links:
+                            if self.url_filter.is_valid_and_new(link):
+                                self._push(link, depth + 1)
+                        self.frontier.mark_done(url, success=success, retryable=is_retryable(status_code))
+                        if success:
+                            self.pages_fetched += 1
+            finally:
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
+                self.frontier.close()
+                self._log_summary()
+                self.url_filter.close()
+
+    async def _fetch_and_extract(self, session: aiohttp.ClientSession, domain: str, url: str,
+                                 depth: int) -> Tuple[str, Set[str], int, bool, Optional[int]]:
+        """
+        Fetches a URL under the domain and global concurrency caps and extracts its links.
+
+        Returns:
+            A tuple of (url, extracted links, depth of the fetched URL, success,
+            HTTP status or None if no response arrived). The link set is empty
+            if the fetch failed.
+        """
+        await self._acquire_domain_slot(domain)
+        try:
+            async with self._global_semaphore:
+                started = time.monotonic()
+                async with session.get(url, headers=self._conditional_headers(url)) as response:
+                    self._record_response(domain, response.status, time.monotonic() - started, response.headers)
+                    response.raise_for_status()
+                    status_code, headers = response.status, response.headers
+                    html_content = await self._read_body(domain, response) if status_code != 304 else b''
+        except ContentSkipped as e:
+            self.fetcher.record_skip(url, e.reason)
+            return url, set(), depth, True, e.status_code
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            return url, set(), depth, False, e.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Failed to fetch {url}: {e}")
+            self._record_response(domain, None, None)
+            return url, set(), depth, False, None
+        finally:
+            await self._release_domain_slot(domain)
+
+        encoding, _ = resolve_encoding(html_content, headers)
+        new_links, _ = self._links_from_response(url, status_code, headers, html_content, encoding)
+        return url, new_links, depth, True, status_code
+
+    async def _read_body(self, domain: str, response: aiohttp.ClientResponse) -> bytes:
+        """
+        Reads a response body within the fetch limits shared with the synchronous engine.
+
+        Raises:
+            ContentSkipped: If the body is not HTML or exceeds the size cap.
+        """
+        fetcher = self.fetcher
+        max_bytes = fetcher.domain_max_bytes.get(domain, fetcher.max_bytes)
+        reason = check_headers(response.headers, fetcher.content_types, max_bytes)
+        if reason:
+            raise ContentSkipped(str(response.url), reason, response.status)
+        chunks = []
+        received = 0
+        async for chunk in response.content.iter_chunked(fetcher.chunk_size):
+            if not chunks:
+                reason = check_prefix(response.headers, chunk, fetcher.content_types)
+                if reason:
+                    raise ContentSkipped(str(response.url), reason, response.status)
+            chunks.append(chunk)
+            received += len(chunk)
+            if max_bytes and received > max_bytes:
+                raise ContentSkipped(str(response.url), f"too large (body > {max_bytes})", response.status)
+        fetcher.bytes_downloaded += received
+        return b''.join(chunks)
+
+    async def _acquire_domain_slot(self, domain: str):
+        """
+        Waits until the domain has fewer requests in flight than the RateController currently allows.
+        """
+        condition = self._domain_conditions.setdefault(domain, asyncio.Condition())
+        async with condition:
+            await condition.wait_for(
+                lambda: self._domain_in_flight.get(domain, 0) < self.rate_controller.get_concurrency(domain)
+            )
+            self._domain_in_flight[domain] = self._domain_in_flight.get(domain, 0) + 1
+
+    async def _release_domain_slot(self, domain: str):
+        condition = self._domain_conditions[domain]
+        async with condition:
+            self._domain_in_flight[domain] -= 1
+            condition.notify_all()
+
+    async def _can_fetch_async(self, domain: str, url: str) -> bool:
+        """
+        Checks robots.txt, awaiting the background robots.txt fetch instead of blocking the event loop.
+        """
+        if not self.robots_cache.is_cached(url):
+            await asyncio.wrap_future(self.robots_cache.prefetch(url))
+        return self._can_fetch(domain, url)
@@ -1,15 +1,25 @@
 import logging
 import time
 import re
-from collections import deque
-from typing import List, Set, Deque, Dict, Any, Iterator
-from urllib.parse import urljoin, urlparse
-from urllib.robotparser import RobotFileParser
+from datetime import datetime, timedelta, timezone
+from typing import List, Set, Dict, Any, Iterator, Mapping, Optional, Tuple, Union
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from sqlalchemy.orm import Session
 
+from crawler.link_extractor import LinkExtractor
+from crawler.rate_controller import BACKOFF_STATUSES, RateController, is_retryable, min_delay_from_rate_limit
+from crawler.robots_cache import get_robots_cache
+from crawler.scheduler import DomainScheduler
+from crawler.simhash import NearDuplicateDetector
+from crawler.sitemap import DEFAULT_MAX_BYTES as DEFAULT_SITEMAP_MAX_BYTES, SitemapReader, parse_lastmod
 from crawler.url_filter import URLFilter # Import URLFilter
+from crawler.url_scorer import URLScorer
+from fetchers.charset import resolve_encoding
+from fetchers.page import FetchedPage
+from fetchers.revisit_store import RevisitStore, get_revisit_store
+from fetchers.streaming import DEFAULT_CONTENT_TYPES, DEFAULT_MAX_BYTES, ContentSkipped, StreamingFetcher
 
 logger = logging.getLogger(__name__)
 
@@ -23,40 +33,138 @@ class CrawlerEngine:
     configurable patterns.
     """
 
-    def __init__(self, seed_urls: List[str], config: Dict[str, Any]):
+    def __init__(self, seed_urls: List[str], config: Dict[str, Any], db_session: Optional[Session] = None):
         """
         Initializes the CrawlerEngine.
 
         Args:
             seed_urls: A list of starting URLs for the crawl.
+            db_session: The SQLAlchemy session, required when frontier is 'database'.
             config: A dictionary with crawler configuration:
-                - strategy: 'bfs' (breadth-first) or 'dfs' (depth-first).
+                - strategy: 'bfs' (breadth-first), 'dfs' (depth-first) or 'priority'
+                  (best-first by URLScorer score). The strategy orders the URLs of
+                  each domain; which domain is served next is decided by politeness
+                  (the domain that may be fetched soonest). A multi-domain crawl is
+                  therefore breadth- or depth-first per domain, not globally, which
+                  keeps one rate-limited domain from stalling the others.
+                - priority: URLScorer options for the 'priority' strategy, e.g.
+                  {'depth_penalty': 0.5, 'pattern_weights': {'/product/': 2.0}}.
                 - url_patterns: List of regex patterns to include.
                 - exclude_patterns: List of regex patterns to exclude.
-                - rate_limit: Seconds to wait between requests to the same domain.
+                - rate_limit: Seconds to wait between requests to the same domain, or a
+                  site-style block such as {'requests_per_minute': 30}. Other domains
+                  keep being crawled while one is waiting.
+                - adaptive_rate: RateController options. Each domain starts at rate_limit,
+                  backs off on 429/503 and Retry-After, and speeds up while latency is
+                  stable, down to min_delay (default: rate_limit, i.e. never faster
+                  than configured), e.g. {'min_delay': 0.2, 'max_delay': 60}.
+                - throttle_retries: How many times a URL answered with 429 or 503 is
+                  queued again, to be fetched once its domain's backoff has passed,
+                  before it is given up (default 3).
+                - domain_rate_limits: Per-domain ceilings, {domain: rate_limit block}, e.g.
+                  the rate_limit blocks of the site configs.
                 - max_depth: Maximum depth to crawl from the seed URLs.
                 - user_agent: The User-Agent string to use for requests.
+                - frontier: 'memory' (default), 'database' to keep the frontier
+                  in the crawl_state table so an interrupted crawl can resume, or
+                  'redis' to share the frontier between crawler workers on several
+                  nodes; combine it with visited_backend 'redis'.
+                - frontier_batch_size: Buffered frontier writes per database flush.
+                - redis_url: Redis URL for the 'redis' frontier (default REDIS_URL).
+                - crawl_id: Name of the shared crawl for the 'redis' frontier; workers
+                  with the same id work on the same frontier (default site_id).
+                - revisit_cache: Path of a RevisitStore database. When set, pages are
+                  revisited with conditional requests and unchanged (304) pages
+                  reuse the links stored on the previous visit.
+                - robots_cache: Options for the process-wide RobotsCache, e.g.
+                  {'ttl': 86400, 'persist_path': 'data/robots_cache.json'}. Only the
+                  first engine created in a process configures the shared cache. Its
+                  user_agent defaults to the crawler's.
+                - respect_base_href: Resolve relative links against <base href> (default False).
+                - skip_nofollow: Do not follow rel="nofollow" links (default False).
+                - sitemaps: Seed the frontier from the sites' sitemaps, e.g.
+                  {'from_robots': True, 'max_age_days': 7}. Options:
+                    - enabled: Set to false to disable (default true when the block is present).
+                    - urls: Sitemap or sitemap index URLs to read.
+                    - from_robots: Also read the sitemaps listed in the seed hosts'
+                      robots.txt, or /sitemap.xml if none are listed (default true).
+                    - modified_since: Skip entries whose lastmod is older than this date.
+                    - max_age_days: Skip entries whose lastmod is older than this many days.
+                    - low_water: Read more sitemap URLs when fewer than this many URLs
+                      are queued (default 100).
+                    - batch_size: Sitemap URLs queued per read (default 500).
+                    - max_bytes: Largest sitemap file to download (default 50 MB).
+                - near_duplicates: Fingerprint the content text of each page with SimHash
+                  and neither follow the links of nor hand for parsing pages that nearly
+                  duplicate one fetched before, e.g. {'similarity': 0.95}. Options:
+                    - enabled: Set to false to disable (default true when the block is present).
+                    - similarity: Share of equal fingerprint bits from which pages are
+                      near-duplicates (default 0.95, i.e. at most 3 of 64 bits differ).
+                    - min_shingles: Pages with fewer word shingles are never pruned (default 20).
+                - fetch_limits: Which responses are downloaded. Bodies are streamed, and
+                  non-HTML or oversized ones are abandoned after the headers or at the
+                  size cap instead of being downloaded in full. Options:
+                    - max_bytes: Largest body to download (default 5 MB; 0 for no cap).
+                    - content_types: Media types to download (default text/html and
+                      application/xhtml+xml).
+                    - head_probe: Send a HEAD request before each GET (default False).
+                - domain_max_bytes: Per-domain size caps, {domain: bytes}, e.g. the
+                  max_bytes of the site configs.
+                - canonicalization, domain_canonicalization: How URLs are reduced to a
+                  canonical form for deduplication, crawler-wide and per domain
+                  (see URLFilter).
         """
         self.config = config
         self.strategy = config.get('strategy', 'bfs')
         self.rate_limit = config.get('rate_limit', 1.0)
+        if isinstance(self.rate_limit, Mapping):
+            self.rate_limit = min_delay_from_rate_limit(self.rate_limit) or 1.0
+        self.rate_controller = self._create_rate_controller(config)
         self.max_depth = config.get('max_depth', 5)
+        self.throttle_retries = config.get('throttle_retries', 3)
+        # URLs queued again after a 429/503, and how often each has been
+        self._requeued: Set[str] = set()
+        self._throttle_counts: Dict[str, int] = {}
         self.user_agent = config.get('user_agent', 'GeminiCrawler/1.0')
 
-        # The frontier stores tuples of (url, depth)
-        if self.strategy == 'bfs':
-            self.frontier: Deque[(str, int)] = deque((url, 0) for url in seed_urls)
-        elif self.strategy == 'dfs':
-            self.frontier: List[(str, int)] = [(url, 0) for url in seed_urls]
-        else:
-            raise ValueError(f"Unsupported crawling strategy: {self.strategy}")
-
+        # Learns which kinds of pages yield items; only consulted by 'priority'
+        self.url_scorer = URLScorer(config)
+        self.pages_fetched = 0
+        self.items_found = 0
+        # The frontier keeps one queue of (url, depth) tuples per domain and
+        # serves whichever domain is next allowed to be fetched
+        self.frontier = self._create_frontier(config, db_session)
         self.url_filter = URLFilter(config) # Instantiate URLFilter
         # self.visited_urls: Set[str] = set() # Moved to URLFilter
-        self.robot_parsers: Dict[str, RobotFileParser] = {}
+        self.robots_cache = get_robots_cache(**{'user_agent': self.user_agent, **config.get('robots_cache', {})})
+        self._seen_domains: Set[str] = set()
+        self._crawl_delay_applied: Set[str] = set()
+        self.link_extractor = LinkExtractor(
+            respect_base_href=config.get('respect_base_href', False),
+            skip_nofollow=config.get('skip_nofollow', False),
+        )
+        for url in seed_urls:
+            self._push(url, 0)
+
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': self.user_agent})
-        self.domain_last_crawled: Dict[str, float] = {}
+        fetch_limits = config.get('fetch_limits', {})
+        self.fetcher = StreamingFetcher(
+            self.session,
+            max_bytes=fetch_limits.get('max_bytes', DEFAULT_MAX_BYTES),
+            content_types=fetch_limits.get('content_types', DEFAULT_CONTENT_TYPES),
+            head_probe=fetch_limits.get('head_probe', False),
+            domain_max_bytes=config.get('domain_max_bytes'),
+        )
+        self.idle_seconds = 0.0
+        revisit_cache = config.get('revisit_cache')
+        self.revisit_store: Optional[RevisitStore] = get_revisit_store(revisit_cache) if revisit_cache else None
+
+        self.seed_urls = list(seed_urls)
+        self.sitemap_reader: Optional[SitemapReader] = None
+        self._sitemap_urls: Optional[Iterator[str]] = self._create_sitemap_source(config.get('sitemaps'))
+        self.near_duplicates: Optional[NearDuplicateDetector] = self._create_near_duplicate_detector(
+            config.get('near_duplicates'))
 
     def crawl(self) -> Iterator[str]:
         """
@@ -65,86 +173,381 @@ class CrawlerEngine:
         Returns:
             An iterator that yields valid, discovered URLs.
         """
-        while self.frontier:
-            if self.strategy == 'bfs':
-                current_url, depth = self.frontier.popleft()
-            else: # dfs
-                current_url, depth = self.frontier.pop()
-
-            # Use URLFilter for deduplication
-            if not self.url_filter.is_valid_and_new(current_url):
-                continue
-
-            if depth > self.max_depth:
-                logger.info(f"Skipping {current_url}, max depth {self.max_depth} exceeded.")
-                continue
-
-            domain = urlparse(current_url).netloc
-            if not self._can_fetch(domain, current_url):
-                logger.info(f"Skipping {current_url} due to robots.txt restrictions.")
-                continue
-
-            # Apply rate limiting
-            last_crawled_time = self.domain_last_crawled.get(domain, 0)
-            elapsed_time = time.time() - last_crawled_time
-            if elapsed_time < self.rate_limit:
-                sleep_time = self.rate_limit - elapsed_time
-                logger.info(f"Rate limiting {domain}. Sleeping for {sleep_time:.2f}s.")
-                time.sleep(sleep_time)
-
-            self.domain_last_crawled[domain] = time.time()
-            self.url_filter.mark_as_visited(current_url) # Mark as visited
-            logger.info(f"Crawling [Depth: {depth}]: {current_url}")
-
-            yield current_url
-
-            try:
-                response = self.session.get(current_url, timeout=15)
-                response.raise_for_status()
-                
-                new_links = self._extract_links(response.text, current_url)
-                for link in new_links:
-                    # Check validity and newness using URLFilter
-                    if self.url_filter.is_valid_and_new(link):
-                        self.frontier.append((link, depth + 1))
-
-            except requests.RequestException as e:
-                logger.error(f"Failed to fetch {current_url}: {e}")
-
-    def _get_robot_parser(self, domain: str) -> RobotFileParser:
-        """
-        Retrieves, caches, and returns a RobotFileParser for a given domain.
-        """
-        if domain not in self.robot_parsers:
-            robots_url = urljoin(f"https://{domain}", "robots.txt")
-            parser = RobotFileParser()
-            parser.set_url(robots_url)
-            try:
-                parser.read()
-                logger.info(f"Successfully read robots.txt for {domain}")
-            except Exception as e:
-                logger.warning(f"Could not read robots.txt for {domain}: {e}")
-            self.robot_parsers[domain] = parser
-        return self.robot_parsers[domain]
+        for page in self.crawl_pages():
+            yield page.url
+
+    def crawl_pages(self) -> Iterator[FetchedPage]:
+        """
+        Starts the crawling process and yields each crawled page with its response.
+
+        The body downloaded for link extraction is handed to the caller, so a
+        scraper can parse it without fetching the URL a second time.
+
+        Returns:
+            An iterator of FetchedPage objects. Pages that could not be fetched
+            are yielded with their error status_code (None without a response)
+            and no body. The database frontier retries failed URLs in later
+            claims, and each attempt is yielded.
+        """
+        try:
+            while True:
+                self._feed_from_sitemaps()
+                if not self.frontier:
+                    break
+                next_item = self.frontier.pop()
+                if next_item is None:
+                    # Every queued domain is within its rate limit, so wait for the earliest one
+                    wait_time = self.frontier.time_until_ready()
+                    logger.debug(f"All queued domains are rate limited. Sleeping for {wait_time:.2f}s.")
+                    time.sleep(wait_time)
+                    self.idle_seconds += wait_time
+                    continue
+                current_url, depth = next_item
+                # A URL fetched again (throttled, or failed and claimed back from the
+                # frontier) is already marked as visited, by its first attempt
+                retrying = self._take_requeued(current_url) or self.frontier.is_retry(current_url)
+
+                # Use URLFilter for deduplication
+                if not retrying and not self.url_filter.is_valid_and_new(current_url):
+                    self.frontier.skip(current_url)
+                    continue
+
+                if depth > self.max_depth:
+                    logger.info(f"Skipping {current_url}, max depth {self.max_depth} exceeded.")
+                    self.frontier.skip(current_url)
+                    continue
+
+                domain = urlparse(current_url).netloc
+                if not self._can_fetch(domain, current_url):
+                    logger.info(f"Skipping {current_url} due to robots.txt restrictions.")
+                    self.frontier.skip(current_url)
+                    continue
+
+                if not self.url_filter.mark_as_visited(current_url) and not retrying:
+                    # Claimed by another worker sharing the visited set
+                    self.frontier.skip(current_url)
+                    continue
+                self.frontier.record_fetch(domain)
+                logger.info(f"Crawling [Depth: {depth}]: {current_url}")
+
+                page = FetchedPage(url=current_url, depth=depth)
+                try:
+                    response = self.fetcher.get(current_url, domain=domain, timeout=15,
+                                                headers=self._conditional_headers(current_url))
+                    self._record_response(domain, response.status_code, response.elapsed.total_seconds(), response.headers)
+                    response.raise_for_status()
+                    # The raw bytes go to lxml as they are; only the encoding is worked out here
+                    html_content = response.content
+                    encoding, _ = resolve_encoding(html_content, response.headers)
+
+                    new_links, duplicate_of = self._links_from_response(
+                        current_url, response.status_code, response.headers, html_content, encoding)
+                    for link in new_links:
+                        # Check validity and newness using URLFilter
+                        if self.url_filter.is_valid_and_new(link):
+                            self._push(link, depth + 1)
+                    self.frontier.mark_done(current_url)
+                    self.pages_fetched += 1
+                    page.status_code = response.status_code
+                    page.headers = response.headers
+                    if response.status_code == 200:
+                        page.content, page.encoding = html_content, encoding
+                    page.duplicate_of = duplicate_of
+
+                except ContentSkipped as e:
+                    # Not a failure: the URL works but is not a page worth downloading
+                    page.status_code = e.status_code
+                    page.skip_reason = e.reason
+                    self.frontier.mark_done(current_url)
+                except requests.RequestException as e:
+                    response = getattr(e, 'response', None)
+                    if response is None:
+                        self._record_response(domain, None, None)
+                    else:
+                        page.status_code = response.status_code
+                    if self._requeue_if_throttled(current_url, depth, page.status_code):
+                        continue
+                    logger.error(f"Failed to fetch {current_url}: {e}")
+                    self.frontier.mark_done(current_url, success=False, retryable=is_retryable(page.status_code))
+
+                yield page
+        finally:
+            # Persist any buffered frontier and visited-set writes, even if the consumer stops early
+            self.frontier.close()
+            self._log_summary()
+            self.url_filter.close()
+
+    def record_yield(self, url: str, items: int):
+        """
+        Reports how many items were scraped from a crawled page.
+
+        The count feeds the learned yield of the 'priority' strategy and the
+        items-per-page figure that compares strategies.
+        """
+        self.items_found += items
+        self.url_scorer.record_yield(url, items)
+
+    def get_items_per_page(self) -> float:
+        """Returns the average number of items scraped per fetched page."""
+        return self.items_found / self.pages_fetched if self.pages_fetched else 0.0
+
+    def _log_summary(self):
+        """
+        Logs visited-set and deduplication statistics for the crawl.
+        """
+        logger.info(
+            f"Crawl finished: {self.url_filter.get_visited_count()} URLs visited, "
+            f"{self.url_filter.get_fetches_saved()} duplicate fetches avoided by URL canonicalization, "
+            f"{self.idle_seconds:.1f}s idle. Visited set: {self.url_filter.get_visited_stats()}"
+        )
+        if self.fetcher.skip_reasons:
+            logger.info(f"Downloads skipped by fetch limits: {dict(self.fetcher.skip_reasons)}")
+        throttled = {domain: stats for domain, stats in self.rate_controller.stats().items() if stats["backoffs"]}
+        if throttled:
+            logger.info(f"Domains that asked the crawler to slow down: {throttled}")
+        if self.near_duplicates:
+            logger.info(
+                f"Near-duplicate detection: {self.near_duplicates.pages_pruned} of "
+                f"{self.near_duplicates.pages_checked} pages pruned."
+            )
+        if self.items_found:
+            logger.info(
+                f"Strategy '{self.strategy}': {self.items_found} items from {self.pages_fetched} pages "
+                f"({self.get_items_per_page():.2f} items/page). "
+                f"Top templates: {self.url_scorer.get_template_yields(limit=5)}"
+            )
+
+    def _create_rate_controller(self, config: Dict[str, Any]) -> RateController:
+        """
+        Builds the per-domain RateController from the rate_limit, adaptive_rate and domain_rate_limits settings.
+        """
+        options = dict(config.get('adaptive_rate', {}))
+        options.setdefault('min_delay', self.rate_limit)
+        domain_min_delays = {}
+        for domain, rate_limit in config.get('domain_rate_limits', {}).items():
+            min_delay = min_delay_from_rate_limit(rate_limit)
+            if min_delay is not None:
+                domain_min_delays[domain] = min_delay
+        return RateController(
+            initial_delay=self.rate_limit,
+            max_concurrency=config.get('per_domain_concurrency', 1),
+            domain_min_delays=domain_min_delays,
+            **options,
+        )
+
+    def _requeue_if_throttled(self, url: str, depth: int, status_code: Optional[int]) -> bool:
+        """
+        Queues a URL the server throttled (429/503) again, up to throttle_retries times.
+
+        _record_response has already slowed down or paused the URL's domain,
+        so the URL comes up again only after the domain's backoff.
+
+        Returns:
+            Whether the URL was queued again.
+        """
+        if status_code not in BACKOFF_STATUSES:
+            return False
+        attempts = self._throttle_counts.get(url, 0)
+        if attempts >= self.throttle_retries:
+            logger.warning(f"Giving up on {url}: still throttled (HTTP {status_code}) after {attempts} retries.")
+            return False
+        self._throttle_counts[url] = attempts + 1
+        self._requeued.add(url)
+        logger.info(f"{url} throttled (HTTP {status_code}). Queued again, retry {attempts + 1}/{self.throttle_retries}.")
+        self.frontier.retry(url, depth)
+        return True
+
+    def _take_requeued(self, url: str) -> bool:
+        """Returns whether a popped URL is a throttled one queued again, and forgets that it was."""
+        if url in self._requeued:
+            self._requeued.discard(url)
+            return True
+        return False
+
+    def _record_response(self, domain: str, status_code: Optional[int], latency: Optional[float],
+                         headers: Optional[Mapping[str, str]] = None):
+        """
+        Feeds a response to the RateController and applies the domain's new delay to the frontier.
+        """
+        retry_after = headers.get('Retry-After') if headers else None
+        pause = self.rate_controller.record(domain, status_code, latency, retry_after)
+        self.frontier.set_delay(domain, self.rate_controller.get_delay(domain))
+        if pause:
+            logger.info(f"{domain} asked to retry after {pause:.0f}s. Pausing the domain.")
+            self.frontier.defer(domain, pause)
+
+    def _create_frontier(self, config: Dict[str, Any], db_session: Optional[Session]):
+        """
+        Builds the in-memory or database-backed frontier selected in the config.
+        """
+        frontier_type = config.get('frontier', 'memory')
+        if frontier_type == 'memory':
+            return DomainScheduler(strategy=self.strategy, default_delay=self.rate_limit, scorer=self.url_scorer.score)
+        if frontier_type == 'database':
+            if db_session is None:
+                raise ValueError("A db_session is required when frontier is 'database'.")
+            # Imported lazily: database.connection needs DATABASE_URL at import time
+            from crawler.persistent_frontier import PersistentFrontier
+            return PersistentFrontier(
+                db_session,
+                strategy=self.strategy,
+                default_delay=self.rate_limit,
+                site_id=config.get('site_id'),
+                batch_size=config.get('frontier_batch_size', 100),
+                scorer=self.url_scorer.score,
+            )
+        if frontier_type == 'redis':
+            from crawler.redis_frontier import RedisFrontier
+            return RedisFrontier(
+                strategy=self.strategy,
+                default_delay=self.rate_limit,
+                crawl_id=str(config.get('crawl_id', config.get('site_id', 'default'))),
+                url=config.get('redis_url'),
+                scorer=self.url_scorer.score,
+            )
+        raise ValueError(f"Unsupported frontier type: {frontier_type}")
+
+    def _create_near_duplicate_detector(self, options: Optional[Dict[str, Any]]) -> Optional[NearDuplicateDetector]:
+        """
+        Creates the near-duplicate detector from the 'near_duplicates' config block, if enabled.
+        """
+        if not options or not options.get('enabled', True):
+            return None
+        return NearDuplicateDetector(
+            similarity=options.get('similarity', 0.95),
+            min_shingles=options.get('min_shingles', 20),
+        )
+
+    def _create_sitemap_source(self, options: Optional[Dict[str, Any]]) -> Optional[Iterator[str]]:
+        """
+        Sets up the SitemapReader and returns a lazy iterator of sitemap page URLs, if sitemaps are enabled.
+        """
+        if not options or not options.get('enabled', True):
+            return None
+        self.sitemap_low_water = options.get('low_water', 100)
+        self.sitemap_batch_size = options.get('batch_size', 500)
+
+        cutoffs = []
+        if options.get('modified_since'):
+            # YAML may load an unquoted date as a date object
+            cutoffs.append(parse_lastmod(str(options['modified_since'])))
+        if options.get('max_age_days') is not None:
+            cutoffs.append(datetime.now(timezone.utc) - timedelta(days=options['max_age_days']))
+        cutoffs = [cutoff for cutoff in cutoffs if cutoff]
+        self.sitemap_reader = SitemapReader(self.session, modified_since=max(cutoffs) if cutoffs else None,
+                                            max_bytes=options.get('max_bytes', DEFAULT_SITEMAP_MAX_BYTES))
+        return self._iter_sitemap_urls(options)
+
+    def _iter_sitemap_urls(self, options: Dict[str, Any]) -> Iterator[str]:
+        """
+        Yields page URLs from the configured sitemaps and those listed in the seed hosts' robots.txt.
+        """
+        sitemap_urls = list(options.get('urls', []))
+        if options.get('from_robots', True):
+            origins = dict.fromkeys(f"{urlparse(url).scheme}://{urlparse(url).netloc}" for url in self.seed_urls)
+            for origin in origins:
+                sitemap_urls.extend(self.robots_cache.sitemaps(f"{origin}/") or [f"{origin}/sitemap.xml"])
+        for sitemap_url in dict.fromkeys(sitemap_urls):
+            logger.info(f"Reading sitemap {sitemap_url}")
+            for url, _ in self.sitemap_reader.iter_urls(sitemap_url):
+                yield url
+
+    def _needs_sitemap_urls(self) -> bool:
+        return self._sitemap_urls is not None and len(self.frontier) < self.sitemap_low_water
+
+    def _feed_from_sitemaps(self):
+        """
+        Queues the next batch of sitemap URLs when the frontier is running low.
+
+        Sitemaps are consumed lazily, so a site with millions of sitemap
+        entries never has more than one batch of them in the frontier.
+        """
+        if not self._needs_sitemap_urls():
+            return
+        added = 0
+        for url in self._sitemap_urls:
+            if self.url_filter.is_valid_and_new(url):
+                self._push(url, 0)
+                added += 1
+                if added >= self.sitemap_batch_size:
+                    return
+        self._sitemap_urls = None
+        reader = self.sitemap_reader
+        logger.info(f"Finished reading sitemaps: {reader.sitemaps_read} sitemaps, {reader.urls_found} URLs, "
+                    f"{reader.skipped_by_lastmod} entries skipped as not modified since the cutoff.")
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        Returns If-None-Match / If-Modified-Since headers for a revisited URL.
+        """
+        if not self.revisit_store:
+            return {}
+        return self.revisit_store.conditional_headers('crawler', url)
+
+    def _links_from_response(self, url: str, status_code: int, headers: Mapping[str, str],
+                             html_content: Union[str, bytes],
+                             encoding: Optional[str] = None) -> Tuple[Set[str], Optional[str]]:
+        """
+        Returns the links of a fetched page.
+
+        For a 304 Not Modified answer the links stored on the previous visit are
+        reused, so unchanged pages are neither downloaded nor parsed again. With
+        near-duplicate detection enabled, a page that nearly duplicates one
+        fetched before yields no links.
+
+        Returns:
+            A tuple of (links, URL of the page this one nearly duplicates or None).
+        """
+        if status_code == 304 and self.revisit_store:
+            logger.info(f"{url} not modified since last visit. Reusing stored links.")
+            self.revisit_store.record_not_modified()
+            return set(self.revisit_store.load_payload('crawler', url) or []), None
+
+        if self.near_duplicates:
+            links, text = self.link_extractor.extract_with_text(html_content, url, encoding)
+            duplicate_of = self.near_duplicates.check(url, text)
+            if duplicate_of:
+                # Not stored for revisits either, so a later crawl looks at the page afresh
+                logger.info(f"{url} is a near-duplicate of {duplicate_of}. Not following its links.")
+                return set(), duplicate_of
+        else:
+            links = self._extract_links(html_content, url, encoding)
+        if self.revisit_store:
+            self.revisit_store.save('crawler', url, headers, payload=sorted(links))
+        return links, None
+
+    def _push(self, url: str, depth: int):
+        """
+        Adds a URL to the frontier and starts fetching robots.txt for domains seen for the first time.
+        """
+        domain = urlparse(url).netloc
+        if domain not in self._seen_domains:
+            self._seen_domains.add(domain)
+            self.robots_cache.prefetch(url)
+        self.frontier.push(url, depth)
 
     def _can_fetch(self, domain: str, url: str) -> bool:
         """
         Checks if the crawler is allowed to fetch a URL by robots.txt.
+
+        The first check for a domain also applies its Crawl-delay as the
+        domain's shortest delay, and the domain's starting delay to the frontier.
         """
-        parser = self._get_robot_parser(domain)
-        return parser.can_fetch(self.user_agent, url)
+        allowed = self.robots_cache.can_fetch(self.user_agent, url)
+        if domain not in self._crawl_delay_applied:
+            self._crawl_delay_applied.add(domain)
+            crawl_delay = self.robots_cache.crawl_delay(self.user_agent, url)
+            if crawl_delay and crawl_delay > self.frontier.get_delay(domain):
+                logger.info(f"Applying robots.txt Crawl-delay of {crawl_delay}s to {domain}.")
+            if crawl_delay:
+                # A floor for the adaptive rate as well, so speeding up never undercuts it
+                self.rate_controller.set_min_delay(domain, crawl_delay)
+            self.frontier.set_delay(domain, self.rate_controller.get_delay(domain))
+        return allowed
 
-    def _extract_links(self, html_content: str, base_url: str) -> Set[str]:
+    def _extract_links(self, html_content: Union[str, bytes], base_url: str,
+                       encoding: Optional[str] = None) -> Set[str]:
         """
         Parses HTML to extract and filter links.
         """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        links: Set[str] = set()
-        for a_tag in soup.find_all('a', href=True):
-            link = a_tag['href']
-            absolute_link = urljoin(base_url, link)
-            absolute_link = urlparse(absolute_link)._replace(fragment="").geturl()
-
-            # No longer need to call _is_valid_link here, URLFilter handles it
-            links.add(absolute_link)
-        return links
+        return self.link_extractor.extract(html_content, base_url, encoding)
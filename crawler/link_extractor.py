@@ -0,0 +1,133 @@
+import logging
+from typing import Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urljoin
+
+from lxml import etree
+
+from fetchers.charset import lxml_encoding
+
+logger = logging.getLogger(__name__)
+
+# Text inside these elements is not page content: code, or boilerplate repeated on every page
+_NON_CONTENT_TAGS = {'script', 'style', 'noscript', 'template', 'nav', 'header', 'footer', 'aside'}
+
+class _LinkCollector:
+    """
+    lxml parser target that records <a href> and <base href> values.
+
+    Using a parser target means lxml tokenizes the document in C and calls
+    back only for start tags; no element tree is ever built. When collect_text
+    is set it also keeps the page's content text, for near-duplicate detection.
+    """
+
+    def __init__(self, skip_nofollow: bool, collect_text: bool = False):
+        self.skip_nofollow = skip_nofollow
+        self.collect_text = collect_text
+        self.hrefs: List[str] = []
+        self.base_href: Optional[str] = None
+        self.text: List[str] = []
+        self._non_content_depth = 0
+
+    def start(self, tag: str, attrib: Dict[str, str]):
+        if tag in _NON_CONTENT_TAGS:
+            self._non_content_depth += 1
+        if tag == 'a':
+            href = attrib.get('href')
+            if href is None:
+                return
+            if self.skip_nofollow and 'nofollow' in attrib.get('rel', '').lower().split():
+                return
+            self.hrefs.append(href)
+        elif tag == 'base' and self.base_href is None:
+            self.base_href = attrib.get('href')
+
+    def end(self, tag: str):
+        if tag in _NON_CONTENT_TAGS and self._non_content_depth:
+            self._non_content_depth -= 1
+
+    def data(self, data: str):
+        if self.collect_text and not self._non_content_depth:
+            self.text.append(data)
+
+    def close(self) -> List[str]:
+        return self.hrefs
+
+
+class LinkExtractor:
+    """
+    Extracts absolute, fragment-free URLs from the <a href> attributes of an HTML page.
+
+    Produces the same set of links as parsing the page with BeautifulSoup and
+    reading every a[href], at a fraction of the CPU cost. Whether <base href>
+    is honoured and whether rel="nofollow" links are skipped is configurable.
+    """
+
+    def __init__(self, respect_base_href: bool = False, skip_nofollow: bool = False):
+        """
+        Initializes the LinkExtractor.
+
+        Args:
+            respect_base_href: Resolve relative links against the page's <base href>
+                               instead of the page URL.
+            skip_nofollow: Ignore links marked rel="nofollow".
+        """
+        self.respect_base_href = respect_base_href
+        self.skip_nofollow = skip_nofollow
+
+    def extract(self, html_content: Union[str, bytes], base_url: str, encoding: Optional[str] = None) -> Set[str]:
+        """
+        Extracts links from HTML content.
+
+        Args:
+            html_content: The page as text, or as raw bytes, which lxml decodes itself
+                          without a decoded copy being made in Python.
+            base_url: The URL of the page, used to resolve relative links.
+            encoding: The encoding of raw bytes; lxml guesses it if not given.
+
+        Returns:
+            A set of absolute URLs with fragments removed.
+        """
+        return self._parse(html_content, base_url, encoding, collect_text=False)[0]
+
+    def extract_with_text(self, html_content: Union[str, bytes], base_url: str,
+                          encoding: Optional[str] = None) -> Tuple[Set[str], str]:
+        """
+        Extracts links and the content text of a page in a single parse.
+
+        Text inside script, style, nav, header, footer and aside elements is left out.
+
+        Returns:
+            A tuple of (set of absolute URLs, content text).
+        """
+        return self._parse(html_content, base_url, encoding, collect_text=True)
+
+    def _parse(self, html_content: Union[str, bytes], base_url: str, encoding: Optional[str],
+               collect_text: bool) -> Tuple[Set[str], str]:
+        collector = _LinkCollector(self.skip_nofollow, collect_text)
+        parser = None
+        if isinstance(html_content, bytes) and encoding:
+            try:
+                parser = etree.HTMLParser(target=collector, encoding=lxml_encoding(encoding))
+            except LookupError:
+                # An encoding Python knows but libxml2 does not
+                html_content = html_content.decode(encoding, errors='replace')
+        if parser is None:
+            parser = etree.HTMLParser(target=collector)
+        try:
+            parser.feed(html_content)
+            parser.close()
+        except (etree.ParserError, etree.XMLSyntaxError, ValueError) as e:
+            logger.debug(f"Link extraction stopped early for {base_url}: {e}")
+
+        if self.respect_base_href and collector.base_href:
+            base_url = urljoin(base_url, collector.base_href.strip())
+
+        links: Set[str] = set()
+        # Listing pages repeat the same href many times, so join each distinct value once
+        for href in set(collector.hrefs):
+            absolute_link = urljoin(base_url, href)
+            fragment_start = absolute_link.find('#')
+            if fragment_start != -1:
+                absolute_link = absolute_link[:fragment_start]
+            links.add(absolute_link)
+        return links, ' '.join(collector.text)
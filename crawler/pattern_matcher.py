@@ -0,0 +1,136 @@
+import re
+from typing import Any, Dict, List, Pattern, Tuple
+
+_REGEX_META = set('.^$*+?{}[]|()\\')
+_QUANTIFIERS = set('*+?{')
+# Backreferences and named groups cannot be merged into one alternation: group
+# numbers shift and the same group name may not appear twice in one regex
+_UNCOMBINABLE_RE = re.compile(r'\\[1-9]|\(\?P[=<]')
+
+
+def _split_literal_prefix(pattern: str) -> Tuple[str, str]:
+    """
+    Splits a regex into its leading literal text and the remaining regex.
+
+    Escaped punctuation such as '\\.' counts as literal text. A literal
+    character directly followed by a quantifier is left in the remainder,
+    because the quantifier applies to it.
+
+    Returns:
+        A (literal_prefix, regex_remainder) tuple. The prefix is plain text,
+        not a regex.
+    """
+    units: List[Tuple[str, int]] = []  # (literal character, index in pattern where it starts)
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            if i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+                units.append((pattern[i + 1], i))
+                i += 2
+                continue
+            break
+        if char in _REGEX_META:
+            break
+        units.append((char, i))
+        i += 1
+
+    if units and i < len(pattern) and pattern[i] in _QUANTIFIERS:
+        i = units.pop()[1]
+    return ''.join(char for char, _ in units), pattern[i:]
+
+
+def _build_trie_regex(entries: List[Tuple[str, str]]) -> str:
+    """
+    Builds one regex from (literal_prefix, regex_remainder) entries by sharing common prefixes.
+
+    The regex engine then follows a single branch of the trie at each
+    position of the URL, instead of trying every pattern in turn, so the cost
+    of a search hardly grows with the number of patterns.
+    """
+    trie: Dict[str, Any] = {}
+    for prefix, remainder in entries:
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault('', []).append(remainder)
+
+    def build(node: Dict[str, Any]) -> str:
+        remainders = node.get('', [])
+        if '' in remainders:
+            # A pattern is fully matched at this point; longer alternatives add nothing
+            return ''
+        alternatives = [f"(?:{remainder})" for remainder in remainders]
+        alternatives += [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if len(alternatives) == 1:
+            return alternatives[0]
+        return '(?:' + '|'.join(alternatives) + ')'
+
+    return build(trie)
+
+
+class PatternMatcher:
+    """
+    Matches URLs against a set of regex patterns with a few combined regex searches.
+
+    Patterns that start with literal text, such as '/catalog/' or
+    '/products/[a-z0-9-]+$', are merged into a prefix trie regex (one for
+    '^'-anchored patterns, one for the rest), so adding patterns barely
+    changes the cost per URL. Other patterns are joined into one alternation.
+    Patterns that cannot be combined (backreferences, named groups, global
+    inline flags) are kept as separate regexes. search() is equivalent to
+    any(re.search(p, url) for p in patterns).
+    """
+
+    def __init__(self, patterns: List[str]):
+        """
+        Initializes the PatternMatcher.
+
+        Args:
+            patterns: A list of regex patterns.
+
+        Raises:
+            re.error: If any pattern is not a valid regex.
+        """
+        self.patterns = list(patterns)
+        for pattern in self.patterns:
+            re.compile(pattern)  # Surface invalid patterns with the same error as before
+
+        anchored: List[Tuple[str, str]] = []
+        unanchored: List[Tuple[str, str]] = []
+        general: List[str] = []
+        self._separate: List[Pattern] = []
+        for pattern in self.patterns:
+            if _UNCOMBINABLE_RE.search(pattern) or pattern.startswith('(?') and pattern[2:3].isalpha():
+                # Global inline flags such as '(?i)' would apply to every other pattern
+                self._separate.append(re.compile(pattern))
+                continue
+            is_anchored = pattern.startswith('^')
+            body = pattern[1:] if is_anchored else pattern
+            prefix, remainder = ('', body) if '|' in body else _split_literal_prefix(body)
+            if not prefix:
+                general.append(f"(?:{pattern})")
+            elif is_anchored:
+                anchored.append((prefix, remainder))
+            else:
+                unanchored.append((prefix, remainder))
+
+        # Kept as separate regexes: a leading '^' branch or a branch without a
+        # literal start stops the regex engine from skipping ahead to positions
+        # where one of the prefixes can start
+        self._anchored = re.compile(_build_trie_regex(anchored)) if anchored else None
+        self._unanchored = re.compile(_build_trie_regex(unanchored)) if unanchored else None
+        self._general = re.compile('|'.join(general)) if general else None
+
+    def search(self, url: str) -> bool:
+        """Checks if any pattern matches anywhere in the URL."""
+        if self._unanchored is not None and self._unanchored.search(url):
+            return True
+        if self._anchored is not None and self._anchored.match(url):
+            return True
+        if self._general is not None and self._general.search(url):
+            return True
+        return any(pattern.search(url) for pattern in self._separate)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
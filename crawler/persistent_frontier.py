@@ -0,0 +1,314 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from crawler.scheduler import DomainScheduler
+from database.connection import CrawlState, upgrade_tables
+
+logger = logging.getLogger(__name__)
+
+class PersistentFrontier:
+    """
+    A durable crawl frontier backed by the crawl_state table.
+
+    Discovered URLs and status transitions are buffered in memory and written
+    in batches, so the crawler does not pay a database round-trip per URL.
+    Pending work is claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED,
+    which lets a restarted crawler (or several crawlers sharing a site) pick
+    up exactly the URLs that are still pending. Claimed URLs are served
+    through an in-memory DomainScheduler, so per-domain politeness behaves
+    the same as with the in-memory frontier.
+
+    Writes are at-least-once: URLs whose completion had not been flushed when
+    a crawler died stay 'in_progress' until their lease expires and are then
+    crawled again. Expired claims are released whenever a claim comes back
+    empty, and close() hands back this crawler's unfinished claims at once.
+
+    Only URLs fetched successfully end up 'completed'. Failed fetches go back
+    to 'pending' until max_retries is reached, or straight to 'failed' when
+    retrying cannot help (e.g. a 404); URLs popped but not fetched (already
+    visited, too deep, disallowed) end up 'skipped'.
+    """
+
+    def __init__(self, db: Session, strategy: str = 'bfs', default_delay: float = 1.0, site_id: Optional[Any] = None,
+                 batch_size: int = 100, claim_size: int = 50, max_retries: int = 3, lease_seconds: int = 600,
+                 scorer: Optional[Callable[[str, int], float]] = None):
+        """
+        Initializes the PersistentFrontier, adds crawl_state columns missing from older
+        databases and releases expired claims from earlier runs.
+
+        Args:
+            db: The SQLAlchemy database session.
+            strategy: 'bfs' claims the shallowest pending URLs first, 'dfs' the deepest.
+                      'priority' claims like 'bfs' and orders each claimed batch by score.
+            default_delay: Seconds to wait between requests to the same domain.
+            site_id: Optional site the crawl belongs to. Claims are restricted to it.
+            batch_size: Number of buffered writes that triggers a flush.
+            claim_size: Number of pending URLs claimed per database round-trip.
+            max_retries: Failed fetches are retried until retry_count reaches this value.
+            lease_seconds: Age after which an 'in_progress' URL is considered abandoned.
+            scorer: For 'priority', a function (url, depth) -> score.
+        """
+        self.db = db
+        self.strategy = strategy
+        self.site_id = site_id
+        self.batch_size = batch_size
+        self.claim_size = claim_size
+        self.max_retries = max_retries
+        self.lease_seconds = lease_seconds
+
+        self._local = DomainScheduler(strategy=strategy, default_delay=default_delay, scorer=scorer)
+        self._discovered: Dict[str, int] = {}
+        self._completed: List[str] = []
+        self._failed: List[str] = []
+        self._given_up: List[str] = []
+        self._skipped: List[str] = []
+        # URLs claimed by this process whose outcome has not been recorded yet
+        self._claimed: Set[str] = set()
+        # Claimed URLs that had been claimed before, by this or an earlier crawler
+        self._retries: Set[str] = set()
+
+        upgrade_tables(db.get_bind())
+        self.release_expired_claims()
+
+    def push(self, url: str, depth: int):
+        """Buffers a discovered URL for insertion as 'pending'."""
+        self._discovered.setdefault(url, depth)
+        if len(self._discovered) >= self.batch_size:
+            self.flush()
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Returns the next (url, depth) pair, claiming more pending work when the local batch runs out.
+
+        Returns:
+            The next (url, depth) pair, or None if every claimed domain is still
+            within its politeness delay or no pending work is left.
+        """
+        if not len(self._local):
+            self._claim_batch()
+        return self._local.pop()
+
+    def mark_done(self, url: str, success: bool = True, retryable: bool = True):
+        """
+        Buffers the outcome of a fetch as a status transition.
+
+        Args:
+            url: The fetched URL.
+            success: Whether the fetch succeeded.
+            retryable: For a failed fetch, whether fetching it again could
+                       succeed. If not, the URL is marked 'failed' at once.
+        """
+        if success:
+            self._record(url, self._completed)
+        else:
+            self._record(url, self._failed if retryable else self._given_up)
+
+    def skip(self, url: str):
+        """Buffers a claimed URL that was not fetched, e.g. because it was already visited, as 'skipped'."""
+        self._record(url, self._skipped)
+
+    def is_retry(self, url: str) -> bool:
+        """
+        Whether a popped URL had been claimed before: an earlier fetch failed
+        or its crawler died. Such a URL may already be in the visited set.
+        """
+        return url in self._retries
+
+    def retry(self, url: str, depth: int):
+        """
+        Returns a claimed URL to 'pending' to be fetched again, e.g. after the server throttled it.
+
+        Counts as a failed attempt, so a URL is given up once retry_count reaches max_retries.
+        """
+        self.mark_done(url, success=False)
+
+    def record_fetch(self, domain: str):
+        """Starts the politeness delay for a domain after a request has been sent to it."""
+        self._local.record_fetch(domain)
+
+    def defer(self, domain: str, seconds: float):
+        """Keeps a domain from being served for at least the given number of seconds."""
+        self._local.defer(domain, seconds)
+
+    def time_until_ready(self) -> float:
+        """Returns the number of seconds until some claimed domain becomes ready."""
+        return self._local.time_until_ready()
+
+    def set_delay(self, domain: str, delay: float):
+        """Overrides the politeness delay for a single domain."""
+        self._local.set_delay(domain, delay)
+
+    def get_delay(self, domain: str) -> float:
+        """Returns the politeness delay for a domain."""
+        return self._local.get_delay(domain)
+
+    def flush(self):
+        """Writes all buffered discoveries and status transitions in one transaction."""
+        if not (self._discovered or self._pending_updates()):
+            return
+        try:
+            if self._discovered:
+                rows = [
+                    {"url": url, "site_id": self.site_id, "status": "pending", "depth": depth, "retry_count": 0}
+                    for url, depth in self._discovered.items()
+                ]
+                stmt = insert(CrawlState).values(rows).on_conflict_do_nothing(index_elements=[CrawlState.url])
+                self.db.execute(stmt)
+
+            now = datetime.now(timezone.utc)
+            if self._completed:
+                self.db.query(CrawlState).filter(CrawlState.url.in_(self._completed)).update(
+                    {CrawlState.status: "completed", CrawlState.last_crawled: now},
+                    synchronize_session=False,
+                )
+            if self._skipped:
+                self.db.query(CrawlState).filter(CrawlState.url.in_(self._skipped)).update(
+                    {CrawlState.status: "skipped"}, synchronize_session=False,
+                )
+            if self._given_up:
+                self.db.query(CrawlState).filter(CrawlState.url.in_(self._given_up)).update(
+                    {CrawlState.retry_count: CrawlState.retry_count + 1, CrawlState.status: "failed",
+                     CrawlState.last_crawled: now},
+                    synchronize_session=False,
+                )
+            if self._failed:
+                # SET expressions see the old retry_count, so this counts the current failure
+                self.db.query(CrawlState).filter(CrawlState.url.in_(self._failed)).update(
+                    {
+                        CrawlState.retry_count: CrawlState.retry_count + 1,
+                        CrawlState.status: case(
+                            (CrawlState.retry_count + 1 >= self.max_retries, "failed"),
+                            else_="pending",
+                        ),
+                        CrawlState.last_crawled: now,
+                    },
+                    synchronize_session=False,
+                )
+            self.db.commit()
+            logger.debug(f"Flushed {len(self._discovered)} discovered URLs and "
+                         f"{self._pending_updates()} status updates to crawl_state.")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error flushing crawl frontier to crawl_state: {e}", exc_info=True)
+            raise
+        self._discovered.clear()
+        for updates in (self._completed, self._failed, self._given_up, self._skipped):
+            updates.clear()
+
+    def release_expired_claims(self) -> int:
+        """
+        Returns 'in_progress' URLs whose lease has expired to 'pending'.
+
+        Returns:
+            The number of URLs released.
+        """
+        released = self._expired_claims().update({CrawlState.status: "pending"}, synchronize_session=False)
+        self.db.commit()
+        if released:
+            logger.info(f"Released {released} abandoned in-progress URLs back to pending.")
+        return released
+
+    def close(self):
+        """Flushes any buffered writes and returns this process's unfinished claims to 'pending'."""
+        self.flush()
+        if not self._claimed:
+            return
+        try:
+            self.db.query(CrawlState).filter(
+                CrawlState.url.in_(self._claimed),
+                CrawlState.status == "in_progress",
+            ).update({CrawlState.status: "pending"}, synchronize_session=False)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error releasing claimed URLs in crawl_state: {e}", exc_info=True)
+            raise
+        logger.info(f"Released {len(self._claimed)} unfinished claimed URLs back to pending.")
+        self._claimed.clear()
+        self._retries.clear()
+
+    def __len__(self) -> int:
+        """Returns the number of URLs claimed or buffered by this process."""
+        return len(self._local) + len(self._discovered)
+
+    def __bool__(self) -> bool:
+        """Whether any work is left, here or in crawl_state. Nothing is claimed by asking."""
+        if len(self._local) or self._discovered:
+            return True
+        pending = self._site_filter(self.db.query(CrawlState.url).filter(CrawlState.status == "pending"))
+        if self.db.query(pending.exists()).scalar():
+            return True
+        return self.db.query(self._expired_claims().exists()).scalar()
+
+    def _record(self, url: str, updates: List[str]):
+        """Buffers a status transition of a claimed URL, flushing once the batch is full."""
+        self._claimed.discard(url)
+        self._retries.discard(url)
+        updates.append(url)
+        if self._pending_updates() >= self.batch_size:
+            self.flush()
+
+    def _pending_updates(self) -> int:
+        return len(self._completed) + len(self._failed) + len(self._given_up) + len(self._skipped)
+
+    def _site_filter(self, query):
+        """Restricts a crawl_state query to this frontier's site, if it has one."""
+        return query.filter(CrawlState.site_id == self.site_id) if self.site_id is not None else query
+
+    def _expired_claims(self):
+        """Returns a query of the 'in_progress' URLs whose lease has expired."""
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lease_seconds)
+        return self._site_filter(self.db.query(CrawlState).filter(
+            CrawlState.status == "in_progress",
+            CrawlState.last_crawled < cutoff,
+        ))
+
+    def _claim_batch(self):
+        """
+        Flushes buffered writes, then claims a batch of pending URLs for this process.
+
+        When nothing is pending, the claims of crawlers whose lease has expired
+        are released and claimed instead.
+        """
+        self.flush()
+        claimed = self._claim_pending()
+        if not claimed and self.release_expired_claims():
+            claimed = self._claim_pending()
+
+        for row in claimed:
+            self._claimed.add(row.url)
+            # last_crawled is only set once a URL has been claimed
+            if row.last_crawled is not None:
+                self._retries.add(row.url)
+            self._local.push(row.url, row.depth or 0)
+        if claimed:
+            logger.info(f"Claimed {len(claimed)} pending URLs from crawl_state.")
+
+    def _claim_pending(self) -> List[Any]:
+        """Marks up to claim_size pending URLs 'in_progress' and returns their (url, depth, last_crawled) rows."""
+        query = self._site_filter(self.db.query(CrawlState.url, CrawlState.depth, CrawlState.last_crawled)
+                                  .filter(CrawlState.status == "pending"))
+        if self.strategy == 'dfs':
+            query = query.order_by(CrawlState.depth.desc(), CrawlState.discovered_at.desc())
+        else:
+            query = query.order_by(CrawlState.depth, CrawlState.discovered_at)
+
+        try:
+            claimed = query.limit(self.claim_size).with_for_update(skip_locked=True).all()
+            if claimed:
+                # last_crawled doubles as the claim timestamp for lease expiry
+                self.db.query(CrawlState).filter(CrawlState.url.in_([row.url for row in claimed])).update(
+                    {CrawlState.status: "in_progress", CrawlState.last_crawled: datetime.now(timezone.utc)},
+                    synchronize_session=False,
+                )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Error claiming pending URLs from crawl_state: {e}", exc_info=True)
+            raise
+        return claimed
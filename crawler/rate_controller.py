@@ -0,0 +1,199 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+# Responses that mean the server wants us to slow down
+BACKOFF_STATUSES = {429, 503}
+
+
+def is_retryable(status_code: Optional[int]) -> bool:
+    """
+    Checks if a failed fetch may succeed when tried again: no response at
+    all, a server error, a timeout or throttling. Other 4xx answers are final.
+    """
+    return status_code is None or status_code >= 500 or status_code in (408, 429)
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parses a Retry-After header given either as seconds or as an HTTP date.
+
+    Returns:
+        The number of seconds to wait, or None if the value is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+def min_delay_from_rate_limit(rate_limit: Mapping[str, Any]) -> Optional[float]:
+    """
+    Converts a site config 'rate_limit' block into the shortest allowed delay between requests.
+
+    Understands requests_per_minute, requests_per_second and
+    delay_between_requests; the strictest one wins.
+    """
+    delays = []
+    if rate_limit.get('requests_per_minute'):
+        delays.append(60.0 / rate_limit['requests_per_minute'])
+    if rate_limit.get('requests_per_second'):
+        delays.append(1.0 / rate_limit['requests_per_second'])
+    if rate_limit.get('delay_between_requests'):
+        delays.append(float(rate_limit['delay_between_requests']))
+    return max(delays) if delays else None
+
+
+@dataclass
+class _DomainRate:
+    delay: float
+    min_delay: float
+    concurrency: int
+    latency: Optional[float] = None   # Exponentially weighted moving average, seconds
+    baseline: Optional[float] = None  # Typical latency average of the domain
+    stable_responses: int = 0
+    backoffs: int = 0
+
+
+class RateController:
+    """
+    Adapts the request rate and concurrency of each domain with AIMD.
+
+    The request rate (1 / delay) grows additively while responses keep coming
+    back without errors and without latency rising above the domain's
+    baseline, up to the domain's ceiling (its shortest allowed delay). A 429
+    or 503 halves the rate and the concurrency at once, and a Retry-After
+    header pauses the domain for as long as the server asks. A latency spike
+    only takes concurrency down by one, as it is an early sign of load rather
+    than a refusal. Fast sites therefore converge to their ceiling while
+    struggling ones are quickly given room.
+    """
+
+    def __init__(self, initial_delay: float = 1.0, min_delay: float = 0.0, max_delay: float = 60.0,
+                 max_concurrency: int = 1, rate_step: float = 0.25, decrease_factor: float = 0.5,
+                 latency_tolerance: float = 2.0, stable_window: int = 5, max_retry_after: float = 3600.0,
+                 domain_min_delays: Optional[Dict[str, float]] = None):
+        """
+        Initializes the RateController.
+
+        Args:
+            initial_delay: Delay in seconds each domain starts with.
+            min_delay: Shortest delay for domains without their own ceiling.
+            max_delay: Longest delay backoff can reach.
+            max_concurrency: Upper bound on concurrent requests per domain.
+            rate_step: Requests per second added after each stable window.
+            decrease_factor: Rate and concurrency multiplier on a 429/503.
+            latency_tolerance: Latency above baseline * tolerance counts as a spike.
+            stable_window: Consecutive healthy responses needed before speeding up.
+            max_retry_after: Upper bound in seconds on a Retry-After pause.
+            domain_min_delays: Per-domain ceilings as shortest delays, e.g. from a
+                               site's rate_limit.requests_per_minute.
+        """
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self.rate_step = rate_step
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.stable_window = stable_window
+        self.max_retry_after = max_retry_after
+        self.domain_min_delays = dict(domain_min_delays or {})
+        self._domains: Dict[str, _DomainRate] = {}
+
+    def get_delay(self, domain: str) -> float:
+        """Returns the current delay in seconds between requests to a domain."""
+        return self._state(domain).delay
+
+    def get_concurrency(self, domain: str) -> int:
+        """Returns the current number of concurrent requests allowed for a domain."""
+        return self._state(domain).concurrency
+
+    def set_min_delay(self, domain: str, min_delay: float):
+        """Raises a domain's shortest delay, e.g. to a robots.txt Crawl-delay."""
+        state = self._state(domain)
+        state.min_delay = max(state.min_delay, min_delay)
+        state.delay = max(state.delay, state.min_delay)
+
+    def record(self, domain: str, status_code: Optional[int], latency: Optional[float],
+               retry_after: Optional[str] = None) -> float:
+        """
+        Updates a domain's rate from the outcome of a request.
+
+        Args:
+            domain: The domain the request was sent to.
+            status_code: The HTTP status, or None if the request failed without a response.
+            latency: Seconds until the response headers arrived, if any.
+            retry_after: The Retry-After header value, if any.
+
+        Returns:
+            Seconds the domain should be paused for (0.0 if no pause was asked for).
+        """
+        state = self._state(domain)
+        if status_code in BACKOFF_STATUSES:
+            self._back_off(domain, state, f"HTTP {status_code}")
+            pause = parse_retry_after(retry_after)
+            return min(pause, self.max_retry_after) if pause else 0.0
+        if status_code is None or latency is None:
+            # Timeouts and connection errors are not counted as healthy responses
+            state.stable_responses = 0
+            return 0.0
+
+        state.latency = latency if state.latency is None else 0.7 * state.latency + 0.3 * latency
+        # The baseline follows drops at once and drifts up slowly, so a lasting change
+        # in a site's latency becomes its new normal instead of a permanent spike
+        state.baseline = state.latency if state.baseline is None else min(state.baseline * 1.05, state.latency)
+        if state.latency > state.baseline * self.latency_tolerance:
+            state.stable_responses = 0
+            if state.concurrency > 1:
+                state.concurrency -= 1
+                logger.debug(f"Latency on {domain} rose to {state.latency:.2f}s; concurrency now {state.concurrency}.")
+            return 0.0
+
+        state.stable_responses += 1
+        if state.stable_responses >= self.stable_window:
+            state.stable_responses = 0
+            rate = 1.0 / state.delay if state.delay > 0 else float('inf')
+            state.delay = max(state.min_delay, 1.0 / (rate + self.rate_step))
+            state.concurrency = min(self.max_concurrency, state.concurrency + 1)
+        return 0.0
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the current delay, concurrency and backoff count of every domain."""
+        return {
+            domain: {"delay": round(state.delay, 3), "concurrency": state.concurrency, "backoffs": state.backoffs}
+            for domain, state in self._domains.items()
+        }
+
+    def _back_off(self, domain: str, state: _DomainRate, reason: str):
+        state.stable_responses = 0
+        state.backoffs += 1
+        # Halving the rate doubles the delay; a zero delay restarts from the initial one
+        delay = state.delay / self.decrease_factor if state.delay > 0 else (self.initial_delay or 1.0)
+        state.delay = min(self.max_delay, max(delay, state.min_delay))
+        state.concurrency = max(1, int(state.concurrency * self.decrease_factor))
+        logger.info(f"{reason} from {domain}: backing off to {state.delay:.2f}s between requests, "
+                    f"concurrency {state.concurrency}.")
+
+    def _state(self, domain: str) -> _DomainRate:
+        state = self._domains.get(domain)
+        if state is None:
+            min_delay = self.domain_min_delays.get(domain, self.min_delay)
+            state = self._domains[domain] = _DomainRate(
+                delay=max(self.initial_delay, min_delay),
+                min_delay=min_delay,
+                concurrency=1,
+            )
+        return state
@@ -0,0 +1,259 @@
+import logging
+import os
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+class RedisFrontier:
+    """
+    A crawl frontier in Redis, shared by crawler workers on any number of nodes.
+
+    Keys, all under one prefix per crawl:
+        {prefix}:q:{domain}   Sorted set of queued URLs of a domain, ordered by strategy.
+        {prefix}:depth        Hash of queued URL -> depth.
+        {prefix}:domains      Sorted set of domains with queued URLs, scored by the
+                              time they are next expected to be ready.
+        {prefix}:lease:{domain}
+                              Politeness lease. A worker may only take a URL of a
+                              domain by creating this key (SET NX), and it expires
+                              after the domain's delay, so all workers together
+                              respect the rate limit of each domain.
+        {prefix}:delays       Hash of per-domain delay overrides (e.g. Crawl-delay).
+        {prefix}:inflight     Sorted set of URLs being fetched, scored by claim time.
+        {prefix}:inflight:depth
+                              Hash of in-flight URL -> depth, to queue it again.
+        {prefix}:recovered    Set of URLs queued again after their worker's lease expired.
+
+    Every step is a single atomic Redis command, so no Lua scripting is needed
+    and the frontier works against an in-process fake. A queued URL is never
+    handed to two workers: ZADD NX keeps one entry per URL and ZPOPMIN hands it
+    out once. Together with a shared visited set (visited_backend 'redis') no
+    URL is fetched twice.
+
+    A worker that dies leaves its URLs in flight. Once their lease has
+    expired, any worker moves them back to their queues (ZREM decides which
+    one), so they are fetched again; a worker that was merely slow may then
+    see its URL fetched a second time.
+    """
+
+    def __init__(self, strategy: str = 'bfs', default_delay: float = 1.0, crawl_id: str = 'default',
+                 url: Optional[str] = None, client: Any = None,
+                 scorer: Optional[Callable[[str, int], float]] = None,
+                 lease_seconds: int = 600, poll_interval: float = 0.5, scan_size: int = 20):
+        """
+        Initializes the RedisFrontier.
+
+        Args:
+            strategy: 'bfs', 'dfs' or 'priority'; orders URLs within a domain.
+            default_delay: Seconds to wait between requests to the same domain.
+            crawl_id: Name of the shared crawl; workers with the same id share the frontier.
+            url: Redis URL. Defaults to the REDIS_URL environment variable.
+            client: An existing redis.Redis client, e.g. a fakeredis instance in tests.
+            scorer: For 'priority', a function (url, depth) -> score; higher first.
+            lease_seconds: Age after which an in-flight URL is taken to belong to a
+                           dead worker and is queued again.
+            poll_interval: Seconds to wait when the queue is empty but other workers
+                           are still fetching.
+            scan_size: Number of ready domains examined per pop.
+        """
+        if strategy not in ('bfs', 'dfs', 'priority'):
+            raise ValueError(f"Unsupported crawling strategy: {strategy}")
+        if client is None:
+            import redis  # Only needed when this frontier is selected
+            client = redis.Redis.from_url(url or os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+        self._redis = client
+        self.strategy = strategy
+        self.default_delay = default_delay
+        self.prefix = f"crawler:{crawl_id}"
+        self.scorer = scorer or (lambda url, depth: -depth)
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.scan_size = scan_size
+        self.worker_id = uuid.uuid4().hex
+        self._delays: Dict[str, float] = {}
+        # Popped URLs that were recovered from a dead worker's lease
+        self._retries: Set[str] = set()
+        self._next_lease_check = 0.0
+
+    def push(self, url: str, depth: int):
+        """Adds a URL at the given depth to its domain's queue, unless it is already queued."""
+        domain = urlparse(url).netloc
+        pipe = self._redis.pipeline(transaction=True)
+        # The queue entry is written before the domain is scheduled, see _unschedule()
+        pipe.hsetnx(f"{self.prefix}:depth", url, depth)
+        pipe.zadd(f"{self.prefix}:q:{domain}", {url: self._order(url, depth)}, nx=True)
+        pipe.zadd(f"{self.prefix}:domains", {domain: time.time()}, nx=True)
+        pipe.execute()
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Removes and returns the next (url, depth) pair from a domain no worker holds a lease on.
+
+        Returns:
+            The next (url, depth) pair, or None if every domain with queued URLs
+            is still within its politeness delay.
+        """
+        now = time.time()
+        domains_key = f"{self.prefix}:domains"
+        for raw_domain in self._redis.zrangebyscore(domains_key, '-inf', now, start=0, num=self.scan_size):
+            domain = raw_domain.decode() if isinstance(raw_domain, bytes) else raw_domain
+            lease_key = f"{self.prefix}:lease:{domain}"
+            delay_ms = max(1, int(self.get_delay(domain) * 1000))
+            if not self._redis.set(lease_key, self.worker_id, nx=True, px=delay_ms):
+                # Another worker fetched from this domain recently; look again when its lease ends
+                remaining_ms = max(self._redis.pttl(lease_key), 0)
+                self._redis.zadd(domains_key, {domain: now + remaining_ms / 1000}, xx=True)
+                continue
+
+            popped = self._redis.zpopmin(f"{self.prefix}:q:{domain}")
+            if not popped:
+                self._redis.delete(lease_key)
+                self._unschedule(domain)
+                continue
+            raw_url = popped[0][0]
+            url = raw_url.decode() if isinstance(raw_url, bytes) else raw_url
+
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.hget(f"{self.prefix}:depth", url)
+            pipe.hdel(f"{self.prefix}:depth", url)
+            pipe.srem(f"{self.prefix}:recovered", url)
+            pipe.zadd(f"{self.prefix}:inflight", {url: now})
+            pipe.zadd(domains_key, {domain: now + delay_ms / 1000}, xx=True)
+            depth, _, recovered = pipe.execute()[:3]
+            depth = int(depth or 0)
+            self._redis.hset(f"{self.prefix}:inflight:depth", url, depth)
+            if recovered:
+                self._retries.add(url)
+            return url, depth
+        return None
+
+    def record_fetch(self, domain: str):
+        """Restarts the domain's politeness lease when a request is sent to it."""
+        self._redis.set(f"{self.prefix}:lease:{domain}", self.worker_id,
+                        px=max(1, int(self.get_delay(domain) * 1000)))
+
+    def defer(self, domain: str, seconds: float):
+        """Keeps every worker away from a domain for the given number of seconds, e.g. after Retry-After."""
+        lease_key = f"{self.prefix}:lease:{domain}"
+        if seconds * 1000 > max(self._redis.pttl(lease_key), 0):
+            self._redis.set(lease_key, self.worker_id, px=max(1, int(seconds * 1000)))
+
+    def mark_done(self, url: str, success: bool = True, retryable: bool = True):
+        """Records the outcome of a fetch. Failed URLs are kept in a set for inspection."""
+        self._retries.discard(url)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zrem(f"{self.prefix}:inflight", url)
+        pipe.hdel(f"{self.prefix}:inflight:depth", url)
+        if not success:
+            pipe.sadd(f"{self.prefix}:failed", url)
+        pipe.execute()
+
+    def skip(self, url: str):
+        """Records a popped URL that was not fetched, e.g. because it was already visited."""
+        self.mark_done(url)
+
+    def is_retry(self, url: str) -> bool:
+        """
+        Whether a popped URL was recovered from a dead worker, which may
+        already have marked it as visited.
+        """
+        return url in self._retries
+
+    def retry(self, url: str, depth: int):
+        """Queues a popped URL again, e.g. after the server throttled its fetch."""
+        self.mark_done(url)
+        self.push(url, depth)
+
+    def release_expired_leases(self) -> int:
+        """
+        Moves URLs whose worker's lease has expired back to their queues.
+
+        Returns:
+            The number of URLs this worker moved back.
+        """
+        cutoff = time.time() - self.lease_seconds
+        released = 0
+        for raw_url in self._redis.zrangebyscore(f"{self.prefix}:inflight", '-inf', cutoff):
+            url = raw_url.decode() if isinstance(raw_url, bytes) else raw_url
+            # Only the worker whose ZREM succeeds moves the URL, so it is queued once
+            if not self._redis.zrem(f"{self.prefix}:inflight", url):
+                continue
+            pipe = self._redis.pipeline(transaction=True)
+            pipe.hget(f"{self.prefix}:inflight:depth", url)
+            pipe.hdel(f"{self.prefix}:inflight:depth", url)
+            pipe.sadd(f"{self.prefix}:recovered", url)
+            depth = pipe.execute()[0]
+            self.push(url, int(depth or 0))
+            released += 1
+        if released:
+            logger.info(f"Queued {released} URLs of expired worker leases again.")
+        return released
+
+    def close(self):
+        """Nothing is buffered; every change is written to Redis immediately."""
+
+    def time_until_ready(self) -> float:
+        """
+        Returns the number of seconds until some domain is expected to become ready.
+
+        When nothing is queued but other workers are still fetching, returns the
+        poll interval, since their fetches may add new URLs.
+        """
+        earliest = self._redis.zrange(f"{self.prefix}:domains", 0, 0, withscores=True)
+        if not earliest:
+            return self.poll_interval
+        return max(0.0, earliest[0][1] - time.time())
+
+    def set_delay(self, domain: str, delay: float):
+        """Overrides the politeness delay for a single domain, for all workers."""
+        self._delays[domain] = delay
+        self._redis.hset(f"{self.prefix}:delays", domain, delay)
+
+    def get_delay(self, domain: str) -> float:
+        """Returns the politeness delay for a domain."""
+        if domain not in self._delays:
+            shared = self._redis.hget(f"{self.prefix}:delays", domain)
+            if shared is None:
+                return self.default_delay
+            self._delays[domain] = float(shared)
+        return self._delays[domain]
+
+    def __len__(self) -> int:
+        """Returns the number of queued URLs across all workers."""
+        return self._redis.hlen(f"{self.prefix}:depth")
+
+    def __bool__(self) -> bool:
+        """
+        True while URLs are queued or another worker is fetching a page that may add some.
+
+        Expired leases are released first, at most once per poll interval.
+        """
+        if time.time() >= self._next_lease_check:
+            self._next_lease_check = time.time() + self.poll_interval
+            self.release_expired_leases()
+        if len(self):
+            return True
+        cutoff = time.time() - self.lease_seconds
+        return self._redis.zcount(f"{self.prefix}:inflight", cutoff, '+inf') > 0
+
+    def _order(self, url: str, depth: int) -> float:
+        """Returns the sorted-set score of a URL; lower scores are popped first."""
+        if self.strategy == 'priority':
+            return -self.scorer(url, depth)
+        sequence = self._redis.incr(f"{self.prefix}:seq")
+        return sequence if self.strategy == 'bfs' else -sequence
+
+    def _unschedule(self, domain: str):
+        """
+        Removes a domain whose queue is empty from the schedule.
+
+        A concurrent push writes its queue entry before scheduling the domain,
+        so re-checking the queue after the removal cannot strand a URL.
+        """
+        domains_key = f"{self.prefix}:domains"
+        self._redis.zrem(domains_key, domain)
+        if self._redis.zcard(f"{self.prefix}:q:{domain}"):
+            self._redis.zadd(domains_key, {domain: time.time()}, nx=True)
@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+class RobotsCache:
+    """
+    A process-wide robots.txt cache shared by all crawler instances.
+
+    robots.txt is fetched once per scheme and host, using the scheme of the
+    URL being crawled, and kept for a TTL. Failed fetches are cached too
+    (negative caching) with a shorter TTL, so an unreachable host is not
+    asked again for every URL. Fetches run on a small thread pool: crawlers
+    call prefetch() as soon as a new domain is discovered, so robots.txt is
+    usually ready before the first URL of that domain reaches the head of the
+    frontier. The cache can be persisted to a JSON file to survive restarts.
+    """
+
+    def __init__(self, ttl: float = 86400, negative_ttl: float = 3600, persist_path: Optional[str] = None,
+                 user_agent: str = 'GeminiCrawler/1.0', timeout: float = 10, max_workers: int = 8,
+                 allow_on_error: bool = False):
+        """
+        Initializes the RobotsCache.
+
+        Args:
+            ttl: Seconds a successfully fetched robots.txt is kept.
+            negative_ttl: Seconds a failed fetch (network error, 5xx) is kept.
+            persist_path: Optional JSON file the cache is loaded from and saved to.
+            user_agent: The User-Agent sent when fetching robots.txt.
+            timeout: Timeout in seconds for a robots.txt request.
+            max_workers: Number of threads fetching robots.txt concurrently.
+            allow_on_error: Whether a host whose robots.txt could not be fetched
+                            may be crawled. Defaults to False (disallow).
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.persist_path = persist_path
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.allow_on_error = allow_on_error
+
+        # origin -> (parser, expires_at, record persisted to disk)
+        self._entries: Dict[str, Tuple[RobotFileParser, float, Dict[str, Any]]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        # Serialises saves, so an older snapshot never replaces a newer one
+        self._save_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='robots')
+        self._session = requests.Session()
+        self._session.headers.update({'User-Agent': user_agent})
+        self._load()
+
+    def can_fetch(self, user_agent: str, url: str) -> bool:
+        """Checks if robots.txt allows a user agent to fetch a URL, fetching robots.txt if needed."""
+        return self.get_parser(url).can_fetch(user_agent, url)
+
+    def crawl_delay(self, user_agent: str, url: str) -> Optional[float]:
+        """
+        Returns the delay in seconds robots.txt asks for between requests, if any.
+
+        Both Crawl-delay and Request-rate are honoured; the larger wins.
+        Fractional Crawl-delay values, which RobotFileParser ignores, are
+        read from the raw robots.txt.
+        """
+        parser = self.get_parser(url)
+        delays = []
+        crawl_delay = parser.crawl_delay(user_agent)
+        if crawl_delay is None:
+            entry = self._entries.get(self._origin(url))
+            crawl_delay = self._parse_crawl_delay(entry[2].get("body", ""), user_agent) if entry else None
+        if crawl_delay:
+            delays.append(float(crawl_delay))
+        request_rate = parser.request_rate(user_agent)
+        if request_rate and request_rate.requests:
+            delays.append(request_rate.seconds / request_rate.requests)
+        return max(delays) if delays else None
+
+    def sitemaps(self, url: str) -> List[str]:
+        """Returns the sitemap URLs listed in robots.txt for a URL's host."""
+        return list(self.get_parser(url).site_maps() or [])
+
+    @staticmethod
+    def _parse_crawl_delay(body: str, user_agent: str) -> Optional[float]:
+        """
+        Finds the Crawl-delay for a user agent, matching agents the way RobotFileParser does.
+        """
+        product = user_agent.split('/')[0].lower()
+        group_agents, in_rules = [], False
+        matched, default = None, None
+        for line in body.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            key, value = (part.strip() for part in line.split(':', 1))
+            key = key.lower()
+            if key == 'user-agent':
+                if in_rules:
+                    group_agents, in_rules = [], False
+                group_agents.append(value.lower())
+                continue
+            in_rules = True
+            if key != 'crawl-delay':
+                continue
+            try:
+                delay = float(value)
+            except ValueError:
+                continue
+            for agent in group_agents:
+                if agent == '*':
+                    default = delay if default is None else default
+                elif agent in product and matched is None:
+                    matched = delay
+        return matched if matched is not None else default
+
+    def get_parser(self, url: str) -> RobotFileParser:
+        """Returns the cached parser for a URL's host, waiting for the fetch if it is not cached yet."""
+        origin = self._origin(url)
+        parser = self._fresh_parser(origin)
+        if parser is not None:
+            return parser
+        return self.prefetch(url).result()
+
+    def is_cached(self, url: str) -> bool:
+        """Checks if a fresh robots.txt is cached for a URL's host."""
+        return self._fresh_parser(self._origin(url)) is not None
+
+    def prefetch(self, url: str) -> Future:
+        """
+        Starts fetching robots.txt for a URL's host in the background.
+
+        Returns:
+            A future resolving to the host's RobotFileParser. Concurrent callers
+            for the same host share one fetch.
+        """
+        origin = self._origin(url)
+        with self._lock:
+            entry = self._entries.get(origin)
+            if entry and entry[1] > time.time():
+                future: Future = Future()
+                future.set_result(entry[0])
+                return future
+            future = self._in_flight.get(origin)
+            if future is None:
+                future = self._executor.submit(self._fetch, origin)
+                self._in_flight[origin] = future
+            return future
+
+    def _fresh_parser(self, origin: str) -> Optional[RobotFileParser]:
+        entry = self._entries.get(origin)
+        if entry and entry[1] > time.time():
+            return entry[0]
+        return None
+
+    def _fetch(self, origin: str) -> RobotFileParser:
+        """Fetches and parses robots.txt for an origin, then stores the result."""
+        try:
+            record: Dict[str, Any] = {"fetched_at": time.time()}
+            try:
+                response = self._session.get(f"{origin}/robots.txt", timeout=self.timeout)
+                record["status"] = response.status_code
+                if response.status_code == 200:
+                    record["body"] = response.text
+                logger.info(f"Fetched robots.txt for {origin} (HTTP {response.status_code})")
+            except requests.RequestException as e:
+                record["status"] = None
+                logger.warning(f"Could not read robots.txt for {origin}: {e}")
+            except Exception as e:
+                # E.g. a body that cannot be decoded; cached like a network error
+                record = {"fetched_at": record["fetched_at"], "status": None}
+                logger.warning(f"Could not read robots.txt for {origin}: {e}", exc_info=True)
+
+            parser = self._build_parser(origin, record)
+            ttl = self.negative_ttl if self._is_error(record) else self.ttl
+            with self._lock:
+                self._entries[origin] = (parser, record["fetched_at"] + ttl, record)
+        finally:
+            # A failed future must not stay in flight, or every later lookup would re-raise its error
+            with self._lock:
+                self._in_flight.pop(origin, None)
+        self._save()
+        return parser
+
+    def _build_parser(self, origin: str, record: Dict[str, Any]) -> RobotFileParser:
+        """Rebuilds a RobotFileParser from a fetch record, following RobotFileParser.read() semantics."""
+        parser = RobotFileParser(f"{origin}/robots.txt")
+        status = record.get("status")
+        if status == 200:
+            parser.parse(record.get("body", "").splitlines())
+        elif status in (401, 403):
+            parser.disallow_all = True
+        elif status is not None and 400 <= status < 500:
+            parser.allow_all = True
+        elif self.allow_on_error:
+            parser.allow_all = True
+        else:
+            parser.disallow_all = True
+        # can_fetch() refuses everything until the parser has been marked as read
+        parser.modified()
+        return parser
+
+    @staticmethod
+    def _is_error(record: Dict[str, Any]) -> bool:
+        status = record.get("status")
+        return status is None or status >= 500
+
+    @staticmethod
+    def _origin(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme or 'https'}://{parts.netloc}"
+
+    def _load(self):
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, 'r') as f:
+                records = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load robots cache from {self.persist_path}: {e}")
+            return
+        for origin, record in records.items():
+            ttl = self.negative_ttl if self._is_error(record) else self.ttl
+            self._entries[origin] = (self._build_parser(origin, record), record["fetched_at"] + ttl, record)
+        logger.info(f"Loaded {len(records)} robots.txt entries from {self.persist_path}")
+
+    def _save(self):
+        if not self.persist_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                records = {origin: entry[2] for origin, entry in self._entries.items()}
+            # A temporary file of its own, so concurrent saves (also from other processes) never interleave
+            directory = os.path.dirname(os.path.abspath(self.persist_path))
+            tmp_path = None
+            try:
+                fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(self.persist_path) + '.', suffix='.tmp',
+                                                dir=directory)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(records, f)
+                os.replace(tmp_path, self.persist_path)
+            except OSError as e:
+                logger.warning(f"Could not save robots cache to {self.persist_path}: {e}")
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+
+
+_shared_cache: Optional[RobotsCache] = None
+_shared_cache_lock = threading.Lock()
+
+def get_robots_cache(**options) -> RobotsCache:
+    """
+    Returns the process-wide RobotsCache, creating it with the given options on first use.
+    """
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = RobotsCache(**options)
+        return _shared_cache
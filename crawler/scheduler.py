@@ -0,0 +1,213 @@
+import functools
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+
+class _FIFOQueue:
+    """Per-domain queue for breadth-first crawling."""
+
+    def __init__(self):
+        self._items: Deque[Tuple[str, int]] = deque()
+
+    def push(self, url: str, depth: int):
+        self._items.append((url, depth))
+
+    def pop(self) -> Tuple[str, int]:
+        return self._items.popleft()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class _LIFOQueue(_FIFOQueue):
+    """Per-domain queue for depth-first crawling."""
+
+    def pop(self) -> Tuple[str, int]:
+        return self._items.pop()
+
+
+class _PriorityQueue:
+    """Per-domain queue for best-first crawling: the highest-scoring URL is popped first."""
+
+    def __init__(self, scorer: Callable[[str, int], float]):
+        self._scorer = scorer
+        self._heap: List[Tuple[float, int, str, int]] = []
+        self._counter = itertools.count()
+
+    def push(self, url: str, depth: int):
+        # Negated for the min-heap; the counter keeps discovery order among equal scores
+        heapq.heappush(self._heap, (-self._scorer(url, depth), next(self._counter), url, depth))
+
+    def pop(self) -> Tuple[str, int]:
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+def _depth_score(url: str, depth: int) -> float:
+    """Default priority: shallower URLs first."""
+    return -depth
+
+
+class DomainScheduler:
+    """
+    A politeness-aware crawl frontier with one queue per domain.
+
+    Each domain carries a next-eligible timestamp. Domains with queued URLs are
+    kept in a heap ordered by that timestamp, so the scheduler always serves a
+    domain that may be fetched right now instead of blocking on the domain at
+    the head of a single global queue. The crawl strategy decides the order of
+    URLs within each domain's queue; with 'priority' the order is best-first by
+    the scorer, so it applies within a domain while politeness decides which
+    domain is served next.
+    """
+
+    QUEUE_TYPES: Dict[str, Callable[..., Any]] = {
+        'bfs': _FIFOQueue,
+        'dfs': _LIFOQueue,
+        'priority': _PriorityQueue,
+    }
+
+    def __init__(self, strategy: str = 'bfs', default_delay: float = 1.0, clock: Callable[[], float] = time.monotonic,
+                 scorer: Optional[Callable[[str, int], float]] = None):
+        """
+        Initializes the DomainScheduler.
+
+        Args:
+            strategy: The crawl strategy used to order URLs within a domain:
+                      'bfs', 'dfs' or 'priority'.
+            default_delay: Seconds to wait between requests to the same domain.
+            clock: Monotonic time source, injectable for testing.
+            scorer: For 'priority', a function (url, depth) -> score; higher
+                    scores are crawled first. Defaults to shallowest first.
+        """
+        if strategy not in self.QUEUE_TYPES:
+            raise ValueError(f"Unsupported crawling strategy: {strategy}")
+        self.strategy = strategy
+        self.default_delay = default_delay
+        self._clock = clock
+        queue_type = self.QUEUE_TYPES[strategy]
+        if queue_type is _PriorityQueue:
+            self._new_queue = functools.partial(_PriorityQueue, scorer or _depth_score)
+        else:
+            self._new_queue = queue_type
+
+        self._queues: Dict[str, Any] = {}
+        self._delays: Dict[str, float] = {}
+        self._next_eligible: Dict[str, float] = {}
+        # Heap of (next_eligible, tie_breaker, domain) for domains with queued URLs.
+        # Entries may be stale; they are corrected lazily when they reach the top.
+        self._ready_heap: List[Tuple[float, int, str]] = []
+        self._scheduled: Set[str] = set()
+        self._counter = itertools.count()
+        self._size = 0
+
+    def push(self, url: str, depth: int):
+        """Adds a URL at the given depth to its domain's queue."""
+        domain = urlparse(url).netloc
+        queue = self._queues.get(domain)
+        if queue is None:
+            queue = self._queues[domain] = self._new_queue()
+        queue.push(url, depth)
+        self._size += 1
+        if domain not in self._scheduled:
+            self._schedule(domain)
+
+    def pop(self) -> Optional[Tuple[str, int]]:
+        """
+        Removes and returns the next (url, depth) pair from a domain that is ready.
+
+        Returns:
+            The next (url, depth) pair, or None if every domain with queued URLs
+            is still within its politeness delay.
+        """
+        domain = self._peek_ready_domain()
+        if domain is None:
+            return None
+
+        heapq.heappop(self._ready_heap)
+        self._scheduled.discard(domain)
+        queue = self._queues[domain]
+        item = queue.pop()
+        self._size -= 1
+        if len(queue):
+            self._schedule(domain)
+        else:
+            del self._queues[domain]
+        return item
+
+    def record_fetch(self, domain: str):
+        """Starts the politeness delay for a domain after a request has been sent to it."""
+        self._next_eligible[domain] = self._clock() + self.get_delay(domain)
+
+    def defer(self, domain: str, seconds: float):
+        """Keeps a domain from being served for at least the given number of seconds, e.g. after Retry-After."""
+        self._next_eligible[domain] = max(self._next_eligible.get(domain, 0.0), self._clock() + seconds)
+
+    def mark_done(self, url: str, success: bool = True, retryable: bool = True):
+        """Records the outcome of a fetch. The in-memory frontier keeps no per-URL state."""
+
+    def skip(self, url: str):
+        """Records a popped URL that was not fetched. Nothing to record in memory."""
+
+    def is_retry(self, url: str) -> bool:
+        """Whether a popped URL is an earlier failed fetch. The in-memory frontier never retries on its own."""
+        return False
+
+    def retry(self, url: str, depth: int):
+        """Queues a popped URL again, e.g. after the server throttled its fetch."""
+        self.push(url, depth)
+
+    def close(self):
+        """Releases frontier resources. Nothing to do for the in-memory frontier."""
+
+    def time_until_ready(self) -> float:
+        """
+        Returns the number of seconds until some domain becomes ready.
+
+        Returns 0.0 if a domain is ready now or the scheduler is empty.
+        """
+        if not self._ready_heap:
+            return 0.0
+        self._refresh_top()
+        return max(0.0, self._ready_heap[0][0] - self._clock())
+
+    def set_delay(self, domain: str, delay: float):
+        """Overrides the politeness delay for a single domain."""
+        self._delays[domain] = delay
+
+    def get_delay(self, domain: str) -> float:
+        """Returns the politeness delay for a domain."""
+        return self._delays.get(domain, self.default_delay)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _schedule(self, domain: str):
+        eligible_at = self._next_eligible.get(domain, 0.0)
+        heapq.heappush(self._ready_heap, (eligible_at, next(self._counter), domain))
+        self._scheduled.add(domain)
+
+    def _refresh_top(self):
+        """Re-queues the top heap entry while its timestamp is out of date."""
+        while True:
+            eligible_at, _, domain = self._ready_heap[0]
+            current = self._next_eligible.get(domain, 0.0)
+            if current <= eligible_at:
+                return
+            heapq.heapreplace(self._ready_heap, (current, next(self._counter), domain))
+
+    def _peek_ready_domain(self) -> Optional[str]:
+        if not self._ready_heap:
+            return None
+        self._refresh_top()
+        eligible_at, _, domain = self._ready_heap[0]
+        if eligible_at > self._clock():
+            return None
+        return domain
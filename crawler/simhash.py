@@ -0,0 +1,144 @@
+import hashlib
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+FINGERPRINT_BITS = 64
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def simhash(text: str, shingle_size: int = 3) -> Tuple[int, int]:
+    """
+    Computes the 64-bit SimHash fingerprint of a text.
+
+    The text is split into overlapping word shingles; each shingle's hash
+    votes on every bit, weighted by how often the shingle occurs. Similar
+    texts get fingerprints that differ in few bits.
+
+    Returns:
+        A tuple of (fingerprint, number of shingles). The fingerprint is 0
+        for a text without words.
+    """
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) < shingle_size:
+        shingles = Counter([' '.join(tokens)] if tokens else [])
+    else:
+        shingles = Counter(' '.join(tokens[i:i + shingle_size]) for i in range(len(tokens) - shingle_size + 1))
+    if not shingles:
+        return 0, 0
+
+    # Tally weights per (byte position, byte value) first, then spread each
+    # byte value over its 8 bits, instead of looping over 64 bits per shingle
+    byte_weights: List[Dict[int, int]] = [{} for _ in range(FINGERPRINT_BITS // 8)]
+    total = 0
+    for shingle, weight in shingles.items():
+        digest = hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest()
+        for position, value in enumerate(digest):
+            table = byte_weights[position]
+            table[value] = table.get(value, 0) + weight
+        total += weight
+
+    fingerprint = 0
+    for position, table in enumerate(byte_weights):
+        for bit in range(8):
+            ones = sum(weight for value, weight in table.items() if value >> bit & 1)
+            if ones * 2 > total:
+                fingerprint |= 1 << (position * 8 + bit)
+    return fingerprint, sum(shingles.values())
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Returns the number of bits in which two fingerprints differ."""
+    return bin(a ^ b).count('1')
+
+
+class SimHashIndex:
+    """
+    Finds fingerprints within a Hamming distance using band-based LSH.
+
+    The 64 bits are split into max_distance + 1 bands. Two fingerprints that
+    differ in at most max_distance bits must agree exactly on at least one
+    band, so only fingerprints sharing a band value are compared, instead of
+    every fingerprint seen so far.
+    """
+
+    def __init__(self, max_distance: int = 3):
+        """
+        Initializes the SimHashIndex.
+
+        Args:
+            max_distance: Largest Hamming distance counted as a near-duplicate.
+        """
+        self.max_distance = max_distance
+        num_bands = max_distance + 1
+        band_width = FINGERPRINT_BITS // num_bands
+        # (shift, mask) per band; the last band takes any remaining bits
+        self._bands = [
+            (i * band_width, (1 << (band_width if i < num_bands - 1 else FINGERPRINT_BITS - i * band_width)) - 1)
+            for i in range(num_bands)
+        ]
+        self._buckets: List[Dict[int, List[Tuple[int, str]]]] = [{} for _ in self._bands]
+        self._size = 0
+
+    def find(self, fingerprint: int) -> Optional[str]:
+        """Returns the key of a stored fingerprint within max_distance, if any."""
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            for candidate, key in buckets.get(fingerprint >> shift & mask, ()):
+                if hamming_distance(fingerprint, candidate) <= self.max_distance:
+                    return key
+        return None
+
+    def add(self, fingerprint: int, key: str):
+        """Stores a fingerprint under a key, e.g. the URL of the page."""
+        for (shift, mask), buckets in zip(self._bands, self._buckets):
+            buckets.setdefault(fingerprint >> shift & mask, []).append((fingerprint, key))
+        self._size += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class NearDuplicateDetector:
+    """
+    Detects pages whose content is nearly identical to a page seen earlier in the crawl.
+
+    Catches the same content served under different URLs (sort orders,
+    facet combinations, print views) that URL canonicalization cannot map
+    to one URL.
+    """
+
+    def __init__(self, similarity: float = 0.95, min_shingles: int = 20, shingle_size: int = 3):
+        """
+        Initializes the NearDuplicateDetector.
+
+        Args:
+            similarity: Fraction of equal fingerprint bits (0-1) from which two pages
+                        count as near-duplicates. 0.95 allows 3 of 64 bits to differ.
+            min_shingles: Pages with less text than this are never treated as
+                          duplicates; their fingerprints are too unstable.
+            shingle_size: Number of words per shingle.
+        """
+        self.min_shingles = min_shingles
+        self.shingle_size = shingle_size
+        self.index = SimHashIndex(max_distance=int((1 - similarity) * FINGERPRINT_BITS))
+        self.pages_checked = 0
+        self.pages_pruned = 0
+
+    def check(self, url: str, text: str) -> Optional[str]:
+        """
+        Checks a page against the pages seen so far and remembers it if it is new.
+
+        Returns:
+            The URL of the earlier page this one nearly duplicates, or None.
+        """
+        fingerprint, shingles = simhash(text, self.shingle_size)
+        self.pages_checked += 1
+        if shingles < self.min_shingles:
+            return None
+        original = self.index.find(fingerprint)
+        if original is not None:
+            self.pages_pruned += 1
+            return original
+        self.index.add(fingerprint, url)
+        return None
@@ -0,0 +1,104 @@
+import fnmatch
+import re
+from typing import Any, Dict, List
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+# Tracking and session parameters that never change the content of a page
+DEFAULT_DROP_PARAMS = [
+    'utm_*', 'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', '_ga', '_gl', '_hsenc', '_hsmi', 'ref_src',
+    'sessionid', 'session_id', 'sessid', 'phpsessid', 'jsessionid', 'aspsessionid*',
+]
+
+# Session ids embedded as path parameters, e.g. /cart;jsessionid=ABC123
+_PATH_SESSION_RE = re.compile(r';(?:jsessionid|phpsessid|sessionid|sid)=[^/?#]*', re.IGNORECASE)
+
+
+class URLCanonicalizer:
+    """
+    Reduces equivalent spellings of a URL to one canonical form for deduplication.
+
+    The canonical form lowercases the scheme and host, drops default ports,
+    fragments, embedded session ids and tracking query parameters, sorts the
+    remaining query parameters and strips the trailing slash. Which parameters
+    are dropped and whether the query is sorted can be configured per site.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Initializes the URLCanonicalizer.
+
+        Args:
+            config: The 'canonicalization' block of a site configuration:
+                - enabled: Set to false to use URLs as they are (default true).
+                - drop_params: Extra query parameter names to drop. Supports
+                  glob patterns such as 'utm_*'.
+                - keep_params: Parameter names that are never dropped, even if
+                  they match a default or configured drop pattern.
+                - use_default_drop_params: Whether DEFAULT_DROP_PARAMS apply (default true).
+                - sort_params: Sort query parameters by name (default true).
+                - strip_trailing_slash: Treat '/path/' and '/path' as the same page (default true).
+        """
+        config = config or {}
+        self.enabled = config.get('enabled', True)
+        self.sort_params = config.get('sort_params', True)
+        self.strip_trailing_slash = config.get('strip_trailing_slash', True)
+        self.keep_params = {name.lower() for name in config.get('keep_params', [])}
+
+        drop_params: List[str] = list(config.get('drop_params', []))
+        if config.get('use_default_drop_params', True):
+            drop_params.extend(DEFAULT_DROP_PARAMS)
+        self._drop_re = re.compile(
+            '|'.join(fnmatch.translate(name.lower()) for name in drop_params)
+        ) if drop_params else None
+
+    def canonicalize(self, url: str) -> str:
+        """
+        Returns the canonical form of a URL.
+
+        Args:
+            url: An absolute http(s) URL.
+
+        Returns:
+            The canonical URL, or the URL unchanged if canonicalization is
+            disabled or the URL cannot be parsed.
+        """
+        if not self.enabled:
+            return url
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return url
+
+        scheme = parts.scheme.lower()
+        netloc = (parts.hostname or '').lower()
+        if port and DEFAULT_PORTS.get(scheme) != port:
+            netloc = f"{netloc}:{port}"
+        if parts.username:
+            userinfo = parts.username + (f":{parts.password}" if parts.password else '')
+            netloc = f"{userinfo}@{netloc}"
+
+        path = _PATH_SESSION_RE.sub('', parts.path) or '/'
+        if self.strip_trailing_slash and len(path) > 1:
+            path = path.rstrip('/') or '/'
+
+        query = parts.query
+        if query:
+            params = [
+                (name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+                if not self._should_drop(name)
+            ]
+            if self.sort_params:
+                params.sort()
+            query = urlencode(params)
+
+        return urlunsplit((scheme, netloc, path, query, ''))
+
+    def _should_drop(self, name: str) -> bool:
+        name = name.lower()
+        if name in self.keep_params:
+            return False
+        return bool(self._drop_re and self._drop_re.match(name))
@@ -1,10 +1,17 @@
-import re
-from typing import List, Set, Dict, Any
+from typing import Dict, Any
 from urllib.parse import urlparse
 
+from crawler.pattern_matcher import PatternMatcher
+from crawler.url_canonicalizer import URLCanonicalizer
+from crawler.visited_store import BloomVisitedStore, create_visited_store
+
 class URLFilter:
     """
     Manages URL filtering based on include/exclude patterns and deduplication.
+
+    Deduplication works on canonical URLs, so the same page reached through
+    reordered query parameters, tracking parameters, a trailing slash, a
+    mixed-case host or a default port is only fetched once.
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -15,10 +22,31 @@ class URLFilter:
             config: A dictionary with crawler configuration, specifically:
                 - url_patterns: List of regex patterns to include.
                 - exclude_patterns: List of regex patterns to exclude.
+                - visited_backend: 'memory' (exact set, default), 'bloom' (scalable
+                  Bloom filter), 'disk' (SQLite with an in-memory LRU) or 'redis'
+                  (shared by all workers of a distributed crawl).
+                - visited_options: Keyword arguments for the visited backend, e.g.
+                  {'error_rate': 0.001} for 'bloom' or {'path': 'visited.sqlite'} for 'disk'.
+                - canonicalization: URLCanonicalizer options, e.g.
+                  {'drop_params': ['sort', 'ref'], 'sort_params': True}.
+                - domain_canonicalization: Per-domain URLCanonicalizer options,
+                  {domain: options}, e.g. the canonicalization blocks of the site
+                  configs. Other domains use 'canonicalization'.
         """
-        self.include_patterns = [re.compile(p) for p in config.get('url_patterns', [])]
-        self.exclude_patterns = [re.compile(p) for p in config.get('exclude_patterns', [])]
-        self.visited_urls: Set[str] = set()
+        # Each pattern set is compiled into one combined regex, so the cost of a
+        # check stays flat as sites add more rules
+        self.include_patterns = PatternMatcher(config.get('url_patterns', []))
+        self.exclude_patterns = PatternMatcher(config.get('exclude_patterns', []))
+        self.visited_urls = create_visited_store(config)
+        self.canonicalizer = URLCanonicalizer(config.get('canonicalization'))
+        self.domain_canonicalizers = {
+            domain.lower(): URLCanonicalizer(options)
+            for domain, options in config.get('domain_canonicalization', {}).items()
+        }
+        # Distinct non-canonical spellings rejected because their page was already
+        # visited. Each one would otherwise have cost a fetch. A Bloom filter keeps
+        # this cheap; a rare false positive makes the count slightly low.
+        self._collapsed_variants = BloomVisitedStore(initial_capacity=10_000, error_rate=0.01)
 
     def is_valid_and_new(self, url: str) -> bool:
         """
@@ -35,24 +63,50 @@ class URLFilter:
             return False
         
         # Check against exclusion patterns
-        if any(pattern.search(url) for pattern in self.exclude_patterns):
+        if self.exclude_patterns.search(url):
             return False
             
         # If include patterns are defined, the URL must match at least one
         if self.include_patterns:
-            if not any(pattern.search(url) for pattern in self.include_patterns):
+            if not self.include_patterns.search(url):
                 return False
         
         # Check for deduplication
-        if url in self.visited_urls:
+        canonical_url = self.canonicalize(url)
+        if canonical_url in self.visited_urls:
+            if canonical_url != url:
+                self._collapsed_variants.add(url)
             return False
         
         return True
 
-    def mark_as_visited(self, url: str):
-        """Marks a URL as visited."""
-        self.visited_urls.add(url)
+    def mark_as_visited(self, url: str) -> bool:
+        """
+        Marks a URL (by its canonical form) as visited.
+
+        Returns:
+            True if the URL was new. False means it was visited meanwhile, e.g.
+            by another worker sharing a Redis visited set, and must be skipped.
+        """
+        return self.visited_urls.add_if_new(self.canonicalize(url))
+
+    def canonicalize(self, url: str) -> str:
+        """Returns the canonical form of a URL under the rules of its domain."""
+        canonicalizer = self.domain_canonicalizers.get(urlparse(url).netloc.lower(), self.canonicalizer)
+        return canonicalizer.canonicalize(url)
+
+    def get_fetches_saved(self) -> int:
+        """Returns how many fetches canonicalization saved by collapsing duplicate URLs."""
+        return len(self._collapsed_variants)
 
     def get_visited_count(self) -> int:
         """Returns the number of unique URLs visited."""
         return len(self.visited_urls)
+
+    def get_visited_stats(self) -> Dict[str, Any]:
+        """Returns memory use and hit/miss counters of the visited backend."""
+        return self.visited_urls.stats()
+
+    def close(self):
+        """Closes the visited backend, persisting any writes it still buffers."""
+        self.visited_urls.close()
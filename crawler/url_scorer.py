@@ -0,0 +1,108 @@
+import re
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from crawler.pattern_matcher import PatternMatcher
+
+_DIGITS_RE = re.compile(r'\d')
+
+
+def path_template(url: str) -> str:
+    """
+    Reduces a URL to the template shared by pages of the same kind.
+
+    Path segments that look like identifiers or slugs (containing digits or
+    at least two hyphens) become '{id}', keeping their file extension, and
+    query values are dropped. '/phones/galaxy-a14-128gb-123.html?page=2'
+    and '/phones/nokia-105-4521.html?page=7' both become
+    '/phones/{id}.html?page'.
+    """
+    parts = urlsplit(url)
+    segments = []
+    for segment in parts.path.split('/'):
+        stem, dot, extension = segment.partition('.')
+        if _DIGITS_RE.search(stem) or stem.count('-') >= 2:
+            segment = '{id}' + dot + extension
+        segments.append(segment)
+    template = '/'.join(segments) or '/'
+    if parts.query:
+        template += '?' + '&'.join(sorted({name for name, _ in parse_qsl(parts.query, keep_blank_values=True)}))
+    return template
+
+
+class URLScorer:
+    """
+    Scores URLs for the 'priority' crawl strategy; higher scores are crawled first.
+
+    score = sum of the weights of matching pattern rules
+            + include_weight if the URL matches one of the crawler's url_patterns
+            + yield_weight * learned items per page of the URL's path template
+            - depth_penalty * depth
+
+    The learned yield starts at prior_yield and moves towards the observed
+    average as record_yield() reports how many items were scraped from pages
+    of each template, so detail pages rise above navigation and boilerplate
+    pages once a few of each have been seen.
+    """
+
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Initializes the URLScorer.
+
+        Args:
+            config: A dictionary with crawler configuration, specifically:
+                - url_patterns: The include patterns; a match adds include_weight.
+                - priority: Scoring options:
+                    - include_weight: Bonus for matching url_patterns (default 1.0).
+                    - pattern_weights: {regex: weight} bonuses (or penalties, if
+                      negative) for matching URLs.
+                    - depth_penalty: Score subtracted per level of depth (default 0.5).
+                    - yield_weight: Multiplier for the learned items per page (default 1.0).
+                    - prior_yield: Items per page assumed for unseen templates (default 0.0).
+                    - prior_pages: Weight of the prior in pages (default 1).
+        """
+        options = config.get('priority', {})
+        self.include_weight = options.get('include_weight', 1.0)
+        self.depth_penalty = options.get('depth_penalty', 0.5)
+        self.yield_weight = options.get('yield_weight', 1.0)
+        self.prior_yield = options.get('prior_yield', 0.0)
+        self.prior_pages = options.get('prior_pages', 1)
+
+        self._include = PatternMatcher(config.get('url_patterns', []))
+        self._pattern_weights: List[Tuple[Pattern, float]] = [
+            (re.compile(pattern), weight) for pattern, weight in options.get('pattern_weights', {}).items()
+        ]
+        # template -> [items found, pages scraped]
+        self._yields: Dict[str, List[int]] = {}
+
+    def score(self, url: str, depth: int) -> float:
+        """Returns the priority of a URL discovered at the given depth."""
+        score = -self.depth_penalty * depth
+        if self._include and self._include.search(url):
+            score += self.include_weight
+        for pattern, weight in self._pattern_weights:
+            if pattern.search(url):
+                score += weight
+        return score + self.yield_weight * self.expected_yield(url)
+
+    def expected_yield(self, url: str) -> float:
+        """Returns the learned number of items per page for the URL's path template."""
+        items, pages = self._yields.get(path_template(url), (0, 0))
+        weight = pages + self.prior_pages
+        if not weight:
+            return self.prior_yield
+        return (items + self.prior_yield * self.prior_pages) / weight
+
+    def record_yield(self, url: str, items: int):
+        """Records how many items were scraped from a fetched page."""
+        stats = self._yields.setdefault(path_template(url), [0, 0])
+        stats[0] += items
+        stats[1] += 1
+
+    def get_template_yields(self, limit: Optional[int] = None) -> Dict[str, float]:
+        """Returns the observed items per page by path template, highest first."""
+        yields = sorted(
+            ((template, items / pages) for template, (items, pages) in self._yields.items() if pages),
+            key=lambda entry: entry[1], reverse=True,
+        )
+        return dict(yields[:limit])
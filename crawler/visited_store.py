@@ -0,0 +1,367 @@
+import abc
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+# Approximate size of one LRU entry: a 16-byte bytes key plus OrderedDict bookkeeping
+_LRU_ENTRY_BYTES = 120
+
+
+class VisitedStore(abc.ABC):
+    """
+    Base class for the visited-URL sets used by URLFilter for deduplication.
+
+    Subclasses implement membership and insertion; this base class keeps the
+    hit/miss counters every backend reports through stats().
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def add(self, url: str):
+        """Records a URL as visited."""
+        pass
+
+    def add_if_new(self, url: str) -> bool:
+        """
+        Records a URL as visited and reports whether it was new.
+
+        Shared backends override this with an atomic test-and-set, so two
+        crawler workers can never both claim the same URL.
+        """
+        if self._contains(url):
+            return False
+        self.add(url)
+        return True
+
+    @abc.abstractmethod
+    def _contains(self, url: str) -> bool:
+        """Returns whether a URL was recorded, without counting the lookup."""
+        pass
+
+    @abc.abstractmethod
+    def memory_bytes(self) -> int:
+        """Returns an estimate of the memory held by the store in bytes."""
+        pass
+
+    @abc.abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    def __contains__(self, url: str) -> bool:
+        found = self._contains(url)
+        if found:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return found
+
+    def close(self):
+        """Releases the store's resources. Backends that buffer writes persist them here."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns size, memory use and lookup counters for monitoring."""
+        return {
+            "backend": self.__class__.__name__,
+            "size": len(self),
+            "memory_bytes": self.memory_bytes(),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class MemoryVisitedStore(VisitedStore):
+    """Exact visited set holding every URL in a Python set."""
+
+    def __init__(self):
+        super().__init__()
+        self._urls: Set[str] = set()
+
+    def add(self, url: str):
+        self._urls.add(url)
+
+    def _contains(self, url: str) -> bool:
+        return url in self._urls
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self._urls) + sum(sys.getsizeof(url) for url in self._urls)
+
+    def __len__(self) -> int:
+        return len(self._urls)
+
+
+class _BloomFilter:
+    """A fixed-capacity Bloom filter using double hashing over one blake2b digest."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.num_bits = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.num_hashes = max(1, int(round(self.num_bits / capacity * math.log(2))))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: bytes) -> List[int]:
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:16], 'little') | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, digest: bytes):
+        for position in self._positions(digest):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(digest))
+
+
+class BloomVisitedStore(VisitedStore):
+    """
+    Scalable Bloom filter visited set.
+
+    Memory stays at a few bytes per URL regardless of URL length. A new,
+    larger filter with a tighter error rate is added whenever the current one
+    is full, so the overall false-positive rate stays below the configured
+    value as the crawl grows. A false positive means a new URL is treated as
+    already visited and skipped; URLs are never crawled twice.
+    """
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001,
+                 growth_factor: int = 2, tightening_ratio: float = 0.5):
+        """
+        Initializes the BloomVisitedStore.
+
+        Args:
+            initial_capacity: Number of URLs the first filter holds at its target error rate.
+            error_rate: Upper bound on the overall false-positive rate.
+            growth_factor: Capacity multiplier for each additional filter.
+            tightening_ratio: Error-rate multiplier for each additional filter.
+        """
+        super().__init__()
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth_factor = growth_factor
+        self.tightening_ratio = tightening_ratio
+        # The first filter gets error_rate * (1 - r) so the geometric series sums to error_rate
+        self._filters: List[_BloomFilter] = [
+            _BloomFilter(initial_capacity, error_rate * (1 - tightening_ratio))
+        ]
+        self._size = 0
+
+    def add(self, url: str):
+        digest = self._digest(url)
+        if any(digest in bloom for bloom in self._filters):
+            return
+        current = self._filters[-1]
+        if current.count >= current.capacity:
+            current = _BloomFilter(
+                current.capacity * self.growth_factor,
+                self.error_rate * (1 - self.tightening_ratio) * self.tightening_ratio ** len(self._filters),
+            )
+            self._filters.append(current)
+        current.add(digest)
+        self._size += 1
+
+    def _contains(self, url: str) -> bool:
+        digest = self._digest(url)
+        return any(digest in bloom for bloom in self._filters)
+
+    def memory_bytes(self) -> int:
+        return sum(len(bloom.bits) for bloom in self._filters)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _digest(url: str) -> bytes:
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+class DiskVisitedStore(VisitedStore):
+    """
+    Exact visited set stored in SQLite with an in-memory LRU cache in front.
+
+    URLs are stored as 16-byte hashes, so the on-disk footprint does not
+    depend on URL length. Recently checked URLs are answered from the LRU
+    without touching the database.
+    """
+
+    def __init__(self, path: str = 'visited_urls.sqlite', cache_size: int = 100_000, commit_interval: int = 1000):
+        """
+        Initializes the DiskVisitedStore.
+
+        Args:
+            path: Path of the SQLite database file. Existing entries are kept, so a
+                  restarted crawl still knows which URLs it has visited.
+            cache_size: Maximum number of URL hashes held in the in-memory LRU.
+            commit_interval: Number of inserts between SQLite commits.
+        """
+        super().__init__()
+        self.path = path
+        self.cache_size = cache_size
+        self.commit_interval = commit_interval
+        self.cache_hits = 0
+        self._uncommitted = 0
+        self._cache: "OrderedDict[bytes, bool]" = OrderedDict()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS visited (url_hash BLOB PRIMARY KEY) WITHOUT ROWID")
+        self._size = self._conn.execute("SELECT COUNT(*) FROM visited").fetchone()[0]
+
+    def add(self, url: str):
+        digest = self._digest(url)
+        cursor = self._conn.execute("INSERT OR IGNORE INTO visited (url_hash) VALUES (?)", (digest,))
+        self._size += cursor.rowcount
+        self._uncommitted += 1
+        if self._uncommitted >= self.commit_interval:
+            self._conn.commit()
+            self._uncommitted = 0
+        self._remember(digest, True)
+
+    def _contains(self, url: str) -> bool:
+        digest = self._digest(url)
+        if digest in self._cache:
+            self._cache.move_to_end(digest)
+            self.cache_hits += 1
+            return self._cache[digest]
+        found = self._conn.execute("SELECT 1 FROM visited WHERE url_hash = ?", (digest,)).fetchone() is not None
+        self._remember(digest, found)
+        return found
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self._cache) + len(self._cache) * _LRU_ENTRY_BYTES
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["cache_hits"] = self.cache_hits
+        return stats
+
+    def close(self):
+        """Commits pending inserts and closes the SQLite connection."""
+        self._conn.commit()
+        self._conn.close()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _remember(self, digest: bytes, found: bool):
+        self._cache[digest] = found
+        self._cache.move_to_end(digest)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _digest(url: str) -> bytes:
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+class RedisVisitedStore(VisitedStore):
+    """
+    Visited set shared by crawler workers through Redis.
+
+    In 'set' mode URLs are stored as 16-byte hashes in a Redis set (exact).
+    In 'bloom' mode they are stored in a fixed-size Bloom filter on a Redis
+    bitmap, which needs no Redis module and uses a few bytes per URL.
+    add_if_new() is atomic in both modes (SADD, or SETBIT in a MULTI block),
+    so each URL is claimed by exactly one worker.
+    """
+
+    def __init__(self, url: Optional[str] = None, key: str = 'crawler:visited', mode: str = 'set',
+                 capacity: int = 10_000_000, error_rate: float = 0.001, client: Any = None):
+        """
+        Initializes the RedisVisitedStore.
+
+        Args:
+            url: Redis URL. Defaults to the REDIS_URL environment variable.
+            key: Redis key of the set or bitmap. Workers sharing a crawl use the same key.
+            mode: 'set' (exact) or 'bloom'.
+            capacity: Number of URLs the Bloom filter holds at its target error rate.
+            error_rate: False-positive rate of the Bloom filter.
+            client: An existing redis.Redis client, e.g. a fakeredis instance in tests.
+        """
+        super().__init__()
+        if mode not in ('set', 'bloom'):
+            raise ValueError(f"Unsupported Redis visited mode: {mode}")
+        if client is None:
+            import redis  # Only needed when this backend is selected
+            client = redis.Redis.from_url(url or os.getenv('REDIS_URL', 'redis://localhost:6379/0'))
+        self._redis = client
+        self.key = key
+        self.mode = mode
+        # Sized once; Redis strings are limited to 2**32 bits
+        self._bloom = _BloomFilter(capacity, error_rate) if mode == 'bloom' else None
+        if self._bloom and self._bloom.num_bits > 2 ** 32:
+            raise ValueError("Bloom filter too large for a Redis bitmap; lower capacity or raise error_rate.")
+        self._count_key = f"{key}:count"
+
+    def add(self, url: str):
+        self.add_if_new(url)
+
+    def add_if_new(self, url: str) -> bool:
+        digest = self._digest(url)
+        if self._bloom is None:
+            return bool(self._redis.sadd(self.key, digest))
+        pipe = self._redis.pipeline(transaction=True)
+        for position in self._bloom._positions(digest):
+            pipe.setbit(self.key, position, 1)
+        # SETBIT returns the previous bit; all set means the URL was (probably) seen
+        is_new = not all(pipe.execute())
+        if is_new:
+            self._redis.incr(self._count_key)
+        return is_new
+
+    def _contains(self, url: str) -> bool:
+        digest = self._digest(url)
+        if self._bloom is None:
+            return bool(self._redis.sismember(self.key, digest))
+        pipe = self._redis.pipeline(transaction=False)
+        for position in self._bloom._positions(digest):
+            pipe.getbit(self.key, position)
+        return all(pipe.execute())
+
+    def memory_bytes(self) -> int:
+        """Returns the memory Redis reports for the key; this process holds none of it."""
+        try:
+            return self._redis.memory_usage(self.key) or 0
+        except Exception:
+            return 0
+
+    def __len__(self) -> int:
+        if self._bloom is None:
+            return self._redis.scard(self.key)
+        return int(self._redis.get(self._count_key) or 0)
+
+    @staticmethod
+    def _digest(url: str) -> bytes:
+        return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+def create_visited_store(config: Dict[str, Any]) -> VisitedStore:
+    """
+    Creates the visited-set backend selected by the crawler configuration.
+
+    Args:
+        config: A dictionary with crawler configuration, specifically:
+            - visited_backend: 'memory' (default), 'bloom', 'disk' or 'redis'.
+            - visited_options: Keyword arguments for the selected backend.
+
+    Returns:
+        A VisitedStore instance.
+    """
+    backends = {
+        'memory': MemoryVisitedStore,
+        'bloom': BloomVisitedStore,
+        'disk': DiskVisitedStore,
+        'redis': RedisVisitedStore,
+    }
+    backend = config.get('visited_backend', 'memory')
+    store_class = backends.get(backend)
+    if not store_class:
+        raise ValueError(f"Unsupported visited_backend: {backend}")
+    return store_class(**config.get('visited_options', {}))
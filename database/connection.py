@@ -1,13 +1,16 @@
+import logging
 import os
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 import uuid
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, DECIMAL, ForeignKey
+from sqlalchemy import create_engine, inspect, text, Column, Integer, String, Text, DateTime, Boolean, DECIMAL, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import sessionmaker, declarative_base, relationship
 from sqlalchemy.sql import func
 
+logger = logging.getLogger(__name__)
+
 # Database connection URL from environment variable
 DATABASE_URL = os.getenv("DATABASE_URL")
 if not DATABASE_URL:
@@ -46,9 +49,10 @@ class CrawlState(Base):
 
     url = Column(Text, primary_key=True)
     site_id = Column(UUID(as_uuid=True), ForeignKey("sites.site_id", ondelete="SET NULL"))
-    status = Column(String(20), nullable=False) # pending, completed, failed, in_progress
+    status = Column(String(20), nullable=False) # pending, in_progress, completed, failed, skipped
     last_crawled = Column(DateTime(timezone=True))
     retry_count = Column(Integer, default=0)
+    depth = Column(Integer, default=0)
     discovered_at = Column(DateTime(timezone=True), server_default=func.now())
 
     site = relationship("Site", back_populates="crawl_states")
@@ -116,9 +120,37 @@ from sqlalchemy.orm import Session # New import
 
 # ... (existing imports and models) ...
 
+# Columns added to existing tables after their first release, {table: {column: DDL type}}.
+# create_all() only creates missing tables, so older databases get these through upgrade_tables().
+ADDED_COLUMNS = {
+    "crawl_state": {"depth": "INTEGER DEFAULT 0"},
+}
+
+def upgrade_tables(bind=None):
+    """
+    Adds the columns of ADDED_COLUMNS that existing tables are missing.
+
+    Args:
+        bind: The engine or connection to upgrade (default: the module's engine).
+    """
+    bind = bind if bind is not None else engine
+    inspector = inspect(bind)
+    for table, columns in ADDED_COLUMNS.items():
+        if not inspector.has_table(table):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        missing = [(name, ddl) for name, ddl in columns.items() if name not in existing]
+        if not missing:
+            continue
+        with bind.begin() as conn:
+            for name, ddl in missing:
+                logger.info(f"Adding column {table}.{name}")
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
 # Function to create all tables (for initial setup or migrations)
 def create_all_tables():
     Base.metadata.create_all(engine)
+    upgrade_tables()
 
 def batch_insert_scraped_data(db: Session, data: List[Dict[str, Any]]):
     """
@@ -28,6 +28,7 @@ CREATE TABLE crawl_state (
     status VARCHAR(20) NOT NULL CHECK (status IN ('pending', 'completed', 'failed', 'in_progress')),
     last_crawled TIMESTAMP WITH TIME ZONE,
     retry_count INT DEFAULT 0,
+    depth INT DEFAULT 0, -- Link depth from the seed URLs, restored when a crawl resumes
     discovered_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
@@ -0,0 +1,127 @@
+import codecs
+import logging
+import re
+from typing import Mapping, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from charset_normalizer import from_bytes as _detect
+except ImportError:  # requests can be installed with chardet instead
+    _detect = None
+
+META_SNIFF_BYTES = 4096
+DETECT_SAMPLE_BYTES = 16 * 1024
+FALLBACK_ENCODING = 'cp1252'
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),  # Checked before UTF-16 LE, whose BOM is its prefix
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+# <meta charset="..."> and <meta http-equiv="Content-Type" content="text/html; charset=...">
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE)
+
+# Browsers decode these labels as windows-1252, and so do pages that declare them
+_LATIN1_ALIASES = {'latin-1', 'iso8859-1', 'ascii'}
+
+# Python codec names libxml2 spells differently
+_LXML_NAMES = {'utf-8-sig': 'utf-8', 'mac-roman': 'macintosh'}
+
+
+def _normalize(label: Optional[str]) -> Optional[str]:
+    """Returns the Python codec name for a charset label, or None if Python does not know it."""
+    if not label:
+        return None
+    try:
+        name = codecs.lookup(label.strip()).name
+    except LookupError:
+        return None
+    return FALLBACK_ENCODING if name in _LATIN1_ALIASES else name
+
+
+def charset_from_headers(headers: Mapping[str, str]) -> Optional[str]:
+    """Returns the charset declared in the Content-Type header, if any."""
+    match = _HEADER_CHARSET_RE.search(headers.get('Content-Type') or '')
+    return _normalize(match.group(1)) if match else None
+
+
+def charset_from_bom(data: bytes) -> Optional[str]:
+    """Returns the encoding given by a byte order mark at the start of the body, if any."""
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    return None
+
+
+def charset_from_meta(data: bytes) -> Optional[str]:
+    """Returns the charset declared by a <meta> tag in the first few KB of an HTML body, if any."""
+    match = _META_CHARSET_RE.search(data[:META_SNIFF_BYTES])
+    if not match:
+        return None
+    encoding = _normalize(match.group(1).decode('ascii', 'ignore'))
+    # A body that could be read to find the tag is not UTF-16, whatever it says
+    return 'utf-8' if encoding and encoding.startswith('utf-16') else encoding
+
+
+def detect_encoding(data: bytes) -> str:
+    """
+    Guesses the encoding of a body that declares none, looking at a bounded sample only.
+
+    UTF-8 is tried first, as it is by far the most common and decoding a
+    sample is cheap; the statistical detector only sees what is left.
+    """
+    sample = data[:DETECT_SAMPLE_BYTES]
+    try:
+        # An incremental decoder tolerates a character cut in two at the end of the sample
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=len(sample) == len(data))
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    if _detect is not None:
+        best = _detect(sample).best()
+        encoding = _normalize(best.encoding) if best else None
+        if encoding:
+            return encoding
+    return FALLBACK_ENCODING
+
+
+def resolve_encoding(data: bytes, headers: Mapping[str, str]) -> Tuple[str, str]:
+    """
+    Determines the encoding of an HTML body: BOM, then HTTP header, then <meta>, then detection.
+
+    Returns:
+        A tuple of (encoding, where it came from: 'bom', 'header', 'meta' or 'detected').
+    """
+    # A BOM outranks the header, as in browsers; it cannot be there by accident
+    encoding = charset_from_bom(data)
+    if encoding:
+        return encoding, 'bom'
+    encoding = charset_from_headers(headers)
+    if encoding:
+        return encoding, 'header'
+    encoding = charset_from_meta(data)
+    if encoding:
+        return encoding, 'meta'
+    encoding = detect_encoding(data)
+    logger.debug(f"No charset declared; detected {encoding}.")
+    return encoding, 'detected'
+
+
+def lxml_encoding(encoding: str) -> str:
+    """
+    Returns the name libxml2 knows a Python codec by, for parsing raw bytes with lxml.
+
+    libxml2 may still not support the encoding; lxml then raises LookupError
+    when the parser is created, and the body has to be decoded in Python.
+    """
+    return _LXML_NAMES.get(encoding, encoding.replace('_', '-'))
+
+
+def decode_body(data: bytes, headers: Mapping[str, str]) -> str:
+    """Decodes an HTML body with the encoding resolve_encoding() finds; undecodable bytes are replaced."""
+    encoding, _ = resolve_encoding(data, headers)
+    return data.decode(encoding, errors='replace')
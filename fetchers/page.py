@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import Mapping, Optional
+
+
+@dataclass
+class FetchedPage:
+    """
+    A page downloaded by one component and handed to another, so it is not fetched twice.
+
+    The crawler yields one FetchedPage per crawled URL, with the raw body in
+    content and its encoding, so consumers that parse bytes (lxml) need no
+    decoded copy; get_text() decodes it for the others. When its fetch
+    failed the body is None and status_code holds the error status, or None
+    if no response arrived; consumers should not fetch such a URL again
+    (see failed). duplicate_of is set when the crawler found the page to be a
+    near-duplicate of an earlier one, which consumers need not parse again.
+    skip_reason is set when the body was not downloaded because it is not
+    HTML or too large; consumers should not fetch such a URL either.
+    """
+    url: str
+    status_code: Optional[int] = None
+    headers: Mapping[str, str] = field(default_factory=dict)
+    text: Optional[str] = None
+    depth: int = 0
+    duplicate_of: Optional[str] = None
+    skip_reason: Optional[str] = None
+    content: Optional[bytes] = None
+    encoding: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the page was downloaded with a 200 response and its body is available."""
+        return self.status_code == 200 and (self.text is not None or self.content is not None)
+
+    @property
+    def failed(self) -> bool:
+        """Whether the fetch failed, with an error status or without any response."""
+        return self.skip_reason is None and (self.status_code is None or self.status_code >= 400)
+
+    def get_text(self) -> Optional[str]:
+        """Returns the body as text, decoding content on first use."""
+        if self.text is None and self.content is not None:
+            self.text = self.content.decode(self.encoding or 'utf-8', errors='replace')
+        return self.text
@@ -0,0 +1,126 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+class RevisitStore:
+    """
+    Stores HTTP cache validators (ETag, Last-Modified) per URL for conditional revisits.
+
+    On a revisit the caller sends If-None-Match / If-Modified-Since built from
+    the stored validators. A 304 Not Modified answer then costs one small
+    round-trip instead of a full download, parse and upsert. Callers may
+    store a small JSON payload with the validators (the crawler keeps the
+    page's outgoing links) so a 304 can still be acted upon.
+
+    Records are kept per namespace, because the crawler and the scrapers
+    derive different data from the same page and must not consume each
+    other's validators. The store is SQLite, so it survives between the
+    scheduled runs; ':memory:' keeps it for the life of the process only.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Initializes the RevisitStore.
+
+        Args:
+            path: Path of the SQLite database file, or ':memory:'.
+        """
+        self.path = path
+        self.not_modified = 0
+        self.modified = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS validators ("
+            " namespace TEXT NOT NULL, url TEXT NOT NULL, etag TEXT, last_modified TEXT,"
+            " payload TEXT, updated_at REAL, PRIMARY KEY (namespace, url))"
+        )
+        self._conn.commit()
+
+    def conditional_headers(self, namespace: str, url: str) -> Dict[str, str]:
+        """
+        Returns the conditional request headers for a URL.
+
+        Returns:
+            A dictionary with If-None-Match and/or If-Modified-Since, or an
+            empty dictionary if no validators are stored for the URL.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified FROM validators WHERE namespace = ? AND url = ?",
+                (namespace, url),
+            ).fetchone()
+        headers = {}
+        if row:
+            etag, last_modified = row
+            if etag:
+                headers['If-None-Match'] = etag
+            if last_modified:
+                headers['If-Modified-Since'] = last_modified
+        return headers
+
+    def save(self, namespace: str, url: str, response_headers: Mapping[str, str], payload: Any = None):
+        """
+        Stores the validators of a full (200) response, if it carried any.
+
+        Args:
+            namespace: The consumer the record belongs to, e.g. 'crawler'.
+            url: The requested URL.
+            response_headers: The response headers (case-insensitive mapping).
+            payload: Optional JSON-serialisable data to return on a later 304.
+        """
+        self.modified += 1
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        if not (etag or last_modified):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO validators (namespace, url, etag, last_modified, payload, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (namespace, url, etag, last_modified, json.dumps(payload) if payload is not None else None, time.time()),
+            )
+            self._conn.commit()
+
+    def record_not_modified(self):
+        """Counts a 304 Not Modified answer."""
+        self.not_modified += 1
+
+    def load_payload(self, namespace: str, url: str) -> Optional[Any]:
+        """
+        Returns the payload stored with the validators of a URL, if any.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM validators WHERE namespace = ? AND url = ?",
+                (namespace, url),
+            ).fetchone()
+        if row and row[0] is not None:
+            return json.loads(row[0])
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of full and 304 responses seen."""
+        return {"modified": self.modified, "not_modified": self.not_modified}
+
+
+_stores: Dict[str, RevisitStore] = {}
+_stores_lock = threading.Lock()
+
+def get_revisit_store(path: str) -> RevisitStore:
+    """
+    Returns the process-wide RevisitStore for a path, creating it on first use.
+
+    Scrapers are instantiated per URL, so sharing the store per path avoids
+    reopening the database for every page.
+    """
+    with _stores_lock:
+        if path not in _stores:
+            logger.info(f"Opening revisit store at {path}")
+            _stores[path] = RevisitStore(path)
+        return _stores[path]
@@ -0,0 +1,212 @@
+import logging
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, Mapping, Optional, Tuple
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Content types servers send when they do not know better; the body is sniffed instead
+_GENERIC_CONTENT_TYPES = {'', 'application/octet-stream', 'binary/octet-stream', 'text/plain'}
+
+# Leading bytes of common formats that are not HTML
+_BINARY_SIGNATURES = (
+    (b'%PDF-', 'application/pdf'),
+    (b'\x89PNG', 'image/png'),
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'GIF8', 'image/gif'),
+    (b'PK\x03\x04', 'application/zip'),
+    (b'\x1f\x8b', 'application/gzip'),
+    (b'RIFF', 'application/octet-stream'),
+    (b'ID3', 'audio/mpeg'),
+    (b'\x1aE\xdf\xa3', 'video/webm'),
+)
+_SNIFF_BYTES = 512
+
+
+class ContentSkipped(Exception):
+    """Raised when a response is not downloaded because of its content type or size."""
+
+    def __init__(self, url: str, reason: str, status_code: Optional[int] = None):
+        super().__init__(f"{url}: {reason}")
+        self.url = url
+        self.reason = reason
+        self.status_code = status_code
+
+
+def media_type(headers: Mapping[str, str]) -> str:
+    """Returns the lower-cased media type of a Content-Type header, without parameters."""
+    return (headers.get('Content-Type') or '').split(';', 1)[0].strip().lower()
+
+
+def sniff_content_type(prefix: bytes) -> Optional[str]:
+    """
+    Guesses the type of a body from its first bytes.
+
+    Returns:
+        'text/html' if the body looks like markup, the media type of a known
+        binary format, or None if it cannot tell.
+    """
+    head = prefix.lstrip(b'\xef\xbb\xbf \t\r\n')
+    for signature, detected in _BINARY_SIGNATURES:
+        if head.startswith(signature):
+            return detected
+    if head[:1] == b'<':
+        return 'text/html'
+    if b'\x00' in head[:_SNIFF_BYTES]:
+        return 'application/octet-stream'
+    return None
+
+
+def check_headers(headers: Mapping[str, str], allowed_types: Iterable[str], max_bytes: Optional[int]) -> Optional[str]:
+    """
+    Decides from the response headers alone whether a body is worth downloading.
+
+    Returns:
+        The reason to skip the body, or None if it may be downloaded. A missing
+        or generic Content-Type is not a reason; the body is sniffed instead.
+    """
+    content_type = media_type(headers)
+    if content_type not in _GENERIC_CONTENT_TYPES and content_type not in allowed_types:
+        return f"content type {content_type}"
+    length = headers.get('Content-Length')
+    if max_bytes and length and length.isdigit() and int(length) > max_bytes:
+        return f"too large (Content-Length {length} > {max_bytes})"
+    return None
+
+
+def check_prefix(headers: Mapping[str, str], prefix: bytes, allowed_types: Iterable[str]) -> Optional[str]:
+    """
+    Checks the first bytes of a body whose Content-Type was missing or generic.
+
+    Returns:
+        The reason to skip the body, or None if it may be HTML.
+    """
+    if media_type(headers) not in _GENERIC_CONTENT_TYPES:
+        return None
+    detected = sniff_content_type(prefix)
+    if detected and detected not in allowed_types:
+        return f"sniffed content type {detected}"
+    return None
+
+
+class StreamingFetcher:
+    """
+    Downloads pages as streams, giving up on bodies that are not HTML or too large.
+
+    The Content-Type and Content-Length headers are checked before any of
+    the body is read, a body without a useful Content-Type is sniffed from
+    its first bytes, and the download is aborted as soon as it exceeds the
+    size cap (also when the server sent no Content-Length). PDFs, videos
+    and huge pages therefore cost a response header instead of a full
+    download. Skipped URLs are kept with their reason.
+    """
+
+    def __init__(self, session: requests.Session, max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 content_types: Iterable[str] = DEFAULT_CONTENT_TYPES, head_probe: bool = False,
+                 domain_max_bytes: Optional[Dict[str, int]] = None, chunk_size: int = 64 * 1024,
+                 keep_skipped: int = 1000):
+        """
+        Initializes the StreamingFetcher.
+
+        Args:
+            session: The requests session to send requests with.
+            max_bytes: Largest body in bytes to download; None or 0 for no cap.
+            content_types: Media types to download.
+            head_probe: Send a HEAD request first and skip the GET if its headers
+                        already rule the URL out. Costs a round-trip per page, so
+                        only worth it where many links point at large files.
+            domain_max_bytes: Per-domain caps overriding max_bytes, e.g. from site configs.
+            chunk_size: Bytes read from the socket at a time.
+            keep_skipped: Number of most recent skipped URLs kept for inspection.
+        """
+        self.session = session
+        self.max_bytes = max_bytes
+        self.content_types = frozenset(t.lower() for t in content_types)
+        self.head_probe = head_probe
+        self.domain_max_bytes = dict(domain_max_bytes or {})
+        self.chunk_size = chunk_size
+        self.skip_reasons: Counter = Counter()
+        self.skipped: Deque[Tuple[str, str]] = deque(maxlen=keep_skipped)
+        self.bytes_downloaded = 0
+
+    def get(self, url: str, domain: Optional[str] = None, **kwargs: Any) -> requests.Response:
+        """
+        Sends a GET request and downloads the body within the limits.
+
+        Args:
+            url: The URL to fetch.
+            domain: The URL's domain, for per-domain size caps.
+            **kwargs: Passed on to session.get(), e.g. timeout and headers.
+
+        Returns:
+            The response, with its body loaded, so .text and .content work as usual.
+            Error and 304 responses are returned without checks, their body cut
+            off at the size cap.
+
+        Raises:
+            ContentSkipped: If the body was not (fully) downloaded.
+            requests.RequestException: If the request failed.
+        """
+        max_bytes = self.domain_max_bytes.get(domain, self.max_bytes) if domain else self.max_bytes
+        if self.head_probe:
+            probe = self.session.head(url, allow_redirects=True, timeout=kwargs.get('timeout'))
+            if probe.status_code == 200:
+                self._check(url, probe.status_code, check_headers(probe.headers, self.content_types, max_bytes))
+
+        response = self.session.get(url, stream=True, **kwargs)
+        try:
+            if response.status_code != 200:
+                # Callers only look at the status of error and 304 responses, so a large
+                # error page or soft 404 is cut off at the cap instead of skipped
+                chunks = []
+                received = 0
+                for chunk in response.iter_content(self.chunk_size):
+                    chunks.append(chunk)
+                    received += len(chunk)
+                    if max_bytes and received >= max_bytes:
+                        break
+                self.bytes_downloaded += received
+                response._content = b''.join(chunks)[:max_bytes or None]
+                return response
+            self._check(url, 200, check_headers(response.headers, self.content_types, max_bytes), response)
+
+            chunks = []
+            received = 0
+            for chunk in response.iter_content(self.chunk_size):
+                if not chunks:
+                    self._check(url, 200, check_prefix(response.headers, chunk, self.content_types), response)
+                chunks.append(chunk)
+                received += len(chunk)
+                if max_bytes and received > max_bytes:
+                    self._check(url, 200, f"too large (body > {max_bytes})", response)
+            self.bytes_downloaded += received
+        finally:
+            response.close()
+
+        # Hand the body to requests as if it had been read without streaming
+        response._content = b''.join(chunks)
+        return response
+
+    def record_skip(self, url: str, reason: str):
+        """Records a URL whose body was not downloaded, with the reason."""
+        # Counted without the sizes in parentheses, which make each reason unique
+        self.skip_reasons[reason.split(' (', 1)[0]] += 1
+        self.skipped.append((url, reason))
+        logger.info(f"Skipping {url}: {reason}.")
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of skipped URLs per reason and the bytes downloaded."""
+        return {"skipped": dict(self.skip_reasons), "bytes_downloaded": self.bytes_downloaded}
+
+    def _check(self, url: str, status_code: int, reason: Optional[str], response: Optional[requests.Response] = None):
+        """Records and raises a skip if there is a reason for one."""
+        if reason is None:
+            return
+        if response is not None:
+            response.close()
+        self.record_skip(url, reason)
+        raise ContentSkipped(url, reason, status_code)
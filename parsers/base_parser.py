@@ -5,6 +5,10 @@ from typing import Any, Dict, List
 class BaseParser(abc.ABC):
     """Abstract base class for all content parsers."""
 
+    # Parsers that set this receive HTML as raw bytes plus an 'encoding' keyword
+    # argument, instead of text decoded for them by the ParserManager
+    accepts_bytes = False
+
     @abc.abstractmethod
     def parse(self, content: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,239 @@
+import json
+import logging
+import re
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+try:
+    import ijson
+except ImportError:  # Optional; documents are then loaded whole
+    ijson = None
+
+from parsers.base_parser import BaseParser
+
+logger = logging.getLogger(__name__)
+
+_SCALAR_EVENTS = frozenset({'null', 'boolean', 'integer', 'double', 'number', 'string'})
+
+# One step of a path: .name, .*, [n], [*], ['name'] or ["name"]
+_STEP_RE = re.compile(r"""\.(?P<name>[^.\[\]]+)|\[(?P<index>-?\d+)\]|\[\*\]|\['(?P<squoted>[^']*)'\]|\["(?P<dquoted>[^"]*)"\]""")
+
+_WILDCARD = object()
+
+
+class JSONPath:
+    """
+    A compiled JSONPath-style expression, e.g. "$.products[*].name" or "$.weather[0]['main']".
+
+    Supports child names, array indexes (negative ones too) and the *
+    wildcard. Paths are compiled once per expression and cached, so applying
+    a field map to each item only walks the document.
+    """
+
+    __slots__ = ('expression', 'steps', 'wildcard', 'ijson_prefix')
+
+    def __init__(self, expression: str):
+        """
+        Compiles a path.
+
+        Raises:
+            ValueError: If the expression is not a supported path.
+        """
+        self.expression = expression
+        steps: List[Union[str, int, object]] = []
+        rest = expression.strip()
+        if rest.startswith('$'):
+            rest = rest[1:]
+        elif rest and rest[0] not in '.[':
+            rest = '.' + rest
+        position = 0
+        object_wildcard = False
+        while position < len(rest):
+            match = _STEP_RE.match(rest, position)
+            if not match:
+                raise ValueError(f"Unsupported JSON path '{expression}' at '{rest[position:]}'")
+            if match.group('index') is not None:
+                steps.append(int(match.group('index')))
+            elif match.group(0) in ('.*', '[*]'):
+                steps.append(_WILDCARD)
+                object_wildcard = object_wildcard or match.group(0) == '.*'
+            else:
+                steps.append(next(group for group in (match.group('name'), match.group('squoted'), match.group('dquoted'))
+                                  if group is not None))
+            position = match.end()
+        self.steps: Tuple[Union[str, int, object], ...] = tuple(steps)
+        self.wildcard = _WILDCARD in self.steps
+        # The same path as an ijson event prefix, where it has one: ijson
+        # names array elements 'item' but object members by their key, so a
+        # '.*' over an object has no single prefix, and it cannot pick an
+        # element by index
+        self.ijson_prefix: Optional[str] = None
+        if not object_wildcard and not any(isinstance(step, int) or (isinstance(step, str) and '.' in step) for step in self.steps):
+            self.ijson_prefix = '.'.join('item' if step is _WILDCARD else step for step in self.steps)
+
+    def find(self, document: Any) -> List[Any]:
+        """Returns every value the path matches in the document, in document order."""
+        nodes = [document]
+        for step in self.steps:
+            matched = []
+            for node in nodes:
+                if step is _WILDCARD:
+                    if isinstance(node, list):
+                        matched.extend(node)
+                    elif isinstance(node, dict):
+                        matched.extend(node.values())
+                elif isinstance(step, int):
+                    if isinstance(node, list) and -len(node) <= step < len(node):
+                        matched.append(node[step])
+                elif isinstance(node, dict) and step in node:
+                    matched.append(node[step])
+            nodes = matched
+            if not nodes:
+                break
+        return nodes
+
+    def extract(self, document: Any) -> Any:
+        """
+        Returns the path's value in the document: the list of matches for a
+        wildcard path, otherwise the single match, or None if nothing matches.
+        """
+        matches = self.find(document)
+        if self.wildcard:
+            return matches
+        return matches[0] if matches else None
+
+    def __repr__(self) -> str:
+        return f"JSONPath({self.expression!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_path(expression: str) -> JSONPath:
+    """Returns the compiled JSONPath of an expression, compiling it on first use."""
+    return JSONPath(expression)
+
+
+class JSONParser(BaseParser):
+    """
+    A parser that extracts data from JSON documents using JSONPath-style expressions.
+
+    Bytes are decoded by the JSON parser itself, which detects UTF-8/16/32.
+    With ijson installed, iter_parse() reads a document from a stream and
+    yields each item as soon as it is complete, so a huge response never
+    has to be held in memory whole.
+    """
+
+    accepts_bytes = True
+
+    def parse(self, content: Union[str, bytes, dict, list], config: Dict[str, Any],
+              encoding: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Parses a JSON document using the paths defined in the configuration.
+
+        Args:
+            content: The JSON document as text or bytes, or already decoded.
+            config: Configuration for the JSON parser, must include:
+                - 'container': A path selecting the items, e.g. "$.products[*]",
+                               or "$" when the whole document is one item.
+                - 'fields': A dictionary where keys are field names and values are
+                            paths relative to the item, e.g. "$.price.amount".
+            encoding: Unused; JSON text is UTF-8/16/32.
+
+        Returns:
+            A list of dictionaries, where each dictionary represents an extracted item.
+            Returns an empty list if parsing fails or no items are found.
+        """
+        try:
+            results = list(self.iter_parse(content, config))
+        except ValueError as e:
+            logger.error(f"Failed to parse JSON content: {e}")
+            return []
+        if not results:
+            logger.warning(f"No items found with container path: '{config.get('parser_config', {}).get('container', '$')}'")
+            return []
+        logger.info(f"Successfully parsed {len(results)} items using JSON paths.")
+        return results
+
+    def iter_parse(self, source: Union[str, bytes, dict, list, IO[bytes]], config: Dict[str, Any],
+                   capture_paths: Optional[Dict[str, str]] = None,
+                   captured: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the items of a JSON document one at a time.
+
+        A file-like source is parsed incrementally with ijson when it is
+        installed and the paths can be streamed (see _can_stream); otherwise
+        the document is loaded whole first.
+
+        Args:
+            source: The JSON document as text, bytes, already decoded, or a binary file-like object.
+            config: Configuration as for parse().
+            capture_paths: Paths of single values to pick up on the way, by name,
+                           e.g. {'cursor': '$.meta.next_cursor'}. Streamed
+                           documents can only capture scalar values.
+            captured: Receives the captured values; complete once the generator is exhausted.
+
+        Raises:
+            ValueError: If the config is invalid or the document is not valid JSON.
+        """
+        parser_config = config.get('parser_config', {})
+        container = compile_path(parser_config.get('container', '$'))
+        fields = {name: compile_path(path) for name, path in parser_config.get('fields', {}).items()}
+        if not fields:
+            raise ValueError("JSONParser config must include a 'fields' dictionary within 'parser_config'.")
+        captures = {name: compile_path(path) for name, path in (capture_paths or {}).items()}
+        captured = captured if captured is not None else {}
+
+        if hasattr(source, 'read'):
+            if ijson is not None and self._can_stream(container, captures):
+                yield from self._iter_stream(source, container, fields, captures, captured)
+                return
+            source = source.read()
+        document = json.loads(source) if isinstance(source, (str, bytes, bytearray)) else source
+        for name, path in captures.items():
+            captured[name] = path.extract(document)
+        for item in container.find(document):
+            yield {name: path.extract(item) for name, path in fields.items()}
+
+    @staticmethod
+    def _can_stream(container: JSONPath, captures: Dict[str, JSONPath]) -> bool:
+        """
+        Checks if streaming gives the same result as loading the document whole.
+
+        Every path needs an ijson prefix, and captures must be single values
+        outside the container, as the stream hands the container's content to
+        the item builder.
+        """
+        if container.ijson_prefix is None:
+            return False
+        for path in captures.values():
+            if path.ijson_prefix is None or path.wildcard:
+                return False
+            if container.ijson_prefix == '' or path.ijson_prefix == container.ijson_prefix \
+                    or path.ijson_prefix.startswith(container.ijson_prefix + '.'):
+                return False
+        return True
+
+    def _iter_stream(self, stream: IO[bytes], container: JSONPath, fields: Dict[str, JSONPath],
+                     captures: Dict[str, JSONPath], captured: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yields the items of a streamed document as ijson completes them."""
+        capture_prefixes = {path.ijson_prefix: name for name, path in captures.items()}
+        for name in captures:
+            captured[name] = None
+        builder = None
+        end_event = None
+        try:
+            for prefix, event, value in ijson.parse(stream, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if prefix == container.ijson_prefix and event == end_event:
+                        yield {name: path.extract(builder.value) for name, path in fields.items()}
+                        builder = None
+                elif prefix == container.ijson_prefix and event in ('start_map', 'start_array'):
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    end_event = 'end_' + event[len('start_'):]
+                elif prefix == container.ijson_prefix and event in _SCALAR_EVENTS:
+                    yield {name: path.extract(value) for name, path in fields.items()}
+                elif prefix in capture_prefixes and event in _SCALAR_EVENTS:
+                    captured[capture_prefixes[prefix]] = value
+        except ijson.JSONError as e:
+            raise ValueError(f"Invalid JSON: {e}") from e
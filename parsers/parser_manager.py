@@ -1,11 +1,11 @@
 import logging
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Type, Union
 
 # Concrete parser imports
 from parsers.base_parser import BaseParser
 from parsers.css_parser import CSSParser
 from parsers.xpath_parser import XPathParser
-# from parsers.json_parser import JSONParser # Not yet implemented
+from parsers.json_parser import JSONParser
 from parsers.ai_parser import AIParser
 
 logger = logging.getLogger(__name__)
@@ -26,7 +26,7 @@ class ParserManager:
         self.register_parser('css', CSSParser)
         self.register_parser('xpath', XPathParser)
         self.register_parser('ai', AIParser)
-        # self.register_parser('json', JSONParser) # Register when implemented
+        self.register_parser('json', JSONParser)
 
     def register_parser(self, parser_type: str, parser_class: Type[BaseParser]):
         """
@@ -60,7 +60,8 @@ class ParserManager:
             raise ValueError(f"Unsupported parser type: {parser_type}")
         return ParserClass()
 
-    def parse(self, content: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def parse(self, content: Union[str, bytes], config: Dict[str, Any],
+              encoding: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Selects a parser based on config and parses the content.
 
@@ -69,9 +70,11 @@ class ParserManager:
         the work to the appropriate parser instance.
 
         Args:
-            content: The raw content (HTML, JSON, etc.) to be parsed.
+            content: The raw content (HTML, JSON, etc.) to be parsed, as text or bytes.
             config: The configuration dictionary, which must contain 'parser_type'
                     and the specific settings for that parser.
+            encoding: The encoding of bytes content. Bytes are passed through to
+                      parsers that accept them and decoded for the others.
 
         Returns:
             A list of dictionaries containing the extracted data.
@@ -84,6 +87,10 @@ class ParserManager:
         try:
             parser = self.get_parser(parser_type)
             # The full config is passed to the parser
+            if isinstance(content, bytes):
+                if parser.accepts_bytes:
+                    return parser.parse(content, config, encoding=encoding)
+                content = content.decode(encoding or 'utf-8', errors='replace')
             return parser.parse(content, config)
         except ValueError as e:
             # Re-raising the error from get_parser
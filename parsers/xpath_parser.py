@@ -1,8 +1,9 @@
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Union
 
 from lxml import html
 
+from fetchers.charset import lxml_encoding
 from parsers.base_parser import BaseParser
 
 logger = logging.getLogger(__name__)
@@ -10,25 +11,38 @@ logger = logging.getLogger(__name__)
 class XPathParser(BaseParser):
     """
     A parser that extracts data from HTML content using XPath expressions.
+
+    Raw bytes are handed to lxml as they are, so no decoded copy of the page is made.
     """
 
-    def parse(self, content: str, config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    accepts_bytes = True
+
+    def parse(self, content: Union[str, bytes], config: Dict[str, Any],
+              encoding: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Parses HTML content using XPath expressions defined in the configuration.
 
         Args:
-            content: The raw HTML content as a string.
+            content: The raw HTML content as a string or as bytes.
             config: Configuration for the XPath parser, must include:
                 - 'container': An XPath expression to select the main item containers.
                 - 'fields': A dictionary where keys are field names and values are
                             XPath expressions relative to the container to extract data.
+            encoding: The encoding of bytes content; lxml guesses it if not given.
 
         Returns:
             A list of dictionaries, where each dictionary represents an extracted item.
             Returns an empty list if parsing fails or no items are found.
         """
+        parser = None
+        if isinstance(content, bytes) and encoding:
+            try:
+                parser = html.HTMLParser(encoding=lxml_encoding(encoding))
+            except LookupError:
+                # An encoding Python knows but libxml2 does not
+                content = content.decode(encoding, errors='replace')
         try:
-            tree = html.fromstring(content)
+            tree = html.fromstring(content, parser=parser)
         except Exception as e:
             logger.error(f"Failed to parse HTML content with lxml: {e}")
             return []
@@ -9,6 +9,7 @@ from ..crawler.crawler_engine import CrawlerEngine
 from ..scrapers.core.universal_scraper import UniversalScraper
 from ..database.connection import batch_insert_scraped_data # New import
 from .utils import generate_data_hash # New import
+from api.metrics import CRAWLER_ITEMS_FOUND_TOTAL, CRAWLER_ITEMS_PER_PAGE, CRAWLER_NEAR_DUPLICATES_TOTAL
 
 logger = logging.getLogger(__name__)
 
@@ -31,16 +32,62 @@ class CrawlerScraperPipeline:
         self.crawler_config = crawler_config
         self.scraper_configs = scraper_configs
         self.db_session = db_session
-        self.crawler = CrawlerEngine(seed_urls=crawler_config.get('seed_urls', []), config=crawler_config)
+        self.crawler = CrawlerEngine(
+            seed_urls=crawler_config.get('seed_urls', []),
+            config=self._with_site_limits(crawler_config, scraper_configs),
+            db_session=db_session,
+        )
         self.universal_scraper = UniversalScraper()
         logger.info("CrawlerScraperPipeline initialized.")
 
+    @staticmethod
+    def _with_site_limits(crawler_config: Dict[str, Any], scraper_configs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Adds each site's rate_limit block, max_bytes and canonicalization block to the crawler config for the site's domain.
+
+        Settings made explicitly in the crawler config's domain_rate_limits,
+        domain_max_bytes and domain_canonicalization take precedence.
+        """
+        domain_rate_limits = {}
+        domain_max_bytes = {}
+        domain_canonicalization = {}
+        for site_config in scraper_configs.values():
+            domain = urlparse(site_config.get('seed_url', '')).netloc
+            if domain and isinstance(site_config.get('rate_limit'), dict):
+                domain_rate_limits[domain] = site_config['rate_limit']
+            if domain and site_config.get('max_bytes') is not None:
+                domain_max_bytes[domain] = site_config['max_bytes']
+            canonicalization = site_config.get('canonicalization') or \
+                (site_config.get('crawler_settings') or {}).get('canonicalization')
+            if domain and isinstance(canonicalization, dict):
+                domain_canonicalization[domain] = canonicalization
+        domain_rate_limits.update(crawler_config.get('domain_rate_limits', {}))
+        domain_max_bytes.update(crawler_config.get('domain_max_bytes', {}))
+        domain_canonicalization.update(crawler_config.get('domain_canonicalization', {}))
+        return {**crawler_config, 'domain_rate_limits': domain_rate_limits, 'domain_max_bytes': domain_max_bytes,
+                'domain_canonicalization': domain_canonicalization}
+
     def run_pipeline(self):
         """
         Executes the full crawling, scraping, parsing, and storage pipeline.
         """
         logger.info("Starting the data acquisition pipeline.")
-        for url in self.crawler.crawl():
+        # crawl_pages() hands over the body the crawler downloaded for link
+        # extraction, so static pages are fetched once instead of twice
+        for page in self.crawler.crawl_pages():
+            url = page.url
+            if page.skip_reason:
+                # Neither HTML nor small enough; the scraper would only download it again
+                logger.info(f"Not scraping {url}: {page.skip_reason}.")
+                continue
+            if page.status_code == 304:
+                # Unchanged since the crawler's last visit, and so are its items
+                logger.info(f"Not scraping {url}: not modified since the last crawl.")
+                continue
+            if page.failed:
+                # The crawler has given up on it; the scraper would only be throttled or fail too
+                logger.info(f"Not scraping {url}: fetch failed (HTTP {page.status_code or 'no response'}).")
+                continue
             logger.info(f"Processing URL from crawler: {url}")
             
             # Find the appropriate scraper config based on the URL's domain or a pattern
@@ -55,8 +102,15 @@ class CrawlerScraperPipeline:
                 logger.warning(f"No matching scraper config found for URL: {url}. Skipping.")
                 continue
 
+            if page.duplicate_of:
+                # Its items were already scraped from the page it duplicates
+                logger.info(f"Skipping {url}: near-duplicate of {page.duplicate_of}.")
+                CRAWLER_NEAR_DUPLICATES_TOTAL.labels(site=matched_config.get('name', urlparse(url).netloc)).inc()
+                continue
+
             try:
-                scraped_data = self.universal_scraper.scrape_site(matched_config, url)
+                scraped_data = self.universal_scraper.scrape_site(matched_config, url, prefetched=page)
+                self._record_yield(matched_config, url, len(scraped_data))
                 if scraped_data:
                     logger.info(f"Scraped {len(scraped_data)} items from {url}.")
                     # Add data_hash and other metadata before storing
@@ -76,6 +130,18 @@ class CrawlerScraperPipeline:
         
         logger.info("Data acquisition pipeline finished.")
 
+    def _record_yield(self, site_config: Dict[str, Any], url: str, items: int):
+        """
+        Reports the items scraped from a page to the crawler and to the metrics.
+
+        The crawler learns from it which kinds of pages are worth crawling first
+        (the 'priority' strategy); the metrics give items per page by strategy.
+        """
+        self.crawler.record_yield(url, items)
+        site = site_config.get('name', urlparse(url).netloc)
+        CRAWLER_ITEMS_FOUND_TOTAL.labels(site=site, strategy=self.crawler.strategy).inc(items)
+        CRAWLER_ITEMS_PER_PAGE.labels(site=site, strategy=self.crawler.strategy).observe(items)
+
     def _store_data(self, data: List[Dict[str, Any]]):
         """
         Stores data into the database using batch insert with conflict resolution.
@@ -0,0 +1,162 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from playwright.sync_api import Page, Response
+
+logger = logging.getLogger(__name__)
+
+# Request headers that describe the browser's connection rather than the API call;
+# cookies are not recorded, so no session ends up on disk
+_UNREPLAYABLE_HEADERS = frozenset({'host', 'content-length', 'cookie', 'connection', 'accept-encoding'})
+
+
+@dataclass
+class ApiEndpoint:
+    """An API request made by a page, as needed to replay it over plain HTTP."""
+
+    url: str
+    method: str = 'GET'
+    headers: Dict[str, str] = field(default_factory=dict)
+    post_data: Optional[str] = None
+
+
+class ResponseCapture:
+    """
+    Records the API responses a Playwright page receives whose URL matches a pattern.
+
+    Only XHR/fetch responses with a 2xx status are kept. Their bodies are
+    read on take(), outside Playwright's event dispatch.
+    """
+
+    def __init__(self, page: Page, url_pattern: str):
+        """
+        Initializes the ResponseCapture and starts recording.
+
+        Args:
+            page: The page to record.
+            url_pattern: A regular expression searched for in response URLs.
+        """
+        self.page = page
+        self.url_pattern = re.compile(url_pattern)
+        self._responses: List[Response] = []
+        self._taken = 0
+        page.on('response', self._on_response)
+
+    @property
+    def pending(self) -> int:
+        """The number of responses recorded but not taken yet."""
+        return len(self._responses) - self._taken
+
+    def wait_for(self, count: int, timeout_ms: float, poll_ms: float = 100) -> bool:
+        """
+        Waits until at least count responses are pending.
+
+        Returns:
+            Whether they arrived before the timeout.
+        """
+        deadline = time.monotonic() + timeout_ms / 1000
+        while self.pending < count:
+            remaining = (deadline - time.monotonic()) * 1000
+            if remaining <= 0:
+                return False
+            # Waiting through Playwright lets it dispatch the response events
+            self.page.wait_for_timeout(min(poll_ms, remaining))
+        return True
+
+    def take(self) -> List[Tuple[ApiEndpoint, bytes]]:
+        """
+        Returns the pending responses as (endpoint, body) pairs, in the order they arrived.
+        """
+        responses = self._responses[self._taken:]
+        self._taken = len(self._responses)
+        captured = []
+        for response in responses:
+            try:
+                body = response.body()
+            except Exception as e:
+                logger.warning(f"Could not read captured response {response.url}: {e}")
+                continue
+            request = response.request
+            headers = {name: value for name, value in request.headers.items()
+                       if not name.startswith(':') and name.lower() not in _UNREPLAYABLE_HEADERS}
+            captured.append((ApiEndpoint(request.url, request.method, headers, request.post_data), body))
+        return captured
+
+    def _on_response(self, response: Response):
+        if response.request.resource_type in ('xhr', 'fetch') and 200 <= response.status < 300 \
+                and self.url_pattern.search(response.url):
+            self._responses.append(response)
+
+
+class EndpointStore:
+    """
+    Stores the API endpoints a page was seen calling, per site and page URL.
+
+    Once a page's endpoints are known, later scrapes of the page can replay
+    them over plain HTTP without a browser. The store is SQLite, so it
+    survives between the scheduled runs; ':memory:' keeps it for the life
+    of the process only.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        Initializes the EndpointStore.
+
+        Args:
+            path: Path of the SQLite database file, or ':memory:'.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS endpoints ("
+            " site TEXT NOT NULL, page_url TEXT NOT NULL, endpoints TEXT NOT NULL, updated_at REAL,"
+            " PRIMARY KEY (site, page_url))"
+        )
+        self._conn.commit()
+
+    def save(self, site: str, page_url: str, endpoints: List[ApiEndpoint]):
+        """Replaces the endpoints recorded for a page."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO endpoints (site, page_url, endpoints, updated_at) VALUES (?, ?, ?, ?)",
+                (site, page_url, json.dumps([endpoint.__dict__ for endpoint in endpoints]), time.time()),
+            )
+            self._conn.commit()
+
+    def load(self, site: str, page_url: str) -> List[ApiEndpoint]:
+        """Returns the endpoints recorded for a page, or an empty list if none are."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT endpoints FROM endpoints WHERE site = ? AND page_url = ?", (site, page_url),
+            ).fetchone()
+        return [ApiEndpoint(**endpoint) for endpoint in json.loads(row[0])] if row else []
+
+    def forget(self, site: str, page_url: str):
+        """Drops the endpoints recorded for a page, e.g. once replaying them has failed."""
+        with self._lock:
+            self._conn.execute("DELETE FROM endpoints WHERE site = ? AND page_url = ?", (site, page_url))
+            self._conn.commit()
+
+
+_stores: Dict[str, EndpointStore] = {}
+_stores_lock = threading.Lock()
+
+def get_endpoint_store(path: str = ':memory:') -> EndpointStore:
+    """
+    Returns the process-wide EndpointStore for a path, creating it on first use.
+
+    Scrapers are instantiated per URL, so sharing the store per path keeps
+    the endpoints learned by one scrape for the next.
+    """
+    with _stores_lock:
+        if path not in _stores:
+            logger.info(f"Opening endpoint store at {path}")
+            _stores[path] = EndpointStore(path)
+        return _stores[path]
@@ -10,6 +10,9 @@ class BaseScraper(abc.ABC):
     scraper template in a consistent way.
     """
 
+    # Whether run() accepts a page the crawler already downloaded (prefetched=...)
+    accepts_prefetched = False
+
     def __init__(self, config: Dict[str, Any]):
         """
         Initializes the scraper with its site-specific configuration.
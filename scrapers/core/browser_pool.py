@@ -0,0 +1,188 @@
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from playwright.sync_api import Browser, BrowserContext, Playwright, sync_playwright
+
+logger = logging.getLogger(__name__)
+
+# browser_config keys passed to browser.new_context() as they are
+_CONTEXT_OPTIONS = (
+    'viewport', 'user_agent', 'locale', 'timezone_id', 'extra_http_headers',
+    'java_script_enabled', 'ignore_https_errors', 'device_scale_factor', 'is_mobile',
+)
+
+
+@dataclass
+class _PooledBrowser:
+    browser: Browser
+    launch_key: Tuple[Any, ...]
+    pages_opened: int = 0
+    crashed: bool = False
+
+
+class BrowserPool:
+    """
+    Keeps Chromium processes running between scraping jobs.
+
+    Launching a browser costs about a second, so instead of one launch per
+    URL each job gets a fresh BrowserContext in a long-lived browser. A
+    context has its own cookies, storage and cache, so jobs stay isolated
+    from each other. A browser is replaced after it has opened
+    max_pages_per_browser pages, to bound the memory Chromium leaks over
+    time, and as soon as it crashes or disconnects.
+
+    Playwright's sync API only works in the thread that started it, so
+    each thread has its own pool; use get_browser_pool() to get it.
+    """
+
+    def __init__(self, max_pages_per_browser: int = 200, browsers_per_launch_config: int = 1,
+                 launch_options: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the BrowserPool. Playwright is started on first use.
+
+        Args:
+            max_pages_per_browser: Pages a browser may open before it is replaced.
+                                   The browser finishes the job it is running first.
+            browsers_per_launch_config: Browsers kept per distinct launch setting
+                                        (e.g. headless or not). Jobs are given the
+                                        least used one.
+            launch_options: Extra options for chromium.launch(), e.g. {'args': [...]}.
+        """
+        self.max_pages_per_browser = max_pages_per_browser
+        self.browsers_per_launch_config = browsers_per_launch_config
+        self.launch_options = dict(launch_options or {})
+        self.browsers_launched = 0
+        self.jobs_run = 0
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[_PooledBrowser] = []
+        self._active: Dict[int, int] = {}  # id(_PooledBrowser) -> contexts open in it
+
+    @contextmanager
+    def context(self, browser_config: Optional[Dict[str, Any]] = None) -> Iterator[BrowserContext]:
+        """
+        Opens a fresh, isolated browser context for one job and closes it afterwards.
+
+        Args:
+            browser_config: The site's browser_config block. 'headless' selects the
+                            browser; viewport, user_agent, locale, timezone_id and
+                            extra_http_headers configure the context.
+
+        Yields:
+            A new BrowserContext.
+        """
+        browser_config = browser_config or {}
+        pooled = self._acquire(browser_config)
+        context = pooled.browser.new_context(**self._context_options(browser_config))
+        context.on('page', lambda _page: self._count_page(pooled))
+        self._active[id(pooled)] = self._active.get(id(pooled), 0) + 1
+        try:
+            yield context
+        finally:
+            self._active[id(pooled)] -= 1
+            self.jobs_run += 1
+            try:
+                context.close()
+            except Exception as e:
+                logger.warning(f"Closing a browser context failed: {e}")
+            if not pooled.browser.is_connected():
+                pooled.crashed = True
+            self._release(pooled)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the number of jobs run, browsers launched and browsers currently open."""
+        return {"jobs": self.jobs_run, "browsers_launched": self.browsers_launched, "browsers_open": len(self._browsers)}
+
+    def close(self):
+        """Closes every browser and stops Playwright."""
+        for pooled in self._browsers:
+            self._close_browser(pooled)
+        self._browsers.clear()
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def _acquire(self, browser_config: Dict[str, Any]) -> _PooledBrowser:
+        launch_key = (browser_config.get('headless', True),)
+        candidates = [
+            pooled for pooled in self._browsers
+            if pooled.launch_key == launch_key and not pooled.crashed and pooled.browser.is_connected()
+            and pooled.pages_opened < self.max_pages_per_browser
+        ]
+        if len(candidates) >= self.browsers_per_launch_config:
+            return min(candidates, key=lambda pooled: self._active.get(id(pooled), 0))
+        return self._launch(launch_key)
+
+    def _launch(self, launch_key: Tuple[Any, ...]) -> _PooledBrowser:
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        headless, = launch_key
+        logger.info(f"Launching {'headless' if headless else 'headed'} browser for the pool.")
+        browser = self._playwright.chromium.launch(headless=headless, **self.launch_options)
+        pooled = _PooledBrowser(browser=browser, launch_key=launch_key)
+        browser.on('disconnected', lambda _browser: setattr(pooled, 'crashed', True))
+        self._browsers.append(pooled)
+        self.browsers_launched += 1
+        return pooled
+
+    def _release(self, pooled: _PooledBrowser):
+        """Closes a browser that crashed or is due for recycling once its last job has finished."""
+        if self._active.get(id(pooled)):
+            return
+        if pooled.crashed:
+            logger.warning("Browser crashed or disconnected; it will be replaced.")
+        elif pooled.pages_opened >= self.max_pages_per_browser:
+            logger.info(f"Recycling browser after {pooled.pages_opened} pages.")
+        else:
+            return
+        self._browsers.remove(pooled)
+        self._active.pop(id(pooled), None)
+        self._close_browser(pooled)
+
+    def _count_page(self, pooled: _PooledBrowser):
+        pooled.pages_opened += 1
+
+    @staticmethod
+    def _close_browser(pooled: _PooledBrowser):
+        try:
+            pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Closing a browser failed: {e}")
+
+    @staticmethod
+    def _context_options(browser_config: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: browser_config[key] for key in _CONTEXT_OPTIONS if browser_config.get(key) is not None}
+
+
+_local = threading.local()
+_pool_options: Optional[Dict[str, Any]] = None
+_pool_options_lock = threading.Lock()
+
+def get_browser_pool(**options) -> BrowserPool:
+    """
+    Returns the calling thread's BrowserPool, creating it on first use.
+
+    The options of the first call in the process configure the pools of all
+    threads.
+    """
+    global _pool_options
+    pool = getattr(_local, 'pool', None)
+    if pool is None:
+        with _pool_options_lock:
+            if _pool_options is None:
+                _pool_options = dict(options)
+            pool = _local.pool = BrowserPool(**_pool_options)
+        if threading.current_thread() is threading.main_thread():
+            atexit.register(pool.close)
+    return pool
+
+
+def close_browser_pool():
+    """Closes the calling thread's BrowserPool, e.g. before a worker thread exits."""
+    pool = getattr(_local, 'pool', None)
+    if pool is not None:
+        pool.close()
+        _local.pool = None
@@ -0,0 +1,155 @@
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from playwright.sync_api import Page, Request
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUIET_MS = 500
+DEFAULT_POLL_MS = 100
+
+# Requests that can carry the content being waited for; images, beacons and
+# long-lived streams would otherwise keep the network from ever going quiet
+DATA_RESOURCE_TYPES = frozenset({'document', 'xhr', 'fetch', 'script'})
+
+
+class PageWaiter:
+    """
+    Waits for content on one Playwright page to arrive instead of sleeping a fixed time.
+
+    A wait ends as soon as its condition holds (a JS expression becoming
+    truthy, a selector appearing) and the page's data requests have then
+    been quiet for quiet_ms, so a fast site is not slowed to the configured
+    delays. The delays become the upper bound of each wait. Configured with
+    a site's browser_config 'wait' block: 'strategy' ('auto', or 'fixed' for
+    the plain delays), 'quiet_ms' and 'poll_ms'.
+
+    Time spent waiting is counted per page between start_page() and finish_page().
+    """
+
+    def __init__(self, page: Page, wait_config: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the PageWaiter.
+
+        Args:
+            page: The page to wait on.
+            wait_config: The site's browser_config 'wait' block; None for the defaults.
+        """
+        wait_config = wait_config or {}
+        self.page = page
+        self.strategy = wait_config.get('strategy', 'auto')
+        self.quiet_ms = wait_config.get('quiet_ms', DEFAULT_QUIET_MS)
+        self.poll_ms = wait_config.get('poll_ms', DEFAULT_POLL_MS)
+        self._in_flight = set()
+        self.start_page()
+        if self.strategy != 'fixed':
+            page.on('request', self._on_request)
+            page.on('requestfinished', self._on_request_done)
+            page.on('requestfailed', self._on_request_done)
+
+    def start_page(self):
+        """Starts counting wait time for a new page."""
+        self.seconds = 0.0
+        self.waits = 0
+        self.met = 0
+
+    def finish_page(self) -> Dict[str, Any]:
+        """
+        Returns the time waited on the page since start_page().
+
+        Returns:
+            The seconds waited, the number of waits and how many of them ended
+            on their condition rather than at their upper bound.
+        """
+        return {"seconds": round(self.seconds, 3), "waits": self.waits, "met": self.met}
+
+    def until(self, condition: str, arg: Any = None, timeout_ms: float = 2000) -> bool:
+        """
+        Waits until a JS expression is truthy on the page, then for the network to go quiet.
+
+        Args:
+            condition: A JS function or expression, as for Page.wait_for_function().
+            arg: The argument passed to the condition.
+            timeout_ms: The upper bound of the whole wait.
+
+        Returns:
+            Whether the condition held before the timeout. With the fixed
+            strategy, whether it holds after waiting the whole timeout.
+        """
+        started = time.monotonic()
+        if self.strategy == 'fixed':
+            self.page.wait_for_timeout(timeout_ms)
+            return self._record(started, bool(self.page.evaluate(condition, arg)))
+        try:
+            self.page.wait_for_function(condition, arg=arg, timeout=timeout_ms, polling=self.poll_ms)
+        except PlaywrightTimeoutError:
+            return self._record(started, False)
+        self._wait_quiet(timeout_ms - (time.monotonic() - started) * 1000)
+        return self._record(started, True)
+
+    def for_selector(self, selector: str, timeout_ms: float = 2000) -> bool:
+        """
+        Waits until a selector matches on the page, then for the network to go quiet.
+
+        Returns:
+            Whether the selector appeared before the timeout.
+        """
+        started = time.monotonic()
+        if self.strategy == 'fixed':
+            self.page.wait_for_timeout(timeout_ms)
+            return self._record(started, self.page.query_selector(selector) is not None)
+        try:
+            self.page.wait_for_selector(selector, timeout=timeout_ms)
+        except PlaywrightTimeoutError:
+            return self._record(started, False)
+        self._wait_quiet(timeout_ms - (time.monotonic() - started) * 1000)
+        return self._record(started, True)
+
+    def for_network_idle(self, timeout_ms: float = 2000) -> bool:
+        """
+        Waits until no data request has been in flight for quiet_ms.
+
+        Unlike the 'networkidle' load state, this also covers requests made
+        after the page has loaded, e.g. by a click or a scroll.
+
+        Returns:
+            Whether the network went quiet before the timeout.
+        """
+        started = time.monotonic()
+        if self.strategy == 'fixed':
+            self.page.wait_for_timeout(timeout_ms)
+            return self._record(started, True)
+        return self._record(started, self._wait_quiet(timeout_ms))
+
+    def _wait_quiet(self, timeout_ms: float) -> bool:
+        deadline = time.monotonic() + max(timeout_ms, 0) / 1000
+        quiet_since = None
+        while True:
+            now = time.monotonic()
+            if self._in_flight:
+                quiet_since = None
+            elif quiet_since is None:
+                quiet_since = now
+            elif (now - quiet_since) * 1000 >= self.quiet_ms:
+                return True
+            if now >= deadline:
+                return False
+            # Waiting through Playwright lets it dispatch the request events
+            self.page.wait_for_timeout(min(self.poll_ms, (deadline - now) * 1000))
+
+    def _record(self, started: float, met: bool) -> bool:
+        seconds = time.monotonic() - started
+        self.seconds += seconds
+        self.waits += 1
+        self.met += met
+        logger.debug(f"Waited {seconds:.2f}s ({'condition met' if met else 'timed out'}).")
+        return met
+
+    def _on_request(self, request: Request):
+        if request.resource_type in DATA_RESOURCE_TYPES:
+            self._in_flight.add(request)
+
+    def _on_request_done(self, request: Request):
+        self._in_flight.discard(request)
@@ -0,0 +1,211 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional, Union
+from urllib.parse import urlparse
+
+from playwright.sync_api import Page, Request, Route
+
+logger = logging.getLogger(__name__)
+
+# Resource types the parsers never need; stylesheets are kept by default, as
+# some sites only lazy-load content once it is laid out
+DEFAULT_BLOCKED_TYPES = ('image', 'media', 'font')
+
+# Analytics, ad and tag-manager hosts; subdomains are blocked too
+DEFAULT_BLOCKED_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com', 'googlesyndication.com',
+    'doubleclick.net', 'adservice.google.com', 'facebook.net', 'connect.facebook.com',
+    'analytics.tiktok.com', 'hotjar.com', 'clarity.ms', 'segment.io', 'segment.com',
+    'mixpanel.com', 'amplitude.com', 'newrelic.com', 'nr-data.net', 'sentry.io',
+    'scorecardresearch.com', 'quantserve.com', 'criteo.com', 'criteo.net', 'taboola.com',
+    'outbrain.com', 'adnxs.com', 'bat.bing.com', 'snap.licdn.com', 'static.ads-twitter.com',
+)
+
+DEFAULT_CALIBRATE_EVERY = 25
+
+
+class ResourceBlocker:
+    """
+    Blocks the requests a rendered page does not need for parsing, per site.
+
+    Images, media, fonts and known analytics/ad domains are aborted through
+    Playwright routing before they reach the network; URLs matching the
+    allowlist always pass. Configured with a site's browser_config
+    'block_resources', which is either a list of resource types or a block
+    with 'types', 'domains' (added to the defaults), 'allow' (URL regexes),
+    'default_domains' and 'calibrate_every'. False turns blocking off.
+
+    The bytes and time blocking saves cannot be seen on a blocked page, so
+    every calibrate_every-th page is loaded in full while recording what
+    would have been blocked. Each blocked page is then reported against the
+    averages of those calibration pages.
+    """
+
+    def __init__(self, block_config: Union[bool, Iterable[str], Dict[str, Any], None] = None):
+        """
+        Initializes the ResourceBlocker.
+
+        Args:
+            block_config: The site's browser_config 'block_resources' value; None for the defaults.
+        """
+        if block_config is None or block_config is True:
+            block_config = {}
+        elif block_config is False:
+            block_config = {'types': [], 'default_domains': False}
+        elif not isinstance(block_config, dict):
+            block_config = {'types': list(block_config)}
+        self.enabled = block_config.get('enabled', True)
+        self.types = frozenset(block_config.get('types', DEFAULT_BLOCKED_TYPES))
+        domains = list(DEFAULT_BLOCKED_DOMAINS) if block_config.get('default_domains', True) else []
+        self.domains = frozenset(domains + list(block_config.get('domains', [])))
+        allow = block_config.get('allow', [])
+        self._allow_re = re.compile('|'.join(f'(?:{pattern})' for pattern in allow)) if allow else None
+        self.calibrate_every = block_config.get('calibrate_every', DEFAULT_CALIBRATE_EVERY)
+
+        self._lock = threading.Lock()
+        self._pages_started = 0
+        # Learned on calibration pages: bytes per would-be-blocked request by type, and full load time
+        self._bytes_by_type: Counter = Counter()
+        self._requests_by_type: Counter = Counter()
+        self._calibration_pages = 0
+        self._calibration_seconds = 0.0
+        self.totals = {"pages": 0, "requests_blocked": 0, "bytes_saved": 0, "seconds_saved": 0.0}
+
+    @property
+    def active(self) -> bool:
+        """Whether anything is blocked at all."""
+        return self.enabled and bool(self.types or self.domains)
+
+    def attach(self, page: Page) -> 'PageResources':
+        """Routes a page's requests through the blocker and returns the tracker of what it blocked."""
+        return PageResources(self, page)
+
+    def should_block(self, url: str, resource_type: str) -> Optional[str]:
+        """
+        Returns why a request should be blocked ('analytics' or its resource type), or None to let it through.
+        """
+        if self._allow_re is not None and self._allow_re.search(url):
+            return None
+        host = urlparse(url).hostname or ''
+        if self.domains and any(host == domain or host.endswith('.' + domain) for domain in self.domains):
+            return 'analytics'
+        if resource_type in self.types:
+            return resource_type
+        return None
+
+    def _next_page_calibrates(self) -> bool:
+        with self._lock:
+            self._pages_started += 1
+            return bool(self.calibrate_every) and (self._pages_started - 1) % self.calibrate_every == 0
+
+    def _learn(self, sizes: Counter, counts: Counter, seconds: float):
+        with self._lock:
+            self._bytes_by_type.update(sizes)
+            self._requests_by_type.update(counts)
+            self._calibration_pages += 1
+            self._calibration_seconds += seconds
+
+    def _estimate(self, blocked: Counter, seconds: float) -> Dict[str, Any]:
+        """Estimates the bytes and seconds a blocked page saved from the calibration averages."""
+        with self._lock:
+            bytes_saved = sum(
+                count * self._bytes_by_type[reason] // self._requests_by_type[reason]
+                for reason, count in blocked.items() if self._requests_by_type[reason]
+            )
+            seconds_saved = None
+            if self._calibration_pages:
+                seconds_saved = max(0.0, self._calibration_seconds / self._calibration_pages - seconds)
+            self.totals["pages"] += 1
+            self.totals["requests_blocked"] += sum(blocked.values())
+            self.totals["bytes_saved"] += bytes_saved
+            self.totals["seconds_saved"] += seconds_saved or 0.0
+        return {"bytes_saved": bytes_saved, "seconds_saved": seconds_saved}
+
+
+class PageResources:
+    """
+    Tracks the requests a ResourceBlocker blocked on one Playwright page, one navigation at a time.
+    """
+
+    def __init__(self, blocker: ResourceBlocker, page: Page):
+        self.blocker = blocker
+        self.page = page
+        self.url: Optional[str] = None
+        self.calibrating = False
+        self.blocked: Counter = Counter()
+        self._would_block_sizes: Counter = Counter()
+        self._would_block_counts: Counter = Counter()
+        self._started = 0.0
+        if blocker.active:
+            page.route('**/*', self._handle_route)
+            page.on('requestfinished', self._on_request_finished)
+
+    def start_page(self, url: str):
+        """Starts counting for a navigation to url."""
+        self.url = url
+        self.calibrating = self.blocker.active and self.blocker._next_page_calibrates()
+        self.blocked = Counter()
+        self._would_block_sizes = Counter()
+        self._would_block_counts = Counter()
+        self._started = time.monotonic()
+
+    def finish_page(self) -> Dict[str, Any]:
+        """
+        Ends counting for the current navigation and logs what blocking saved.
+
+        Returns:
+            The number of requests blocked per reason and the estimated bytes and
+            seconds saved (None until a calibration page has been seen).
+        """
+        seconds = time.monotonic() - self._started
+        if not self.blocker.active:
+            return {}
+        if self.calibrating:
+            self.blocker._learn(self._would_block_sizes, self._would_block_counts, seconds)
+            logger.info(f"Calibration load of {self.url} in {seconds:.2f}s: "
+                        f"{sum(self._would_block_counts.values())} blockable requests, "
+                        f"{sum(self._would_block_sizes.values()) / 1024:.0f} KB.")
+            return {"calibration": True, "blockable": dict(self._would_block_counts)}
+        report = {"blocked": dict(self.blocked), **self.blocker._estimate(self.blocked, seconds)}
+        saved_time = f", ~{report['seconds_saved']:.2f}s" if report["seconds_saved"] is not None else ""
+        logger.info(f"Blocked {sum(self.blocked.values())} requests on {self.url} {dict(self.blocked)}: "
+                    f"~{report['bytes_saved'] / 1024:.0f} KB{saved_time} saved.")
+        return report
+
+    def _handle_route(self, route: Route, request: Request):
+        reason = self.blocker.should_block(request.url, request.resource_type)
+        if reason is None or self.calibrating:
+            route.continue_()
+            return
+        self.blocked[reason] += 1
+        route.abort('blockedbyclient')
+
+    def _on_request_finished(self, request: Request):
+        if not self.calibrating:
+            return
+        reason = self.blocker.should_block(request.url, request.resource_type)
+        if reason is not None:
+            self._would_block_counts[reason] += 1
+            try:
+                self._would_block_sizes[reason] += request.sizes()['responseBodySize']
+            except Exception as e:
+                logger.debug(f"No sizes for {request.url}: {e}")
+
+
+_blockers: Dict[str, ResourceBlocker] = {}
+_blockers_lock = threading.Lock()
+
+def get_resource_blocker(site: str, block_config: Union[bool, Iterable[str], Dict[str, Any], None] = None) -> ResourceBlocker:
+    """
+    Returns the process-wide ResourceBlocker of a site, creating it on first use.
+
+    Scrapers are instantiated per URL, so sharing the blocker per site keeps
+    its calibration averages and totals across pages.
+    """
+    with _blockers_lock:
+        if site not in _blockers:
+            _blockers[site] = ResourceBlocker(block_config)
+        return _blockers[site]
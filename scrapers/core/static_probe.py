@@ -0,0 +1,99 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_ITEMS = 1
+DEFAULT_TTL = 24 * 3600
+
+STATIC = 'static'
+SPA = 'spa'
+
+
+class StaticProbe:
+    """
+    Remembers per site whether its 'spa' pages can be scraped from the plain HTTP response.
+
+    Many sites render their listings on the server as well, so the parser
+    finds the items without a browser. A decision lasts ttl seconds, after
+    which the site is probed again. The time the browser took on each site
+    is kept too, to estimate what a static scrape saved; sites whose pages
+    never needed the browser are estimated from a configured time or the
+    average over all sites.
+    """
+
+    def __init__(self):
+        """Initializes the StaticProbe."""
+        self._lock = threading.Lock()
+        # site -> (decision, expiry time)
+        self._decisions: Dict[str, Tuple[str, float]] = {}
+        # site -> (total seconds, runs) of browser scrapes
+        self._browser_seconds: Dict[str, Tuple[float, int]] = {}
+
+    def decision(self, site: str) -> Optional[str]:
+        """Returns the site's current decision, STATIC or SPA, or None if it is unknown or expired."""
+        with self._lock:
+            decision, expires_at = self._decisions.get(site, (None, 0.0))
+        return decision if time.monotonic() < expires_at else None
+
+    def decide(self, site: str, decision: str, ttl: float = DEFAULT_TTL):
+        """Records a decision for the site, logging it when it changes."""
+        with self._lock:
+            previous, _ = self._decisions.get(site, (None, 0.0))
+            self._decisions[site] = (decision, time.monotonic() + ttl)
+        if decision != previous:
+            logger.info(f"[{site}] Static probe: scraping {'over plain HTTP' if decision == STATIC else 'with the browser'} "
+                        f"for the next {ttl:.0f}s.")
+
+    def record_browser_run(self, site: str, seconds: float):
+        """Counts the time a browser scrape of the site took."""
+        with self._lock:
+            total, runs = self._browser_seconds.get(site, (0.0, 0))
+            self._browser_seconds[site] = (total + seconds, runs + 1)
+
+    def browser_seconds(self, site: str) -> Optional[float]:
+        """Returns the average time a browser scrape of the site took, or None if none has run."""
+        with self._lock:
+            total, runs = self._browser_seconds.get(site, (0.0, 0))
+        return total / runs if runs else None
+
+    def estimated_browser_seconds(self, site: str, configured: Optional[float] = None) -> Optional[float]:
+        """
+        Returns the time a browser scrape of the site would take.
+
+        Args:
+            site: The site name.
+            configured: The time to assume when the site has no browser runs of its own.
+
+        Returns:
+            The site's average, else the configured time, else the average over
+            all sites, or None if no browser scrape has run at all.
+        """
+        seconds = self.browser_seconds(site)
+        if seconds is not None:
+            return seconds
+        if configured is not None:
+            return float(configured)
+        with self._lock:
+            total = sum(seconds for seconds, _ in self._browser_seconds.values())
+            runs = sum(runs for _, runs in self._browser_seconds.values())
+        return total / runs if runs else None
+
+
+_probe: Optional[StaticProbe] = None
+_probe_lock = threading.Lock()
+
+def get_static_probe() -> StaticProbe:
+    """
+    Returns the process-wide StaticProbe, creating it on first use.
+
+    Scrapers are instantiated per URL, so the decisions are kept here
+    rather than on a scraper.
+    """
+    global _probe
+    with _probe_lock:
+        if _probe is None:
+            _probe = StaticProbe()
+        return _probe
@@ -1,10 +1,15 @@
 import logging
+import time
 import yaml
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-from scrapers.templates.html_scraper import HTMLScraper
+from scrapers.templates.api_scraper import APIScraper
+from scrapers.templates.html_scraper import FAILED, NOT_MODIFIED, HTMLScraper
 from scrapers.templates.spa_scraper import SPAScraper
 from scrapers.core.base_scraper import BaseScraper # For type hinting
+from scrapers.core.static_probe import DEFAULT_MIN_ITEMS, DEFAULT_TTL, SPA, STATIC, get_static_probe
+from fetchers.page import FetchedPage
+from api.metrics import SCRAPER_BROWSER_SECONDS_SAVED_TOTAL, SCRAPER_STATIC_PROBE_TOTAL
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +17,16 @@ class UniversalScraper:
     """
     A universal scraper engine that routes scraping tasks to the correct
     scraper template based on the site's configuration type.
+
+    'spa' sites can opt into a static probe with 'static_probe' (true, or a
+    block with 'min_items' and 'ttl' in seconds): the page is first scraped
+    from the plain HTTP response, and if the parser finds at least
+    min_items items no browser is started. The outcome is remembered per
+    site for ttl seconds, so a site that needs the browser is not probed on
+    every page. Only a page that was parsed decides: an unchanged page
+    (revisit_cache) is skipped, and a failed fetch goes to the browser
+    without deciding anything. Sites with pagination, detail pages or API capture are
+    never probed, as only the browser scraper handles those.
     """
 
     def __init__(self):
@@ -21,8 +36,8 @@ class UniversalScraper:
         self._scraper_registry: Dict[str, Type[BaseScraper]] = {}
         self.register_scraper('html', HTMLScraper)
         self.register_scraper('spa', SPAScraper)
+        self.register_scraper('api', APIScraper)
         # Register other scrapers as they are implemented
-        # self.register_scraper('api', APIScraper)
         # self.register_scraper('pdf', PDFScraper)
         # self.register_scraper('excel', ExcelScraper)
 
@@ -39,13 +54,16 @@ class UniversalScraper:
         logger.info(f"Registering scraper type '{scraper_type}'.")
         self._scraper_registry[scraper_type] = scraper_class
 
-    def scrape_site(self, config: Dict[str, Any], url: str) -> List[Dict[str, Any]]:
+    def scrape_site(self, config: Dict[str, Any], url: str,
+                    prefetched: Optional[FetchedPage] = None) -> List[Dict[str, Any]]:
         """
         Scrapes a site based on its configuration and a target URL.
 
         Args:
             config: The loaded site configuration dictionary.
             url: The specific URL to scrape.
+            prefetched: The page as already downloaded by the crawler. Scrapers that
+                        accept it parse this body instead of fetching the URL again.
 
         Returns:
             A list of dictionaries containing the extracted and validated data.
@@ -58,15 +76,94 @@ class UniversalScraper:
         if not ScraperClass:
             raise ValueError(f"No scraper registered for type: {scraper_type}")
 
+        probe_config = self._static_probe_config(config)
+        if probe_config is not None:
+            items = self._scrape_statically(config, url, prefetched, probe_config)
+            if items is not None:
+                return items
+
+        started = time.monotonic()
+        items = self._run_scraper(ScraperClass, scraper_type, config, url, prefetched)
+        if probe_config is not None:
+            get_static_probe().record_browser_run(config.get('name', scraper_type), time.monotonic() - started)
+        return items
+
+    def _run_scraper(self, ScraperClass: Type[BaseScraper], scraper_type: str, config: Dict[str, Any], url: str,
+                     prefetched: Optional[FetchedPage]) -> List[Dict[str, Any]]:
+        """Runs a scraper of the given class on the URL."""
         logger.info(f"Instantiating {scraper_type} scraper for URL: {url}")
         scraper_instance = ScraperClass(config)
         
         try:
+            if prefetched is not None and scraper_instance.accepts_prefetched:
+                return scraper_instance.run(url, prefetched=prefetched)
             return scraper_instance.run(url)
         except Exception as e:
             logger.error(f"Error running {scraper_type} scraper for {url}: {e}", exc_info=True)
             return []
 
+    def _scrape_html(self, config: Dict[str, Any], url: str,
+                     prefetched: Optional[FetchedPage]) -> Tuple[List[Dict[str, Any]], str]:
+        """Runs the HTML scraper on the URL and returns its items and outcome (see HTMLScraper.scrape)."""
+        logger.info(f"Instantiating html scraper for URL: {url}")
+        try:
+            return HTMLScraper(config).scrape(url, prefetched)
+        except Exception as e:
+            logger.error(f"Error running html scraper for {url}: {e}", exc_info=True)
+            return [], FAILED
+
+    def _static_probe_config(self, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Returns the site's static probe settings, or None if the probe does not apply to it."""
+        probe_config = config.get('static_probe')
+        if not probe_config or config.get('type') != 'spa':
+            return None
+        if any(config.get(key) for key in ('pagination', 'detail_parser', 'api_capture')):
+            logger.debug(f"[{config.get('name')}] Not probing statically: pagination, detail pages "
+                         f"and API capture need the browser.")
+            return None
+        return probe_config if isinstance(probe_config, dict) else {}
+
+    def _scrape_statically(self, config: Dict[str, Any], url: str, prefetched: Optional[FetchedPage],
+                           probe_config: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Scrapes an SPA page from its plain HTTP response, unless the site is known to need the browser.
+
+        Returns:
+            The items, or None if the browser is needed: the site was recently
+            found to need it, the static scrape found fewer than min_items items,
+            or it got no page to parse. An unchanged page gives no items.
+        """
+        site = config.get('name', 'UnknownScraper')
+        probe = get_static_probe()
+        if probe.decision(site) == SPA:
+            return None
+
+        min_items = probe_config.get('min_items', DEFAULT_MIN_ITEMS)
+        ttl = probe_config.get('ttl', DEFAULT_TTL)
+        started = time.monotonic()
+        items, outcome = self._scrape_html(config, url, prefetched)
+        seconds = time.monotonic() - started
+        if outcome == NOT_MODIFIED:
+            return []
+        if outcome == FAILED:
+            logger.info(f"[{site}] Static probe of {url} got no page to parse; using the browser without deciding.")
+            return None
+        if len(items) < min_items:
+            logger.info(f"[{site}] Static probe of {url} found {len(items)} items (< {min_items}); using the browser.")
+            probe.decide(site, SPA, ttl)
+            SCRAPER_STATIC_PROBE_TOTAL.labels(site=site, path=SPA).inc()
+            return None
+
+        probe.decide(site, STATIC, ttl)
+        SCRAPER_STATIC_PROBE_TOTAL.labels(site=site, path=STATIC).inc()
+        browser_seconds = probe.estimated_browser_seconds(site, probe_config.get('browser_seconds'))
+        saved = ""
+        if browser_seconds is not None:
+            SCRAPER_BROWSER_SECONDS_SAVED_TOTAL.labels(site=site).inc(max(0.0, browser_seconds - seconds))
+            saved = f"; ~{max(0.0, browser_seconds - seconds):.1f}s of browser time saved"
+        logger.info(f"[{site}] Scraped {len(items)} items from {url} over plain HTTP in {seconds:.2f}s{saved}.")
+        return items
+
     def load_config_and_scrape(self, config_path: str, url: str) -> List[Dict[str, Any]]:
         """
         Loads a site configuration from a YAML file and then scrapes the site.
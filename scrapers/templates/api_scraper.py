@@ -0,0 +1,259 @@
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+import requests
+
+from scrapers.core.base_scraper import BaseScraper
+from parsers.json_parser import JSONParser, ijson
+from parsers.parser_manager import ParserManager
+
+logger = logging.getLogger(__name__)
+
+# Instantiate ParserManager once
+parser_manager = ParserManager()
+
+# Bodies larger than this (or of unknown length) are parsed as they stream in, if ijson is installed
+DEFAULT_STREAM_THRESHOLD = 1024 * 1024
+
+
+def _with_params(url: str, params: Dict[str, Any]) -> str:
+    """Returns the URL with the given query parameters set, replacing any of the same name."""
+    parts = urlsplit(url)
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True) if key not in params]
+    query.extend((key, str(value)) for key, value in params.items())
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+class APIScraper(BaseScraper):
+    """
+    Scraper for JSON APIs.
+
+    Requests the URL with the site's 'headers' and 'params' and parses the
+    JSON with the site's parser (normally 'json', see JSONParser). A
+    'pagination' block makes it follow the API's pages, one request per
+    page, as a generator of items:
+
+    - type 'cursor': 'cursor_path' points at the next cursor in the response,
+      which is sent as the 'cursor_param' query parameter.
+    - type 'next_url': 'next_url_path' points at the next page's URL.
+    - type 'link_header': the rel="next" URL of the Link header (GitHub style).
+    - type 'offset': 'offset_param' advances by 'limit' (sent as 'limit_param').
+    - type 'page': 'page_param' counts up from 'start' (default 1).
+
+    Pagination stops after 'max_pages' pages (default 10), at a page without
+    items or without a next cursor/URL, waiting 'delay' seconds between pages.
+
+    With ijson installed, responses larger than 'stream_threshold' bytes, or
+    of unknown length, are parsed as they download instead of being loaded
+    whole; 'stream' true/false forces either way.
+    """
+
+    def __init__(self, config: Dict[str, Any], session: Optional[requests.Session] = None):
+        """
+        Initializes the APIScraper.
+
+        Args:
+            config: A dictionary containing scraper configuration.
+            session: An optional requests.Session object for making HTTP requests.
+        """
+        super().__init__(config)
+        self.session = session or requests.Session()
+        self.session.headers.update(config.get('headers') or {})
+        self.json_parser = JSONParser()
+
+    def extract(self, url: str) -> str:
+        """
+        Extracts the raw JSON of a single API response.
+
+        Args:
+            url: The API URL to request.
+
+        Returns:
+            The response body as text. Returns an empty string if the request fails.
+        """
+        response = self._request(url)
+        if response is None:
+            return ""
+        with response:
+            return response.text
+
+    def validate(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Performs basic validation on the extracted data.
+
+        Args:
+            data: A list of dictionaries, where each dictionary is a scraped item.
+
+        Returns:
+            The validated list of dictionaries.
+        """
+        logger.info(f"[{self.name}] Validating {len(data)} items.")
+        return data
+
+    def run(self, url: str) -> List[Dict[str, Any]]:
+        """
+        Executes the complete scraping process for a given URL, following the API's pagination.
+
+        Args:
+            url: The API URL of the first page.
+
+        Returns:
+            A list of dictionaries, where each dictionary is a validated and
+            processed scraped item. Returns an empty list if the process fails.
+        """
+        logger.info(f"[{self.name}] Running scrape process for URL: {url}")
+        try:
+            items = list(self.iter_items(url))
+        except Exception as e:
+            logger.error(f"[{self.name}] Failed to scrape API {url}: {e}", exc_info=True)
+            return []
+        return self.validate(items)
+
+    def iter_items(self, url: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yields the items of every page of the API, requesting each page only once the previous one is consumed.
+
+        Args:
+            url: The API URL of the first page.
+        """
+        pagination = self.config.get('pagination') or {}
+        pagination_type = pagination.get('type')
+        max_pages = pagination.get('max_pages', 10) if pagination_type else 1
+        delay = pagination.get('delay', 0)
+        url = _with_params(url, self.config['params']) if self.config.get('params') else url
+        state = self._first_page_state(url, pagination)
+
+        for page_num in range(1, max_pages + 1):
+            page_url = self._page_url(url, pagination, state)
+            logger.info(f"[{self.name}] Requesting API page {page_num}: {page_url}")
+            response = self._request(page_url)
+            if response is None:
+                return
+            captured: Dict[str, Any] = {}
+            count = 0
+            with response:
+                try:
+                    for item in self._iter_response(response, pagination, captured):
+                        count += 1
+                        yield item
+                except ValueError as e:
+                    logger.error(f"[{self.name}] Invalid JSON from {page_url} after {count} items: {e}")
+                    return
+            logger.info(f"[{self.name}] Parsed {count} items from API page {page_num}.")
+            if not count or not self._advance(response, pagination, captured, state):
+                return
+            if page_num < max_pages and delay:
+                time.sleep(delay)
+
+    def _first_page_state(self, url: str, pagination: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the pagination state before the first page is requested."""
+        pagination_type = pagination.get('type')
+        if pagination_type == 'offset':
+            return {'offset': pagination.get('start', 0)}
+        if pagination_type == 'page':
+            return {'page': pagination.get('start', 1)}
+        return {'next_url': url, 'cursor': None}
+
+    def _page_url(self, url: str, pagination: Dict[str, Any], state: Dict[str, Any]) -> str:
+        """Returns the URL of the page the pagination state points at."""
+        pagination_type = pagination.get('type')
+        if pagination_type == 'offset':
+            params = {pagination.get('offset_param', 'offset'): state['offset']}
+            if pagination.get('limit'):
+                params[pagination.get('limit_param', 'limit')] = pagination['limit']
+            return _with_params(url, params)
+        if pagination_type == 'page':
+            return _with_params(url, {pagination.get('page_param', 'page'): state['page']})
+        if pagination_type == 'cursor' and state['cursor'] is not None:
+            return _with_params(url, {pagination.get('cursor_param', 'cursor'): state['cursor']})
+        return state['next_url']
+
+    def _advance(self, response: requests.Response, pagination: Dict[str, Any],
+                 captured: Dict[str, Any], state: Dict[str, Any]) -> bool:
+        """
+        Moves the pagination state to the next page.
+
+        Returns:
+            Whether there is a next page.
+        """
+        pagination_type = pagination.get('type')
+        if pagination_type == 'offset':
+            state['offset'] += pagination.get('limit', 1)
+        elif pagination_type == 'page':
+            state['page'] += 1
+        elif pagination_type == 'cursor':
+            if not captured.get('next'):
+                return False
+            state['cursor'] = captured['next']
+        elif pagination_type == 'next_url':
+            if not captured.get('next'):
+                return False
+            state['next_url'] = urljoin(response.url, captured['next'])
+        elif pagination_type == 'link_header':
+            next_link = response.links.get('next', {}).get('url')
+            if not next_link:
+                return False
+            state['next_url'] = next_link
+        else:
+            if pagination_type:
+                logger.warning(f"[{self.name}] Unknown pagination type: {pagination_type}")
+            return False
+        return True
+
+    def _iter_response(self, response: requests.Response, pagination: Dict[str, Any],
+                       captured: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Yields the items of one API response, streaming the body when it is large."""
+        next_path = pagination.get('cursor_path') or pagination.get('next_url_path')
+        capture_paths = {'next': next_path} if next_path else None
+        if self.config.get('parser_type', 'json') != 'json':
+            yield from parser_manager.parse(response.content, self.config)
+            return
+        if self._should_stream(response):
+            logger.info(f"[{self.name}] Parsing {response.url} as it streams in.")
+            response.raw.decode_content = True
+            source = response.raw
+        else:
+            source = response.content
+        yield from self.json_parser.iter_parse(source, self.config, capture_paths, captured)
+
+    def _should_stream(self, response: requests.Response) -> bool:
+        """Whether to parse a response incrementally rather than loading its body whole."""
+        stream = self.config.get('stream', 'auto')
+        if stream is not True and stream != 'auto':
+            return False
+        if ijson is None:
+            if stream is True:
+                logger.warning(f"[{self.name}] 'stream' is set but ijson is not installed; loading responses whole.")
+            return False
+        if stream is True:
+            return True
+        length = response.headers.get('Content-Length')
+        return not (length and length.isdigit()) or int(length) > self.config.get('stream_threshold', DEFAULT_STREAM_THRESHOLD)
+
+    def _request(self, url: str, retries: int = 3, backoff_factor: float = 0.5) -> Optional[requests.Response]:
+        """
+        Requests an API URL with retry logic, without reading the body.
+
+        Returns:
+            The response, still streaming, if successful; otherwise None.
+        """
+        for attempt in range(retries):
+            response = None
+            try:
+                response = self.session.get(url, stream=True, timeout=self.config.get('timeout', 30))
+                response.raise_for_status()
+                return response
+            except requests.exceptions.RequestException as e:
+                if response is not None:
+                    # Unread, the streamed body would keep its pooled connection checked out
+                    response.close()
+                logger.warning(f"[{self.name}] Attempt {attempt + 1} failed for {url}: {e}")
+                if attempt < retries - 1:
+                    sleep_time = backoff_factor * (2 ** attempt)
+                    logger.info(f"[{self.name}] Retrying in {sleep_time:.2f} seconds...")
+                    time.sleep(sleep_time)
+                else:
+                    logger.error(f"[{self.name}] All {retries} retries failed for {url}.")
+        return None
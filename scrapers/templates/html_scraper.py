@@ -1,27 +1,49 @@
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import requests
 # from bs4 import BeautifulSoup # No longer needed directly here
 
 from scrapers.core.base_scraper import BaseScraper
 from parsers.parser_manager import ParserManager # Import ParserManager
+from fetchers.charset import resolve_encoding
+from fetchers.page import FetchedPage
+from fetchers.revisit_store import get_revisit_store
+from fetchers.streaming import DEFAULT_CONTENT_TYPES, DEFAULT_MAX_BYTES, ContentSkipped, StreamingFetcher
 
 logger = logging.getLogger(__name__)
 
 # Instantiate ParserManager once
 parser_manager = ParserManager()
 
+# Outcomes of HTMLScraper.scrape()
+PARSED = 'parsed'              # The page was parsed; the items are all it holds
+NOT_MODIFIED = 'not_modified'  # The page has not changed since the last visit and was not parsed
+FAILED = 'failed'              # There was no page to parse: the fetch or parse failed, or it was skipped
+
 
 class HTMLScraper(BaseScraper):
     """
     Scraper for static HTML websites.
 
     This scraper fetches HTML content from a URL, delegates parsing
-    to the ParserManager, and includes basic validation.
+    to the ParserManager, and includes basic validation. If the site config
+    sets 'revisit_cache', pages are refetched with conditional requests and
+    unchanged (304) pages are skipped without parsing or storing.
+
+    When the crawler has already downloaded the page it is passed to run()
+    as 'prefetched' and parsed without a second request.
+
+    Pages are downloaded as streams: responses that are not HTML or larger
+    than the site's 'max_bytes' are abandoned after the headers or at the
+    cap. 'content_types' overrides the accepted media types. The encoding
+    is taken from the headers, a BOM or <meta charset> before any detection
+    runs, and parsers that read bytes (xpath) get the body undecoded.
     """
 
+    accepts_prefetched = True
+
     def __init__(self, config: Dict[str, Any], session: Optional[requests.Session] = None):
         """
         Initializes the HTMLScraper.
@@ -35,6 +57,13 @@ class HTMLScraper(BaseScraper):
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        revisit_cache = config.get('revisit_cache')
+        self.revisit_store = get_revisit_store(revisit_cache) if revisit_cache else None
+        self.fetcher = StreamingFetcher(
+            self.session,
+            max_bytes=config.get('max_bytes', DEFAULT_MAX_BYTES),
+            content_types=config.get('content_types', DEFAULT_CONTENT_TYPES),
+        )
 
     def extract(self, url: str) -> str:
         """
@@ -44,13 +73,11 @@ class HTMLScraper(BaseScraper):
             url: The URL of the static HTML page to fetch.
 
         Returns:
-            The raw HTML content as a string. Returns an empty string if fetching fails.
+            The raw HTML content as a string. Returns an empty string if fetching
+            fails or the page has not changed since the last visit.
         """
-        logger.info(f"[{self.name}] Extracting HTML from URL: {url}")
-        response = self._fetch_page(url)
-        if response:
-            return response.text
-        return ""
+        content, encoding, _ = self._download(url)
+        return content.decode(encoding, errors='replace') if content else ""
 
     def validate(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -70,7 +97,7 @@ class HTMLScraper(BaseScraper):
         # return [item for item in data if item.get('title')]
         return data
 
-    def run(self, url: str) -> List[Dict[str, Any]]:
+    def run(self, url: str, prefetched: Optional[FetchedPage] = None) -> List[Dict[str, Any]]:
         """
         Executes the complete scraping process for a given URL.
 
@@ -78,23 +105,92 @@ class HTMLScraper(BaseScraper):
 
         Args:
             url: The URL of the static HTML page to scrape.
+            prefetched: The page as already downloaded by the crawler. Its body is
+                        used when available; otherwise the page is fetched here.
 
         Returns:
             A list of dictionaries, where each dictionary is a validated and
             processed scraped item. Returns an empty list if the process fails.
         """
+        items, _ = self.scrape(url, prefetched)
+        return items
+
+    def scrape(self, url: str, prefetched: Optional[FetchedPage] = None) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Scrapes a page like run(), and also tells why no items came back.
+
+        Returns:
+            A tuple of (items, outcome). The outcome is PARSED when the page was
+            parsed, so the items are all it holds; NOT_MODIFIED when it has not
+            changed since the last visit; FAILED when there was no page to parse.
+        """
         logger.info(f"[{self.name}] Running scrape process for URL: {url}")
-        raw_content = self.extract(url)
+        if prefetched is not None and prefetched.skip_reason:
+            logger.info(f"[{self.name}] Not scraping {url}: {prefetched.skip_reason}.")
+            return [], FAILED
+        if prefetched is not None and prefetched.ok:
+            raw_content, encoding, outcome = self._use_prefetched(prefetched)
+        else:
+            raw_content, encoding, outcome = self._download(url)
+        if outcome is not None:
+            return [], outcome
         if not raw_content:
-            return []
+            return [], FAILED
 
         try:
-            parsed_data = parser_manager.parse(raw_content, self.config)
+            parsed_data = parser_manager.parse(raw_content, self.config, encoding=encoding)
             validated_data = self.validate(parsed_data)
-            return validated_data
+            return validated_data, PARSED
         except Exception as e:
             logger.error(f"[{self.name}] Failed to parse or validate data from {url}: {e}")
-            return []
+            return [], FAILED
+
+    def _download(self, url: str) -> Tuple[bytes, Optional[str], Optional[str]]:
+        """
+        Downloads a page.
+
+        Returns:
+            A tuple of (raw body, its encoding, outcome). The outcome is None when
+            the body is there to parse; otherwise the body is empty and the
+            outcome is FAILED or NOT_MODIFIED.
+        """
+        logger.info(f"[{self.name}] Extracting HTML from URL: {url}")
+        response = self._fetch_page(url)
+        if response is None:
+            return b"", None, FAILED
+        if response.status_code == 304:
+            self.revisit_store.record_not_modified()
+            logger.info(f"[{self.name}] {url} not modified since last visit. Skipping parse and store.")
+            return b"", None, NOT_MODIFIED
+        if self.revisit_store:
+            self.revisit_store.save(self.name, url, response.headers)
+        encoding, source = resolve_encoding(response.content, response.headers)
+        logger.debug(f"[{self.name}] Decoding {url} as {encoding} (from {source}).")
+        return response.content, encoding, None
+
+    def _use_prefetched(self, page: FetchedPage) -> Tuple[Union[str, bytes], Optional[str], Optional[str]]:
+        """
+        Returns the body of a page downloaded by the crawler, its encoding and, if
+        it is not to be parsed, the outcome NOT_MODIFIED (see _download).
+
+        The crawler's request was not conditional on this scraper's validators,
+        so a page whose ETag or Last-Modified equals the stored one is treated
+        as not modified, as a 304 would have been.
+        """
+        logger.info(f"[{self.name}] Using crawler-fetched content for {page.url}")
+        if self.revisit_store:
+            stored = self.revisit_store.conditional_headers(self.name, page.url)
+            etag = page.headers.get('ETag')
+            last_modified = page.headers.get('Last-Modified')
+            if (etag and stored.get('If-None-Match') == etag) or \
+                    (not etag and last_modified and stored.get('If-Modified-Since') == last_modified):
+                self.revisit_store.record_not_modified()
+                logger.info(f"[{self.name}] {page.url} not modified since last visit. Skipping parse and store.")
+                return "", None, NOT_MODIFIED
+            self.revisit_store.save(self.name, page.url, page.headers)
+        if page.content is not None:
+            return page.content, page.encoding, None
+        return page.text, None, None
 
     def _fetch_page(self, url: str, retries: int = 3, backoff_factor: float = 0.5) -> Optional[requests.Response]:
         """
@@ -106,14 +202,19 @@ class HTMLScraper(BaseScraper):
             backoff_factor: Factor for exponential backoff between retries.
 
         Returns:
-            A requests.Response object if successful, otherwise None.
+            A requests.Response object if successful (including a 304 answer to a
+            conditional request), otherwise None. Also None, without retries, if
+            the page is not HTML or exceeds the size cap.
         """
+        headers = self.revisit_store.conditional_headers(self.name, url) if self.revisit_store else {}
         for attempt in range(retries):
             try:
-                response = self.session.get(url, timeout=30)
+                response = self.fetcher.get(url, timeout=30, headers=headers)
                 response.raise_for_status()
                 logger.info(f"[{self.name}] Successfully fetched {url}")
                 return response
+            except ContentSkipped:
+                return None
             except requests.exceptions.RequestException as e:
                 logger.warning(f"[{self.name}] Attempt {attempt + 1} failed for {url}: {e}")
                 if attempt < retries - 1:
@@ -1,11 +1,20 @@
+import atexit
 import logging
+import queue
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 from urllib.parse import urljoin
 
-from playwright.sync_api import sync_playwright, Page, Browser, Playwright
+import requests
+from playwright.sync_api import BrowserContext, Page
 
+from scrapers.core.api_capture import ApiEndpoint, ResponseCapture, get_endpoint_store
 from scrapers.core.base_scraper import BaseScraper
+from scrapers.core.browser_pool import close_browser_pool, get_browser_pool
+from scrapers.core.page_waiter import PageWaiter
+from scrapers.core.resource_blocker import PageResources, get_resource_blocker
 from parsers.parser_manager import ParserManager
 
 logger = logging.getLogger(__name__)
@@ -13,6 +22,172 @@ logger = logging.getLogger(__name__)
 # Instantiate ParserManager once
 parser_manager = ParserManager()
 
+# Selects the children of <body>, i.e. the item containers in a document built by _collect_new_containers()
+_FRAGMENT_CONTAINERS = {'css': 'body > *', 'xpath': '/html/body/*'}
+
+# Defines containers(selector, isXPath), the item container elements in document order
+_CONTAINERS_JS = """
+const containers = (selector, isXPath) => {
+    let nodes = [];
+    if (isXPath) {
+        const result = document.evaluate(selector, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < result.snapshotLength; i++) nodes.push(result.snapshotItem(i));
+    } else {
+        nodes = Array.from(document.querySelectorAll(selector));
+    }
+    return nodes.filter(node => node.nodeType === 1);
+};
+const signature = nodes => nodes.length + ':' + (nodes.length ? nodes[0].textContent.trim().slice(0, 200) : '');
+"""
+
+# Returns the outer HTML of the containers not returned before and marks them as returned
+_COLLECT_NEW_CONTAINERS_JS = """
+([selector, isXPath]) => {""" + _CONTAINERS_JS + """
+    const fresh = containers(selector, isXPath).filter(node => !node.hasAttribute('data-idp-seen'));
+    const html = fresh.map(node => node.outerHTML);
+    fresh.forEach(node => node.setAttribute('data-idp-seen', ''));
+    return html;
+}
+"""
+
+# True once there are more than count containers, or with a null count, once one has not been collected yet
+_MORE_CONTAINERS_JS = """
+([selector, isXPath, count]) => {""" + _CONTAINERS_JS + """
+    const nodes = containers(selector, isXPath);
+    return count === null ? nodes.some(node => !node.hasAttribute('data-idp-seen')) : nodes.length > count;
+}
+"""
+
+_COUNT_CONTAINERS_JS = """
+([selector, isXPath]) => {""" + _CONTAINERS_JS + """
+    return containers(selector, isXPath).length;
+}
+"""
+
+# Sums up the containers on the page, to tell when a click has replaced them
+_CONTAINERS_SIGNATURE_JS = """
+([selector, isXPath]) => {""" + _CONTAINERS_JS + """
+    return signature(containers(selector, isXPath));
+}
+"""
+
+_CONTAINERS_CHANGED_JS = """
+([selector, isXPath, before]) => {""" + _CONTAINERS_JS + """
+    return signature(containers(selector, isXPath)) !== before;
+}
+"""
+
+DEFAULT_DETAIL_CONCURRENCY = 4
+DETAIL_WORKER_THREADS = 8
+
+class _DetailWorkers:
+    """
+    A fixed set of threads that scrape detail pages, each with its own BrowserPool.
+
+    Playwright objects may only be used from the thread that created them, so
+    on shutdown every thread closes its own pool before it exits. The threads
+    are daemons: non-daemon threads (such as ThreadPoolExecutor's) are joined
+    before atexit handlers run, when they could no longer be asked to close
+    their browsers.
+    """
+
+    def __init__(self, size: int):
+        self._jobs: queue.Queue = queue.Queue()
+        self._threads = [threading.Thread(target=self._work, name=f'spa-detail-{i}', daemon=True)
+                         for i in range(size)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Runs fn(*args) on a worker thread and returns its future."""
+        future: Future = Future()
+        self._jobs.put((future, fn, args))
+        return future
+
+    def shutdown(self):
+        """Lets the queued jobs finish, then stops the threads, each closing its browsers."""
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _work(self):
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                future, fn, args = job
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            close_browser_pool()
+
+
+_detail_executor_instance: Optional[_DetailWorkers] = None
+_detail_executor_lock = threading.Lock()
+
+def _detail_executor() -> _DetailWorkers:
+    """
+    Returns the process-wide threads that scrape detail pages.
+
+    The threads live as long as the process, so the browsers in their
+    thread-local BrowserPools are reused from one listing to the next, and
+    are closed at exit.
+    """
+    global _detail_executor_instance
+    with _detail_executor_lock:
+        if _detail_executor_instance is None:
+            _detail_executor_instance = _DetailWorkers(DETAIL_WORKER_THREADS)
+            atexit.register(_detail_executor_instance.shutdown)
+        return _detail_executor_instance
+
+
+class _RateLimiter:
+    """
+    Spaces out request starts across threads by a minimum interval.
+
+    Each caller reserves the next free slot and sleeps until it, so N
+    workers together never exceed one request per interval, while the pages
+    themselves load concurrently.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_rate_limiters: Dict[str, _RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+def _site_rate_limiter(site: str, interval: float) -> _RateLimiter:
+    """
+    Returns the process-wide detail-page rate limiter of a site, creating it on first use.
+
+    Scrapers are instantiated per URL, so sharing the limiter per site keeps
+    listings of the same site scraped at the same time within one delay.
+    The latest interval configured for the site applies.
+    """
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(site)
+        if limiter is None:
+            limiter = _rate_limiters[site] = _RateLimiter(interval)
+        limiter.interval = interval
+        return limiter
+
 
 class SPAScraper(BaseScraper):
     """
@@ -21,6 +196,28 @@ class SPAScraper(BaseScraper):
     This scraper uses Playwright to control a headless browser, allowing it to
     render JavaScript and interact with the page before extracting the HTML.
     It then delegates parsing to the ParserManager.
+
+    Browsers come from the thread's BrowserPool and are kept running between
+    URLs; each run gets a fresh context configured from the site's
+    'browser_config' block (viewport, user_agent, ...). The first site
+    config's 'browser_pool' block configures the pool, e.g.
+    {'max_pages_per_browser': 200}.
+
+    Requests the parsers do not need (images, media, fonts, analytics) are
+    blocked; see ResourceBlocker for browser_config 'block_resources'.
+
+    Scrolling and pagination wait for the content to arrive rather than for
+    fixed delays, which only bound the waits; see PageWaiter for
+    browser_config 'wait'. A pagination 'wait_for' selector can name what
+    marks a loaded page.
+
+    Sites that load their listings from a JSON API can set 'api_capture'
+    instead of scraping the rendered DOM: the API responses whose URL
+    matches its 'url_pattern' are recorded as the page loads (and as it is
+    paginated) and parsed with its own 'parser_type' (default 'json') and
+    'parser_config'. The endpoints seen are remembered per page URL in the
+    'endpoint_cache' store; with 'replay' set, a page whose endpoints are
+    known is scraped by requesting them over plain HTTP, without a browser.
     """
 
     def __init__(self, config: Dict[str, Any]):
@@ -31,6 +228,10 @@ class SPAScraper(BaseScraper):
             config: A dictionary containing scraper configuration.
         """
         super().__init__(config)
+        self.resource_blocker = get_resource_blocker(
+            self.name, config.get('browser_config', {}).get('block_resources'))
+        self._page_resources: Dict[Page, PageResources] = {}
+        self._page_waiters: Dict[Page, PageWaiter] = {}
 
     def extract(self, page: Page, url: str, parser_config: Dict[str, Any]) -> str:
         """
@@ -80,12 +281,14 @@ class SPAScraper(BaseScraper):
             processed scraped item. Returns an empty list if the process fails.
         """
         logger.info(f"[{self.name}] Running scrape process for URL: {url}")
+        if self.config.get('api_capture'):
+            return self.validate(self._dedupe_items(self._run_api_capture(url)))
         all_items = []
         try:
-            with sync_playwright() as p:
-                browser = self._launch_browser(p)
-                page = browser.new_page()
-                
+            pool = get_browser_pool(**self.config.get('browser_pool', {}))
+            with pool.context(self.config.get('browser_config')) as context:
+                page = self._new_page(context)
+
                 # Scrape the first page
                 raw_content = self.extract(page, url, self.config)
                 if raw_content:
@@ -94,24 +297,160 @@ class SPAScraper(BaseScraper):
 
                 # Handle pagination
                 all_items.extend(self._handle_pagination(page, url))
+                all_items = self._dedupe_items(all_items)
+                waits = self._waiter(page).finish_page()
+                if waits["waits"]:
+                    logger.info(f"[{self.name}] Waited {waits['seconds']:.2f}s for content on {url} "
+                                f"({waits['met']}/{waits['waits']} waits ended before their limit).")
 
                 # Handle detail page scraping
                 if self.config.get('detail_parser'):
                     all_items = self._scrape_detail_pages(page, all_items)
-
-                browser.close()
         except Exception as e:
             logger.error(f"[{self.name}] A critical error occurred during Playwright operation: {e}", exc_info=True)
+        if self.resource_blocker.totals["pages"]:
+            logger.info(f"[{self.name}] Resource blocking so far: {self.resource_blocker.totals}")
 
         validated_data = self.validate(all_items)
         return validated_data
 
+    def _run_api_capture(self, url: str) -> List[Dict[str, Any]]:
+        """
+        Scrapes a page from the API responses it loads rather than from its DOM.
+
+        Replays the page's known endpoints over HTTP if 'replay' is set, and
+        falls back to loading the page in the browser when none are known or
+        replaying fails.
+
+        Returns:
+            The items parsed from the API responses.
+        """
+        capture_config = self.config['api_capture']
+        store = get_endpoint_store(capture_config.get('endpoint_cache', ':memory:'))
+        if capture_config.get('replay', False):
+            endpoints = store.load(self.name, url)
+            if endpoints:
+                items = self._replay_endpoints(endpoints)
+                if items is not None:
+                    return items
+                store.forget(self.name, url)
+
+        items: List[Dict[str, Any]] = []
+        endpoints: List[ApiEndpoint] = []
+        try:
+            pool = get_browser_pool(**self.config.get('browser_pool', {}))
+            with pool.context(self.config.get('browser_config')) as context:
+                page = self._new_page(context)
+                capture = ResponseCapture(page, capture_config['url_pattern'])
+                resources = self._page_resources.get(page)
+                if resources:
+                    resources.start_page(url)
+                logger.info(f"[{self.name}] Loading {url} to capture API responses.")
+                # The DOM does not need to finish rendering, only to make its API calls
+                page.goto(url, wait_until='commit', timeout=60000)
+                if not capture.wait_for(capture_config.get('responses', 1), capture_config.get('timeout', 15) * 1000):
+                    logger.warning(f"[{self.name}] Fewer API responses matching "
+                                   f"'{capture_config['url_pattern']}' than expected on {url}.")
+                items.extend(self._parse_captured(capture.take(), endpoints))
+                items.extend(self._handle_capture_pagination(page, capture, endpoints))
+                if resources:
+                    resources.finish_page()
+
+                if self.config.get('detail_parser'):
+                    items = self._scrape_detail_pages(page, items)
+        except Exception as e:
+            logger.error(f"[{self.name}] A critical error occurred during API capture: {e}", exc_info=True)
+        if endpoints:
+            store.save(self.name, url, endpoints)
+        return items
+
+    def _api_parse_config(self) -> Dict[str, Any]:
+        """Returns the ParserManager config for the captured API responses."""
+        capture_config = self.config['api_capture']
+        return {'parser_type': capture_config.get('parser_type', 'json'),
+                'parser_config': capture_config.get('parser_config', {})}
+
+    def _parse_captured(self, captured: List[Tuple[ApiEndpoint, bytes]], endpoints: List[ApiEndpoint]) -> List[Dict[str, Any]]:
+        """Parses captured API responses and adds their endpoints to endpoints."""
+        parse_config = self._api_parse_config()
+        items = []
+        for endpoint, body in captured:
+            logger.info(f"[{self.name}] Parsing captured API response from {endpoint.url} ({len(body)} bytes).")
+            endpoints.append(endpoint)
+            items.extend(parser_manager.parse(body, parse_config))
+        return items
+
+    def _handle_capture_pagination(self, page: Page, capture: ResponseCapture,
+                                   endpoints: List[ApiEndpoint]) -> List[Dict[str, Any]]:
+        """
+        Paginates a page in API capture mode, parsing the API responses each step loads.
+
+        Stops once a step loads no matching response within the pagination delay.
+        """
+        pagination_config = self.config.get('pagination', {})
+        pagination_type = pagination_config.get('type')
+        if not pagination_type:
+            return []
+        max_pages = pagination_config.get('max_pages', 5)
+        delay = pagination_config.get('delay', 2)
+        paginated_items = []
+
+        for page_num in range(2, max_pages + 1):
+            try:
+                if pagination_type == 'click':
+                    next_button = page.query_selector(pagination_config.get('next_button_selector', ''))
+                    if not next_button or not next_button.is_enabled():
+                        logger.info(f"[{self.name}] No more pages to scrape.")
+                        break
+                    next_button.click()
+                elif pagination_type == 'scroll':
+                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                elif pagination_type == 'url_pattern':
+                    page.goto(pagination_config['url_pattern'].format(page_num=page_num), wait_until='commit', timeout=60000)
+                else:
+                    logger.warning(f"[{self.name}] Unknown pagination type: {pagination_type}")
+                    break
+                if not capture.wait_for(1, delay * 1000):
+                    logger.info(f"[{self.name}] No API response for page {page_num}; stopping.")
+                    break
+                paginated_items.extend(self._parse_captured(capture.take(), endpoints))
+            except Exception as e:
+                logger.error(f"[{self.name}] Error during API capture pagination: {e}", exc_info=True)
+                break
+
+        return paginated_items
+
+    def _replay_endpoints(self, endpoints: List[ApiEndpoint]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Requests a page's recorded API endpoints over plain HTTP and parses the responses.
+
+        Returns:
+            The items parsed, or None if any request failed.
+        """
+        parse_config = self._api_parse_config()
+        items = []
+        with requests.Session() as session:
+            for endpoint in endpoints:
+                logger.info(f"[{self.name}] Replaying API request {endpoint.method} {endpoint.url}")
+                try:
+                    response = session.request(endpoint.method, endpoint.url, headers=endpoint.headers,
+                                               data=endpoint.post_data, timeout=30)
+                    response.raise_for_status()
+                except requests.exceptions.RequestException as e:
+                    logger.warning(f"[{self.name}] Replaying {endpoint.url} failed ({e}); loading the page instead.")
+                    return None
+                items.extend(parser_manager.parse(response.content, parse_config))
+        return items
+
     def _scrape_detail_pages(self, page: Page, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Scrapes detail pages for each item in the listing.
 
         This method is flexible and can handle any URL field name specified in the config.
-        It supports rate limiting, error handling, and progress tracking.
+        Up to detail_parser.concurrency pages (default 4) are scraped at once, each
+        worker in its own browser context, while the site's rate limiter, shared by
+        all scrapes of the site, keeps requests at least rate_limit.delay seconds apart. With a
+        concurrency of 1 the listing page's tab visits them one after another.
 
         Args:
             page: The Playwright page object
@@ -136,17 +475,15 @@ class SPAScraper(BaseScraper):
         detail_rate_limit = detail_parser_config.get('rate_limit', {})
         delay_between_requests = detail_rate_limit.get('delay', 2)
         max_detail_pages = detail_parser_config.get('max_pages', len(items))
+        concurrency = max(1, int(detail_parser_config.get('concurrency', DEFAULT_DETAIL_CONCURRENCY)))
 
-        updated_items = []
-        success_count = 0
-        error_count = 0
-
-        for idx, item in enumerate(items[:max_detail_pages], 1):
+        updated_items = items[:max_detail_pages]
+        jobs: List[Tuple[int, str]] = []
+        for idx, item in enumerate(updated_items, 1):
             detail_url = item.get(url_field)
 
             if not detail_url:
                 logger.debug(f"[{self.name}] Item {idx}/{len(items)} has no URL in field '{url_field}', skipping")
-                updated_items.append(item)
                 continue
 
             # Ensure absolute URL
@@ -156,43 +493,76 @@ class SPAScraper(BaseScraper):
                     detail_url = urljoin(base_url, detail_url)
                 else:
                     logger.warning(f"[{self.name}] Relative URL found but no base_url configured: {detail_url}")
-                    updated_items.append(item)
                     continue
+            jobs.append((idx, detail_url))
+
+        # Detail data by 1-based item index, so results merge back into the right item
+        results: Dict[int, Dict[str, Any]] = {}
+        rate_limiter = _site_rate_limiter(self.name, delay_between_requests)
+        if concurrency == 1 or len(jobs) <= 1:
+            self._detail_worker(page, iter(jobs), threading.Lock(), results, rate_limiter,
+                                detail_parser_config, len(updated_items))
+        else:
+            job_iter, job_lock = iter(jobs), threading.Lock()
+            workers = [
+                _detail_executor().submit(self._run_detail_worker, job_iter, job_lock, results, rate_limiter,
+                                          detail_parser_config, len(updated_items))
+                for _ in range(min(concurrency, len(jobs)))
+            ]
+            for worker in workers:
+                worker.result()
 
-            try:
-                logger.info(f"[{self.name}] Scraping detail page {idx}/{min(max_detail_pages, len(items))}: {detail_url}")
-
-                # Scrape detail page with error handling
-                detail_data = self._scrape_detail_page(page, detail_url, detail_parser_config)
-
-                if detail_data:
-                    # Merge detail data with item data
-                    # Use prefix for detail fields if configured to avoid conflicts
-                    prefix = detail_parser_config.get('field_prefix', '')
-                    if prefix:
-                        detail_data = {f"{prefix}{k}": v for k, v in detail_data.items()}
-
-                    item.update(detail_data)
-                    success_count += 1
-                    logger.debug(f"[{self.name}] Successfully scraped {len(detail_data)} fields from detail page")
-                else:
-                    logger.warning(f"[{self.name}] No data extracted from detail page: {detail_url}")
-                    error_count += 1
-
-                updated_items.append(item)
-
-                # Rate limiting between detail page requests
-                if idx < min(max_detail_pages, len(items)):
-                    time.sleep(delay_between_requests)
-
-            except Exception as e:
-                logger.error(f"[{self.name}] Error scraping detail page {detail_url}: {e}", exc_info=True)
+        success_count = 0
+        error_count = 0
+        # Use prefix for detail fields if configured to avoid conflicts
+        prefix = detail_parser_config.get('field_prefix', '')
+        for idx, _ in jobs:
+            detail_data = results.get(idx)
+            if detail_data:
+                if prefix:
+                    detail_data = {f"{prefix}{k}": v for k, v in detail_data.items()}
+                updated_items[idx - 1].update(detail_data)
+                success_count += 1
+            else:
                 error_count += 1
-                updated_items.append(item)  # Keep original item even if detail scraping fails
 
         logger.info(f"[{self.name}] Detail page scraping completed: {success_count} successful, {error_count} errors")
         return updated_items
 
+    def _run_detail_worker(self, jobs: Iterator[Tuple[int, str]], job_lock: threading.Lock,
+                           results: Dict[int, Dict[str, Any]], rate_limiter: '_RateLimiter',
+                           detail_parser_config: Dict[str, Any], total: int):
+        """
+        Scrapes detail pages in a worker thread, in a context of the thread's own browser pool.
+        """
+        pool = get_browser_pool(**self.config.get('browser_pool', {}))
+        with pool.context(self.config.get('browser_config')) as context:
+            self._detail_worker(self._new_page(context), jobs, job_lock, results, rate_limiter,
+                                detail_parser_config, total)
+
+    def _detail_worker(self, page: Page, jobs: Iterator[Tuple[int, str]], job_lock: threading.Lock,
+                       results: Dict[int, Dict[str, Any]], rate_limiter: '_RateLimiter',
+                       detail_parser_config: Dict[str, Any], total: int):
+        """
+        Takes (item index, detail URL) jobs until none are left and stores each page's data by index.
+        """
+        while True:
+            with job_lock:
+                job = next(jobs, None)
+            if job is None:
+                return
+            idx, detail_url = job
+            rate_limiter.wait()
+            logger.info(f"[{self.name}] Scraping detail page {idx}/{total}: {detail_url}")
+
+            # Scrape detail page with error handling
+            detail_data = self._scrape_detail_page(page, detail_url, detail_parser_config)
+            if detail_data:
+                results[idx] = detail_data
+                logger.debug(f"[{self.name}] Successfully scraped {len(detail_data)} fields from detail page")
+            else:
+                logger.warning(f"[{self.name}] No data extracted from detail page: {detail_url}")
+
     def _detect_url_field(self, items: List[Dict[str, Any]]) -> Optional[str]:
         """
         Automatically detect the URL field name from items.
@@ -305,6 +675,7 @@ class SPAScraper(BaseScraper):
 
         max_pages = pagination_config.get('max_pages', 5)
         delay = pagination_config.get('delay', 2)
+        containers = self._containers_arg()
         paginated_items = []
 
         for page_num in range(1, max_pages):
@@ -316,8 +687,12 @@ class SPAScraper(BaseScraper):
                     break
 
                 logger.info(f"[{self.name}] Clicking next page button.")
+                before = page.evaluate(_CONTAINERS_SIGNATURE_JS, containers) if containers else None
                 next_button.click()
-                page.wait_for_timeout(delay * 1000)
+                if containers:
+                    self._wait_for_page_update(page, delay, _CONTAINERS_CHANGED_JS, containers + [before])
+                else:
+                    self._wait_for_page_update(page, delay)
 
                 raw_content = page.content()
                 if raw_content:
@@ -331,25 +706,126 @@ class SPAScraper(BaseScraper):
         return paginated_items
 
     def _handle_scroll_pagination(self, page: Page) -> List[Dict[str, Any]]:
-        """Handles scroll-based pagination (infinite scroll)."""
+        """
+        Handles scroll-based pagination (infinite scroll).
+
+        By default only the item containers added since the previous scroll
+        are parsed: containers are marked in the DOM once read, and only the
+        unmarked ones are sent back from the browser. Parse time and memory
+        therefore grow with the number of items loaded rather than with
+        scrolls times items, and items are not returned again on every pass.
+        Scrolling stops early once a scroll adds nothing. Set pagination
+        'incremental' to false to re-parse the whole page after each scroll.
+        """
         pagination_config = self.config.get('pagination', {})
         max_scrolls = pagination_config.get('max_pages', 5) # Re-using max_pages as max_scrolls
         delay = pagination_config.get('delay', 2)
+        container = self.config.get('parser_config', {}).get('container')
+        incremental = pagination_config.get('incremental', True) and container and \
+            self.config.get('parser_type') in _FRAGMENT_CONTAINERS
+        containers = self._containers_arg()
         paginated_items = []
 
+        if incremental:
+            # The items on screen were parsed with the first page
+            self._collect_new_containers(page, container)
+
         for i in range(max_scrolls):
             logger.info(f"[{self.name}] Scrolling to load more content (Scroll {i + 1}/{max_scrolls})")
+            count = None if incremental or not containers else \
+                page.evaluate(_COUNT_CONTAINERS_JS, containers)
             self._scroll_page(page)
-            page.wait_for_timeout(delay * 1000)
+            if containers:
+                self._wait_for_page_update(page, delay, _MORE_CONTAINERS_JS, containers + [count])
+            else:
+                self._wait_for_page_update(page, delay)
+            if incremental:
+                fragments = self._collect_new_containers(page, container)
+                if not fragments:
+                    logger.info(f"[{self.name}] No new items after scroll {i + 1}; stopping.")
+                    break
+                logger.info(f"[{self.name}] Parsing {len(fragments)} newly loaded items.")
+                paginated_items.extend(parser_manager.parse(
+                    f"<html><body>{''.join(fragments)}</body></html>", self._fragment_config()))
+                continue
             raw_content = page.content()
             if raw_content:
-                # We are re-parsing the whole page content, which might be inefficient.
-                # A more advanced implementation could parse only the new content.
                 parsed_data = parser_manager.parse(raw_content, self.config)
                 paginated_items.extend(parsed_data)
         
         return paginated_items
 
+    def _containers_arg(self) -> Optional[List[Any]]:
+        """Returns the [selector, isXPath] argument of the container JS snippets, or None if they do not apply."""
+        container = self.config.get('parser_config', {}).get('container')
+        if not container or self.config.get('parser_type') not in _FRAGMENT_CONTAINERS:
+            return None
+        return [container, self.config.get('parser_type') == 'xpath']
+
+    def _wait_for_page_update(self, page: Page, delay: float, condition: Optional[str] = None, arg: Any = None) -> bool:
+        """
+        Waits up to delay seconds for pagination to load new content.
+
+        The wait ends early once the pagination 'wait_for' selector matches,
+        or else once the condition holds (or, without one, once the network
+        has gone quiet), followed by a short quiet window.
+
+        Returns:
+            Whether the content arrived before the delay was up.
+        """
+        waiter = self._waiter(page)
+        wait_for = self.config.get('pagination', {}).get('wait_for')
+        started = time.monotonic()
+        if wait_for:
+            arrived = waiter.for_selector(wait_for, delay * 1000)
+        elif condition:
+            arrived = waiter.until(condition, arg, delay * 1000)
+        else:
+            arrived = waiter.for_network_idle(delay * 1000)
+        logger.info(f"[{self.name}] Next page {'ready' if arrived else 'not updated'} "
+                    f"after {time.monotonic() - started:.2f}s (limit {delay}s).")
+        return arrived
+
+    def _collect_new_containers(self, page: Page, container: str) -> List[str]:
+        """
+        Returns the outer HTML of the item containers not collected before, and marks them as collected.
+        """
+        return page.evaluate(_COLLECT_NEW_CONTAINERS_JS, [container, self.config.get('parser_type') == 'xpath'])
+
+    def _fragment_config(self) -> Dict[str, Any]:
+        """
+        Returns the parser config for a document of item containers collected by _collect_new_containers().
+
+        The containers are the children of <body> there, which the original
+        container selector may not match outside their place in the page.
+        """
+        parser_config = dict(self.config.get('parser_config', {}))
+        parser_config['container'] = _FRAGMENT_CONTAINERS[self.config['parser_type']]
+        return {**self.config, 'parser_config': parser_config}
+
+    def _dedupe_items(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drops items whose pagination 'dedupe_key' field (or list of fields) repeats an earlier item.
+
+        Items without a value for the key are kept.
+        """
+        dedupe_key = self.config.get('pagination', {}).get('dedupe_key')
+        if not dedupe_key:
+            return items
+        fields = [dedupe_key] if isinstance(dedupe_key, str) else list(dedupe_key)
+        seen = set()
+        unique_items = []
+        for item in items:
+            key = tuple(item.get(field) for field in fields)
+            if all(value is None for value in key):
+                unique_items.append(item)
+            elif key not in seen:
+                seen.add(key)
+                unique_items.append(item)
+        if len(unique_items) < len(items):
+            logger.info(f"[{self.name}] Dropped {len(items) - len(unique_items)} duplicate items by {fields}.")
+        return unique_items
+
     def _handle_url_pattern_pagination(self, page: Page, initial_url: str) -> List[Dict[str, Any]]:
         """Handles URL pattern-based pagination."""
         pagination_config = self.config.get('pagination', {})
@@ -374,18 +850,31 @@ class SPAScraper(BaseScraper):
 
         return paginated_items
 
-    def _launch_browser(self, p: Playwright) -> Browser:
-        """Launches a Playwright browser instance."""
-        logger.info(f"[{self.name}] Launching headless browser.")
-        return p.chromium.launch(headless=True)
+    def _new_page(self, context: BrowserContext) -> Page:
+        """Opens a page in the context with the site's resource blocking applied."""
+        page = context.new_page()
+        self._page_resources[page] = self.resource_blocker.attach(page)
+        self._waiter(page)
+        return page
+
+    def _waiter(self, page: Page) -> PageWaiter:
+        """Returns the page's PageWaiter, creating it on first use."""
+        if page not in self._page_waiters:
+            self._page_waiters[page] = PageWaiter(page, self.config.get('browser_config', {}).get('wait'))
+        return self._page_waiters[page]
 
     def _navigate_and_get_html(self, page: Page, url: str, parser_config: Dict[str, Any], retries: int = 3, backoff_factor: float = 0.5) -> str:
         """
         Navigates to the URL and returns the page's HTML content with retry logic.
         """
+        resources = self._page_resources.get(page)
+        waiter = self._waiter(page)
         for attempt in range(retries):
             try:
                 logger.info(f"[{self.name}] Navigating to {url} (Attempt {attempt + 1}/{retries})")
+                if resources:
+                    resources.start_page(url)
+                waiter.start_page()
                 page.goto(url, wait_until='domcontentloaded', timeout=60000)
 
                 wait_selector = parser_config.get('wait_for')
@@ -398,7 +887,13 @@ class SPAScraper(BaseScraper):
                     self._scroll_page(page)
 
                 logger.info(f"[{self.name}] Retrieving HTML content.")
-                return page.content()
+                html_content = page.content()
+                if resources:
+                    resources.finish_page()
+                waits = waiter.finish_page()
+                if waits["waits"]:
+                    logger.info(f"[{self.name}] Waited {waits['seconds']:.2f}s for content on {url}.")
+                return html_content
             except Exception as e:
                 logger.warning(f"[{self.name}] Navigation or content retrieval failed for {url}: {e}")
                 if attempt < retries - 1:
@@ -411,14 +906,17 @@ class SPAScraper(BaseScraper):
         return ""
 
     def _scroll_page(self, page: Page):
-        """Scrolls the page to the bottom to trigger lazy-loading."""
+        """
+        Scrolls the page to the bottom to trigger lazy-loading.
+
+        After each scroll, waits up to 2 seconds for the page to grow, and stops once it does not.
+        """
         logger.info(f"[{self.name}] Scrolling to bottom of the page.")
+        waiter = self._waiter(page)
         last_height = page.evaluate("document.body.scrollHeight")
         for _ in range(5): # Limit scrolls to prevent infinite loops
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(2000)
-            new_height = page.evaluate("document.body.scrollHeight")
-            if new_height == last_height:
+            if not waiter.until("height => document.body.scrollHeight > height", last_height, 2000):
                 break
-            last_height = new_height
+            last_height = page.evaluate("document.body.scrollHeight")
         logger.info(f"[{self.name}] Finished scrolling.")
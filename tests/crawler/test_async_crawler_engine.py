@@ -0,0 +1,71 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from crawler.async_crawler_engine import AsyncCrawlerEngine
+
+PAGES = 8
+
+
+def _app(stats):
+    async def page(request):
+        n = int(request.match_info['n'])
+        stats['requests'].append(n)
+        if stats['throttled'].get(n):
+            stats['throttled'][n] -= 1
+            return web.Response(status=429, headers={'Retry-After': '0'})
+        stats['in_flight'] += 1
+        stats['max_in_flight'] = max(stats['max_in_flight'], stats['in_flight'])
+        await asyncio.sleep(0.05)
+        stats['in_flight'] -= 1
+        links = ''.join(f'<a href="/p/{i}">{i}</a>' for i in range(PAGES) if i != n)
+        return web.Response(text=f'<html><body>{links}</body></html>', content_type='text/html')
+
+    async def robots(request):
+        return web.Response(status=404)
+
+    app = web.Application()
+    app.router.add_get('/p/{n}', page)
+    app.router.add_get('/robots.txt', robots)
+    return app
+
+
+def _crawl(config, throttled=None):
+    stats = {'in_flight': 0, 'max_in_flight': 0, 'requests': [], 'throttled': dict(throttled or {})}
+
+    async def run():
+        async with TestServer(_app(stats)) as server:
+            engine = AsyncCrawlerEngine([str(server.make_url('/p/0'))], {'rate_limit': 0, 'max_depth': 3, **config})
+            return [url async for url in engine.crawl()], engine
+
+    urls, engine = asyncio.run(run())
+    return urls, engine, stats
+
+
+def test_crawls_every_page_within_the_per_domain_cap():
+    urls, engine, stats = _crawl({'concurrency': 10, 'per_domain_concurrency': 3,
+                                  'adaptive_rate': {'stable_window': 1}})
+    assert sorted(url.rsplit('/', 1)[1] for url in urls) == [str(i) for i in range(PAGES)]
+    assert engine.pages_fetched == PAGES
+    assert 1 <= stats['max_in_flight'] <= 3
+
+
+def test_global_cap_holds_when_the_domain_cap_is_higher():
+    urls, engine, stats = _crawl({'concurrency': 2, 'per_domain_concurrency': 8,
+                                  'adaptive_rate': {'stable_window': 1}})
+    assert len(urls) == PAGES
+    assert stats['max_in_flight'] <= 2
+
+
+def test_max_pending_bounds_the_requests_in_flight():
+    urls, engine, stats = _crawl({'concurrency': 10, 'per_domain_concurrency': 4, 'max_pending': 1})
+    assert len(urls) == PAGES
+    assert stats['max_in_flight'] == 1
+
+
+def test_throttled_pages_are_fetched_again():
+    urls, engine, stats = _crawl({'adaptive_rate': {'max_delay': 0.05}}, throttled={3: 2})
+    assert sorted(url.rsplit('/', 1)[1] for url in urls) == [str(i) for i in range(PAGES)]
+    assert engine.pages_fetched == PAGES
+    assert stats['requests'].count(3) == 3
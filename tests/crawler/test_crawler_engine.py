@@ -0,0 +1,166 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from crawler.crawler_engine import CrawlerEngine
+from scrapers.templates.html_scraper import HTMLScraper
+
+# path -> (links, ETag) of the test site
+PAGES = {
+    '/': (['/a', '/b', '/manual.pdf'], '"root-v1"'),
+    '/a': ([], '"a-v1"'),
+    '/b': (['/a'], None),
+    '/manual.pdf': ([], None),
+}
+
+
+class _Site(BaseHTTPRequestHandler):
+    requests_seen = []
+    # path -> statuses answered before the page itself, e.g. [429]
+    throttled = {}
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.throttled.get(self.path):
+            self.send_response(self.throttled[self.path].pop(0))
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path not in PAGES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        links, etag = PAGES[self.path]
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if self.path.endswith('.pdf'):
+            body, content_type = b'%PDF-1.7', 'application/pdf'
+        else:
+            body = ''.join(f'<a href="{link}">{link}</a>' for link in links).encode()
+            content_type = 'text/html; charset=utf-8'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site():
+    _Site.requests_seen = []
+    _Site.throttled = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Site)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def crawl(site, **config):
+    engine = CrawlerEngine([site + '/'], {'rate_limit': 0, 'max_depth': 3, **config})
+    return engine, list(engine.crawl_pages())
+
+
+def test_revisit_reuses_the_links_of_unchanged_pages(site, tmp_path):
+    revisit_cache = str(tmp_path / "revisits.sqlite")
+    _, first = crawl(site, revisit_cache=revisit_cache)
+    assert {page.url for page in first} == {site + '/', site + '/a', site + '/b', site + '/manual.pdf'}
+
+    _Site.requests_seen = []
+    engine, second = crawl(site, revisit_cache=revisit_cache)
+
+    # The unchanged root answers 304, and its stored links still lead to /a and /b
+    assert {page.url for page in second} == {site + '/', site + '/a', site + '/b', site + '/manual.pdf'}
+    assert ('/', '"root-v1"') in _Site.requests_seen
+    statuses = {page.url: page.status_code for page in second}
+    assert statuses[site + '/'] == 304 and statuses[site + '/a'] == 304 and statuses[site + '/b'] == 200
+    assert all(page.content is None and not page.ok for page in second if page.status_code == 304)
+    assert engine.revisit_store.stats()['not_modified'] >= 2
+
+
+def test_crawl_pages_hand_over_the_downloaded_body(site):
+    _, pages = crawl(site)
+    by_path = {page.url[len(site):]: page for page in pages}
+
+    root = by_path['/']
+    assert root.ok and root.status_code == 200 and root.depth == 0
+    assert root.content.startswith(b'<a href="/a">') and root.encoding == 'utf-8'
+    assert by_path['/a'].depth == 1
+    pdf = by_path['/manual.pdf']
+    assert pdf.skip_reason and pdf.content is None and not pdf.ok
+    # Each URL was requested once, robots.txt aside
+    assert sorted(path for path, _ in _Site.requests_seen if path != '/robots.txt') == sorted(PAGES)
+
+
+class _NoNetwork:
+    headers = {}
+
+    def get(self, *args, **kwargs):
+        raise AssertionError("the scraper fetched a page the crawler had already downloaded")
+
+
+def test_scraper_parses_the_crawled_page_without_fetching_it(site):
+    _, pages = crawl(site)
+    root = next(page for page in pages if page.url == site + '/')
+    scraper = HTMLScraper({'name': 'test', 'parser_type': 'xpath',
+                           'parser_config': {'container': '//a', 'fields': {'href': './@href'}}},
+                          session=_NoNetwork())
+
+    items = scraper.run(root.url, prefetched=root)
+
+    assert [item['href'] for item in items] == ['/a', '/b', '/manual.pdf']
+
+
+def test_throttled_urls_are_fetched_again_after_the_backoff(site):
+    _Site.throttled = {'/a': [429, 503], '/b': [503] * 10}
+    _, pages = crawl(site, throttle_retries=2, adaptive_rate={'max_delay': 0.05})
+    by_path = {page.url[len(site):]: page for page in pages}
+
+    assert len(pages) == len(by_path)  # Retries are not yielded
+    assert by_path['/a'].ok
+    # /b is given up after two retries and reported as failed, with its status
+    assert by_path['/b'].status_code == 503 and by_path['/b'].failed
+    assert [path for path, _ in _Site.requests_seen].count('/b') == 3
+
+
+def test_database_frontier_retries_failed_urls_and_records_their_outcome(site, tmp_path):
+    from database.connection import CrawlState, Site
+
+    db = create_engine(f"sqlite:///{tmp_path / 'crawl.db'}")
+    Site.__table__.create(db)
+    CrawlState.__table__.create(db)
+    _Site.throttled = {'/a': [404], '/b': [500]}
+    engine = CrawlerEngine([site + '/'], {'rate_limit': 0, 'max_depth': 3, 'frontier': 'database',
+                                          'frontier_batch_size': 1, 'adaptive_rate': {'max_delay': 0.05}},
+                           db_session=sessionmaker(bind=db)())
+    pages = list(engine.crawl_pages())
+
+    with db.connect() as conn:
+        rows = {url[len(site):]: (status, retries)
+                for url, status, retries in conn.execute(text("SELECT url, status, retry_count FROM crawl_state"))}
+    # The 404 is final; the 500 is claimed back, fetched again and succeeds
+    assert rows['/a'] == ('failed', 1)
+    assert rows['/b'] == ('completed', 1)
+    assert rows['/'] == ('completed', 0)
+    requested = [path for path, _ in _Site.requests_seen]
+    assert requested.count('/a') == 1 and requested.count('/b') == 2
+    assert [page.status_code for page in pages if page.url == site + '/b'] == [500, 200]
+
+
+def test_robots_cache_block_may_set_its_own_user_agent(site):
+    engine, pages = crawl(site, robots_cache={'user_agent': 'RobotsReader/1.0'})
+    assert len(pages) == len(PAGES)
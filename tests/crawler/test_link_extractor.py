@@ -0,0 +1,59 @@
+import pytest
+
+from crawler.link_extractor import LinkExtractor
+
+PAGE = """<html><head><base href="/shop/"><script>var a = '<a href="/fake">';</script></head>
+<body>
+  <nav><a href="/home">Home</a></nav>
+  <a href="item/1">Item 1</a>
+  <a href="item/1#reviews">Item 1 reviews</a>
+  <a href="https://other.com/x?y=1#top">Elsewhere</a>
+  <a href="/ads" rel="sponsored nofollow">Ad</a>
+  <a name="anchor">No href</a>
+  <p>Great phones at low prices</p>
+  <footer>Copyright</footer>
+</body></html>"""
+
+
+def test_links_are_absolute_and_fragment_free():
+    links = LinkExtractor().extract(PAGE, "https://shop.com/catalog/")
+
+    assert links == {"https://shop.com/home", "https://shop.com/catalog/item/1",
+                     "https://other.com/x?y=1", "https://shop.com/ads"}
+
+
+def test_base_href_and_nofollow_options():
+    links = LinkExtractor(respect_base_href=True, skip_nofollow=True).extract(PAGE, "https://shop.com/catalog/")
+
+    assert links == {"https://shop.com/home", "https://shop.com/shop/item/1", "https://other.com/x?y=1"}
+
+
+def test_raw_bytes_are_decoded_with_the_given_encoding():
+    html = '<a href="/каталог">Каталог</a>'.encode('cp1251')
+
+    links = LinkExtractor().extract(html, "https://shop.ru/", encoding='windows-1251')
+
+    assert links == {"https://shop.ru/каталог"}
+
+
+def test_content_text_leaves_out_boilerplate():
+    links, text = LinkExtractor().extract_with_text(PAGE, "https://shop.com/")
+
+    assert "Great phones at low prices" in text
+    assert "Home" not in text and "Copyright" not in text and "var a" not in text
+    assert "https://shop.com/item/1" in links
+
+
+def test_broken_markup_still_yields_links():
+    assert LinkExtractor().extract(b'<div><a href="/a">a<a href=/b>b</div></p>', "https://shop.com/") == {
+        "https://shop.com/a", "https://shop.com/b"}
+
+
+def test_same_links_as_beautifulsoup():
+    bs4 = pytest.importorskip("bs4")
+    from urllib.parse import urljoin
+
+    soup = bs4.BeautifulSoup(PAGE, 'html.parser')
+    expected = {urljoin("https://shop.com/catalog/", a['href']).split('#')[0] for a in soup.find_all('a', href=True)}
+
+    assert LinkExtractor().extract(PAGE, "https://shop.com/catalog/") == expected
@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+from crawler.pattern_matcher import PatternMatcher
+
+PATTERNS = [
+    r'/catalog/',
+    r'/products/[a-z0-9-]+\.html$',
+    r'/product/\d+',
+    r'^https://shop\.example\.com/sale',
+    r'\.pdf$',
+    r'/pages?/',
+    r'/(cart|checkout)',
+    r'(?i)/LOGIN',
+    r'/(\w+)/\1/',
+    r'/(?P<lang>en|fr)/',
+    r'/catalogue/x*y',
+]
+
+URLS = [
+    'https://shop.example.com/catalog/shoes',
+    'https://shop.example.com/products/red-shoe.html',
+    'https://shop.example.com/products/red-shoe.html?x=1',
+    'https://other.com/product/12345',
+    'https://other.com/product/abc',
+    'https://shop.example.com/sale/summer',
+    'https://mirror.com/?u=https://shop.example.com/sale',
+    'https://example.com/file.pdf',
+    'https://example.com/page/2',
+    'https://example.com/pages/2',
+    'https://example.com/checkout/step1',
+    'https://example.com/Login',
+    'https://example.com/a/a/b',
+    'https://example.com/a/b/c',
+    'https://example.com/fr/accueil',
+    'https://example.com/catalogue/y',
+    'https://example.com/about',
+]
+
+
+@pytest.mark.parametrize("url", URLS)
+def test_matches_like_individual_patterns(url):
+    matcher = PatternMatcher(PATTERNS)
+    assert matcher.search(url) == any(re.search(p, url) for p in PATTERNS)
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_single_pattern(pattern):
+    matcher = PatternMatcher([pattern])
+    for url in URLS:
+        assert matcher.search(url) == bool(re.search(pattern, url))
+
+
+def test_empty_matcher_matches_nothing():
+    matcher = PatternMatcher([])
+    assert not matcher
+    assert not matcher.search('https://example.com/')
+
+
+def test_invalid_pattern_raises():
+    with pytest.raises(re.error):
+        PatternMatcher(['/products/[a-z'])
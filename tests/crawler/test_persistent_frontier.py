@@ -0,0 +1,118 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from crawler.persistent_frontier import PersistentFrontier
+from database.connection import CrawlState, Site, upgrade_tables
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'crawl.db'}")
+    Site.__table__.create(engine)
+    CrawlState.__table__.create(engine)
+    return engine
+
+
+@pytest.fixture
+def make_frontier(engine):
+    Session = sessionmaker(bind=engine)
+
+    def make(**kwargs):
+        return PersistentFrontier(Session(), default_delay=0, batch_size=1, **kwargs)
+    return make
+
+
+def statuses(engine):
+    with engine.connect() as conn:
+        return dict(conn.execute(text("SELECT url, status FROM crawl_state")).all())
+
+
+def test_bool_does_not_claim(engine, make_frontier):
+    frontier = make_frontier()
+    assert not frontier
+    frontier.push("https://a.com/1", 0)
+
+    assert frontier
+    assert statuses(engine) == {"https://a.com/1": "pending"}
+    assert frontier.pop() == ("https://a.com/1", 0)
+    assert statuses(engine) == {"https://a.com/1": "in_progress"}
+
+
+def test_close_returns_unfinished_claims_to_pending(engine, make_frontier):
+    frontier = make_frontier()
+    for i in range(3):
+        frontier.push(f"https://a.com/{i}", 1)
+    assert frontier.pop() and frontier.pop()
+    frontier.mark_done("https://a.com/0")
+    frontier.close()
+
+    assert statuses(engine) == {"https://a.com/0": "completed", "https://a.com/1": "pending",
+                                "https://a.com/2": "pending"}
+    resumed = make_frontier()
+    assert resumed.pop() == ("https://a.com/1", 1)
+
+
+def test_empty_claim_releases_expired_leases(engine, make_frontier):
+    survivor = make_frontier(lease_seconds=60)
+    crashed = make_frontier(lease_seconds=60)
+    crashed.push("https://a.com/1", 0)
+    assert crashed.pop()
+    assert not survivor  # Claimed, and the lease is still running
+
+    # The crashed worker never comes back and its lease runs out
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE crawl_state SET last_crawled = :at"),
+                     {"at": datetime.now(timezone.utc) - timedelta(seconds=120)})
+
+    assert survivor
+    assert survivor.pop() == ("https://a.com/1", 0)
+
+
+def test_upgrade_adds_depth_to_old_crawl_state(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE crawl_state (url TEXT PRIMARY KEY, site_id CHAR(32), status VARCHAR(20), "
+                          "last_crawled DATETIME, retry_count INTEGER, discovered_at DATETIME)"))
+        conn.execute(text("INSERT INTO crawl_state (url, status) VALUES ('https://a.com/', 'pending')"))
+
+    upgrade_tables(engine)
+    upgrade_tables(engine)  # Idempotent
+
+    assert "depth" in {column["name"] for column in inspect(engine).get_columns("crawl_state")}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT depth FROM crawl_state")).scalar() == 0
+
+
+def test_retry_returns_the_url_to_pending(engine, make_frontier):
+    frontier = make_frontier(max_retries=2)
+    frontier.push("https://a.com/1", 2)
+    assert frontier.pop() == ("https://a.com/1", 2)
+
+    frontier.retry("https://a.com/1", 2)
+    assert statuses(engine) == {"https://a.com/1": "pending"}
+    assert frontier.pop() == ("https://a.com/1", 2)
+    frontier.retry("https://a.com/1", 2)
+    assert statuses(engine) == {"https://a.com/1": "failed"}
+
+
+def test_only_fetched_urls_are_completed(engine, make_frontier):
+    frontier = make_frontier()
+    for path in ("ok", "seen", "gone", "down"):
+        frontier.push(f"https://a.com/{path}", 0)
+    while frontier.pop():
+        pass
+    frontier.mark_done("https://a.com/ok")
+    frontier.skip("https://a.com/seen")
+    frontier.mark_done("https://a.com/gone", success=False, retryable=False)
+    frontier.mark_done("https://a.com/down", success=False)
+
+    assert statuses(engine) == {"https://a.com/ok": "completed", "https://a.com/seen": "skipped",
+                                "https://a.com/gone": "failed", "https://a.com/down": "pending"}
+    assert frontier.pop() == ("https://a.com/down", 0)
+    assert frontier.is_retry("https://a.com/down")
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from crawler.rate_controller import RateController, min_delay_from_rate_limit, parse_retry_after
+
+
+def test_speeds_up_while_healthy_down_to_the_ceiling():
+    controller = RateController(initial_delay=1.0, min_delay=0.5, max_concurrency=3, rate_step=0.5, stable_window=2)
+    for _ in range(20):
+        controller.record("a.com", 200, 0.1)
+
+    assert controller.get_delay("a.com") == pytest.approx(0.5)
+    assert controller.get_concurrency("a.com") == 3
+
+
+def test_backs_off_sharply_and_honours_retry_after():
+    controller = RateController(initial_delay=1.0, min_delay=0.2, max_concurrency=4, stable_window=1)
+    for _ in range(10):
+        controller.record("a.com", 200, 0.1)
+    fast_delay = controller.get_delay("a.com")
+
+    pause = controller.record("a.com", 429, 0.1, retry_after="30")
+
+    assert pause == 30
+    assert controller.get_delay("a.com") == pytest.approx(fast_delay * 2)
+    assert controller.get_concurrency("a.com") == 2
+    assert controller.record("a.com", 503, 0.1) == 0.0
+    assert controller.get_delay("a.com") == pytest.approx(fast_delay * 4)
+
+
+def test_latency_spike_lowers_concurrency_without_speeding_up():
+    controller = RateController(initial_delay=1.0, min_delay=0.1, max_concurrency=3, stable_window=1)
+    for _ in range(3):
+        controller.record("a.com", 200, 0.1)
+    delay, concurrency = controller.get_delay("a.com"), controller.get_concurrency("a.com")
+
+    controller.record("a.com", 200, 2.0)
+
+    assert controller.get_delay("a.com") == delay
+    assert controller.get_concurrency("a.com") == concurrency - 1
+
+
+def test_site_ceiling_and_crawl_delay_are_floors():
+    controller = RateController(initial_delay=1.0, min_delay=0.0, stable_window=1,
+                                domain_min_delays={"slow.com": min_delay_from_rate_limit({'requests_per_minute': 20})})
+    controller.set_min_delay("fast.com", 0.5)
+    for _ in range(50):
+        controller.record("slow.com", 200, 0.1)
+        controller.record("fast.com", 200, 0.1)
+
+    assert controller.get_delay("slow.com") == pytest.approx(3.0)
+    assert controller.get_delay("fast.com") == pytest.approx(0.5)
+
+
+def test_parse_retry_after():
+    now = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("Mon, 01 Jan 2024 12:01:30 GMT", now=now) == 90
+    assert parse_retry_after("soon") is None
@@ -0,0 +1,102 @@
+import pytest
+
+from crawler.redis_frontier import RedisFrontier
+from crawler.visited_store import RedisVisitedStore
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def make_worker(server, **kwargs):
+    return RedisFrontier(client=fakeredis.FakeRedis(server=server), crawl_id='test', **kwargs)
+
+
+def test_workers_share_one_queue_without_duplicates(server):
+    first, second = make_worker(server, default_delay=0), make_worker(server, default_delay=0)
+    for i in range(10):
+        first.push(f"https://a.com/{i}", 1)
+        second.push(f"https://b.com/{i}", 1)
+    first.push("https://a.com/0", 1)  # Already queued
+
+    assert len(second) == 20
+    popped = []
+    while True:
+        items = [worker.pop() for worker in (first, second)]
+        if not any(items):
+            break
+        popped.extend(item[0] for item in items if item)
+
+    assert sorted(popped) == sorted([f"https://a.com/{i}" for i in range(10)] +
+                                    [f"https://b.com/{i}" for i in range(10)])
+    assert not first.pop() and len(first) == 0
+
+
+def test_domain_lease_applies_across_workers(server):
+    first, second = make_worker(server, default_delay=60), make_worker(server, default_delay=60)
+    first.push("https://a.com/1", 0)
+    first.push("https://a.com/2", 0)
+    first.push("https://b.com/1", 0)
+
+    taken = {first.pop()[0], second.pop()[0]}
+    assert taken == {"https://a.com/1", "https://b.com/1"}
+    # Both domains are leased for 60 seconds, whichever worker asks
+    assert first.pop() is None and second.pop() is None
+    assert first.time_until_ready() > 50
+
+
+def test_in_flight_urls_keep_other_workers_running(server):
+    first, second = make_worker(server, default_delay=0), make_worker(server, default_delay=0)
+    first.push("https://a.com/1", 0)
+    url, _ = first.pop()
+
+    assert second  # first may still add links
+    first.mark_done(url)
+    assert not second
+
+
+def test_bfs_and_priority_order(server):
+    bfs = make_worker(server, default_delay=0)
+    bfs.push("https://a.com/1", 0)
+    bfs.push("https://a.com/2", 1)
+    assert bfs.pop() == ("https://a.com/1", 0)
+
+    scores = {"https://c.com/nav": 0.0, "https://c.com/product": 3.0}
+    priority = RedisFrontier(client=fakeredis.FakeRedis(server=server), crawl_id='prio', strategy='priority',
+                             default_delay=0, scorer=lambda url, depth: scores[url])
+    for url in scores:
+        priority.push(url, 1)
+    assert priority.pop() == ("https://c.com/product", 1)
+
+
+@pytest.mark.parametrize("mode", ['set', 'bloom'])
+def test_visited_store_claims_each_url_once(server, mode):
+    stores = [RedisVisitedStore(client=fakeredis.FakeRedis(server=server), mode=mode, capacity=1000)
+              for _ in range(2)]
+    assert stores[0].add_if_new("https://a.com/1")
+    assert not stores[1].add_if_new("https://a.com/1")
+    assert "https://a.com/1" in stores[1]
+    assert "https://a.com/2" not in stores[1]
+    assert len(stores[1]) == 1
+
+
+def test_urls_of_a_dead_worker_are_queued_again(server):
+    dead, survivor = make_worker(server, default_delay=0, lease_seconds=60), \
+        make_worker(server, default_delay=0, lease_seconds=60, poll_interval=0)
+    dead.push("https://a.com/1", 2)
+    assert dead.pop() == ("https://a.com/1", 2)
+    assert survivor.pop() is None and not survivor.is_retry("https://a.com/1")
+
+    # The worker dies without reporting the fetch, and its lease runs out
+    client = fakeredis.FakeRedis(server=server)
+    client.zadd("crawler:test:inflight", {"https://a.com/1": 0})
+
+    assert survivor
+    assert survivor.pop() == ("https://a.com/1", 2)
+    # Already in the shared visited set, so the crawler must not filter it out
+    assert survivor.is_retry("https://a.com/1")
+    survivor.mark_done("https://a.com/1")
+    assert not survivor.release_expired_leases() and not survivor
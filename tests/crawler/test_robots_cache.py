@@ -0,0 +1,96 @@
+import json
+import threading
+
+import pytest
+import requests
+
+from crawler import robots_cache as robots_module
+from crawler.robots_cache import RobotsCache
+
+
+class _Response:
+    def __init__(self, status_code, text=''):
+        self.status_code, self.text = status_code, text
+
+
+class _FakeSession:
+    """Answers robots.txt requests from a list of responses or exceptions, in order."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.requests = 0
+
+    def get(self, url, timeout=None):
+        self.requests += 1
+        answer = self.answers.pop(0) if len(self.answers) > 1 else self.answers[0]
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(robots_module.time, 'time', lambda: now[0])
+    return now
+
+
+def make_cache(session, **options):
+    options.setdefault('max_workers', 2)
+    cache = RobotsCache(**options)
+    cache._session = session
+    return cache
+
+
+def test_robots_txt_is_kept_for_its_ttl(clock):
+    session = _FakeSession(_Response(200, "User-agent: *\nDisallow: /private\nCrawl-delay: 0.5\n"))
+    cache = make_cache(session, ttl=60)
+
+    assert cache.can_fetch('bot', 'https://shop.com/items')
+    assert not cache.can_fetch('bot', 'https://shop.com/private/1')
+    assert cache.crawl_delay('bot', 'https://shop.com/') == 0.5
+    assert session.requests == 1
+
+    clock[0] += 61
+    assert not cache.is_cached('https://shop.com/')
+    cache.can_fetch('bot', 'https://shop.com/items')
+    assert session.requests == 2
+
+
+def test_failed_fetches_are_cached_for_the_negative_ttl(clock):
+    session = _FakeSession(requests.ConnectionError("unreachable"), _Response(200, ""))
+    cache = make_cache(session, ttl=3600, negative_ttl=10)
+
+    assert not cache.can_fetch('bot', 'https://down.com/')
+    assert not cache.can_fetch('bot', 'https://down.com/other')
+    assert session.requests == 1
+
+    clock[0] += 11
+    assert cache.can_fetch('bot', 'https://down.com/')
+    assert session.requests == 2
+
+
+def test_unexpected_errors_do_not_leave_a_failed_fetch_in_flight():
+    session = _FakeSession(UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid'))
+    cache = make_cache(session, allow_on_error=True)
+
+    assert cache.can_fetch('bot', 'https://odd.com/')
+    assert not cache._in_flight
+    assert cache.is_cached('https://odd.com/')
+
+
+def test_concurrent_saves_keep_a_valid_file(tmp_path):
+    path = tmp_path / "robots.json"
+    cache = make_cache(_FakeSession(_Response(404)), persist_path=str(path), max_workers=8)
+    hosts = [f"https://host{i}.com/" for i in range(40)]
+
+    threads = [threading.Thread(target=cache.can_fetch, args=('bot', host)) for host in hosts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(json.loads(path.read_text())) == {host.rstrip('/') for host in hosts}
+    assert list(tmp_path.iterdir()) == [path]
+    reloaded = RobotsCache(persist_path=str(path))
+    assert all(reloaded.is_cached(host) for host in hosts)
@@ -0,0 +1,73 @@
+import pytest
+from crawler.scheduler import DomainScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def test_serves_ready_domain_while_other_is_rate_limited(clock):
+    scheduler = DomainScheduler(strategy='bfs', default_delay=5.0, clock=clock)
+    scheduler.push("https://a.com/1", 0)
+    scheduler.push("https://a.com/2", 0)
+    scheduler.push("https://b.com/1", 0)
+
+    assert scheduler.pop() == ("https://a.com/1", 0)
+    scheduler.record_fetch("a.com")
+
+    # a.com is cooling down, so b.com is served instead of blocking
+    assert scheduler.pop() == ("https://b.com/1", 0)
+    scheduler.record_fetch("b.com")
+
+    assert scheduler.pop() is None
+    assert scheduler.time_until_ready() == pytest.approx(5.0)
+
+    clock.now += 5.0
+    assert scheduler.pop() == ("https://a.com/2", 0)
+    assert len(scheduler) == 0
+
+def test_strategy_orders_urls_within_a_domain(clock):
+    bfs = DomainScheduler(strategy='bfs', default_delay=0, clock=clock)
+    dfs = DomainScheduler(strategy='dfs', default_delay=0, clock=clock)
+    for scheduler in (bfs, dfs):
+        scheduler.push("https://a.com/1", 0)
+        scheduler.push("https://a.com/2", 1)
+
+    assert bfs.pop() == ("https://a.com/1", 0)
+    assert dfs.pop() == ("https://a.com/2", 1)
+
+def test_per_domain_delay_override(clock):
+    scheduler = DomainScheduler(default_delay=1.0, clock=clock)
+    scheduler.set_delay("slow.com", 10.0)
+    scheduler.push("https://slow.com/1", 0)
+    scheduler.push("https://slow.com/2", 0)
+
+    scheduler.pop()
+    scheduler.record_fetch("slow.com")
+    clock.now += 1.0
+    assert scheduler.pop() is None
+    clock.now += 9.0
+    assert scheduler.pop() == ("https://slow.com/2", 0)
+
+def test_unsupported_strategy():
+    with pytest.raises(ValueError):
+        DomainScheduler(strategy='random')
+
+def test_priority_strategy_pops_highest_score_first(clock):
+    scores = {"https://a.com/nav": 0.0, "https://a.com/product/1": 5.0, "https://a.com/about": -1.0}
+    scheduler = DomainScheduler(strategy='priority', default_delay=0, clock=clock,
+                                scorer=lambda url, depth: scores[url])
+    for url in scores:
+        scheduler.push(url, 1)
+
+    assert [scheduler.pop()[0] for _ in range(3)] == [
+        "https://a.com/product/1", "https://a.com/nav", "https://a.com/about"
+    ]
@@ -0,0 +1,44 @@
+from crawler.link_extractor import LinkExtractor
+from crawler.simhash import NearDuplicateDetector, SimHashIndex, hamming_distance, simhash
+
+ARTICLE = " ".join(
+    f"Paragraph {i} describes product number {i * 7} with its price, rating and delivery options."
+    for i in range(40)
+)
+
+
+def test_similar_texts_get_close_fingerprints():
+    original, shingles = simhash(ARTICLE)
+    near, _ = simhash(ARTICLE + " Sorted by price, ascending.")
+    other, _ = simhash("Completely different text about the weather in the mountains and rivers. " * 20)
+    assert shingles > 100
+    assert hamming_distance(original, near) <= 3
+    assert hamming_distance(original, other) > 10
+    assert simhash("") == (0, 0)
+
+
+def test_index_finds_fingerprints_within_distance():
+    index = SimHashIndex(max_distance=3)
+    index.add(0b1011 << 40, "https://shop.com/a")
+    assert index.find((0b1011 << 40) ^ 0b111) == "https://shop.com/a"
+    assert index.find((0b1011 << 40) ^ 0b1111) is None
+    assert len(index) == 1
+
+
+def test_detector_prunes_near_duplicates_and_counts_them():
+    detector = NearDuplicateDetector(similarity=0.95)
+    assert detector.check("https://shop.com/list?sort=name", ARTICLE) is None
+    assert detector.check("https://shop.com/list?sort=price", ARTICLE + " Sorted by price.") == \
+        "https://shop.com/list?sort=name"
+    # Too little text to tell pages apart
+    assert detector.check("https://shop.com/a", "Out of stock") is None
+    assert detector.check("https://shop.com/b", "Out of stock") is None
+    assert (detector.pages_checked, detector.pages_pruned) == (4, 1)
+
+
+def test_extract_with_text_leaves_out_boilerplate():
+    html = ("<html><head><script>var x = 1;</script></head><body><nav><a href='/home'>Home</a></nav>"
+            "<p>Main <b>content</b></p><footer>Copyright</footer></body></html>")
+    links, text = LinkExtractor().extract_with_text(html, "https://shop.com/page")
+    assert links == {"https://shop.com/home"}
+    assert text.split() == ["Main", "content"]
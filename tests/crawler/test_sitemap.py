@@ -0,0 +1,130 @@
+import gzip
+import io
+from datetime import datetime, timezone
+
+import pytest
+import requests
+from urllib3.exceptions import ProtocolError
+
+from crawler.sitemap import SitemapReader, parse_lastmod
+
+NS = 'xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+
+
+class CutStream(io.RawIOBase):
+    """A response body whose connection drops after the first cut_at bytes."""
+
+    def __init__(self, body: bytes, cut_at: int, error: Exception):
+        self.body, self.cut_at, self.error, self.position = body, cut_at, error, 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        if self.position >= self.cut_at:
+            raise self.error
+        chunk = self.body[self.position:min(self.cut_at, self.position + len(buffer))]
+        buffer[:len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.raw = body if isinstance(body, io.RawIOBase) else io.BytesIO(body)
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, documents):
+        self.documents = documents
+        self.requested = []
+        self.responses = []
+
+    def get(self, url, timeout=None, stream=False):
+        self.requested.append(url)
+        self.responses.append(FakeResponse(self.documents[url]))
+        return self.responses[-1]
+
+
+def urlset(*entries):
+    body = "".join(
+        f"<url><loc>{loc}</loc>{f'<lastmod>{lastmod}</lastmod>' if lastmod else ''}</url>"
+        for loc, lastmod in entries
+    )
+    return f'<?xml version="1.0"?><urlset {NS}>{body}</urlset>'.encode()
+
+
+def test_follows_gzipped_sitemaps_from_an_index_and_skips_by_lastmod():
+    session = FakeSession({
+        "https://shop.com/sitemap_index.xml": (
+            f'<sitemapindex {NS}>'
+            f'<sitemap><loc>https://shop.com/products.xml.gz</loc><lastmod>2024-06-01</lastmod></sitemap>'
+            f'<sitemap><loc>https://shop.com/archive.xml</loc><lastmod>2019-01-01</lastmod></sitemap>'
+            f'</sitemapindex>'
+        ).encode(),
+        "https://shop.com/products.xml.gz": gzip.compress(urlset(
+            ("https://shop.com/p/1", "2024-06-01T08:00:00Z"),
+            ("https://shop.com/p/2", "2023-01-01"),
+            ("https://shop.com/p/3", None),
+        )),
+    })
+    reader = SitemapReader(session, modified_since=datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    urls = [url for url, _ in reader.iter_urls("https://shop.com/sitemap_index.xml")]
+
+    assert urls == ["https://shop.com/p/1", "https://shop.com/p/3"]
+    assert "https://shop.com/archive.xml" not in session.requested
+    assert reader.skipped_by_lastmod == 2
+
+
+def test_reads_lazily_without_holding_the_connection_open():
+    session = FakeSession({"https://shop.com/sitemap.xml": urlset(*((f"https://shop.com/p/{i}", None) for i in range(1000)))})
+    urls = SitemapReader(session).iter_urls("https://shop.com/sitemap.xml")
+    assert session.requested == []
+    assert next(urls)[0] == "https://shop.com/p/0"
+    # Downloaded in full before the first URL is handed out, so no idle connection can be dropped
+    assert session.responses[0].closed
+    assert len(list(urls)) == 999
+
+
+def test_oversized_sitemaps_are_read_up_to_the_cap():
+    body = urlset(*((f"https://shop.com/p/{i}", None) for i in range(1000)))
+    session = FakeSession({"https://shop.com/sitemap.xml": body})
+    urls = list(SitemapReader(session, max_bytes=len(body) // 2).iter_urls("https://shop.com/sitemap.xml"))
+    assert 0 < len(urls) < 1000 and urls[0][0] == "https://shop.com/p/0"
+
+
+@pytest.mark.parametrize("error", [
+    ProtocolError("Connection broken: IncompleteRead"),
+    requests.exceptions.ChunkedEncodingError("Connection broken"),
+])
+def test_a_dropped_connection_ends_only_that_sitemap(error):
+    products = urlset(*((f"https://shop.com/p/{i}", None) for i in range(5000)))
+    session = FakeSession({
+        "https://shop.com/sitemap_index.xml": (
+            f'<sitemapindex {NS}>'
+            f'<sitemap><loc>https://shop.com/products.xml</loc></sitemap>'
+            f'<sitemap><loc>https://shop.com/pages.xml</loc></sitemap>'
+            f'</sitemapindex>'
+        ).encode(),
+        "https://shop.com/products.xml": CutStream(products, len(products) // 2, error),
+        "https://shop.com/pages.xml": urlset(("https://shop.com/about", None)),
+    })
+
+    urls = [url for url, _ in SitemapReader(session).iter_urls("https://shop.com/sitemap_index.xml")]
+
+    assert 0 < len(urls) - 1 < 5000 and urls[0] == "https://shop.com/p/0"
+    assert urls[-1] == "https://shop.com/about"
+
+
+def test_parse_lastmod():
+    assert parse_lastmod("2024-05-01") == datetime(2024, 5, 1, tzinfo=timezone.utc)
+    assert parse_lastmod("2024-05-01T10:00:00+03:00") == datetime(2024, 5, 1, 7, tzinfo=timezone.utc)
+    assert parse_lastmod("yesterday") is None
@@ -0,0 +1,47 @@
+import pytest
+from crawler.url_canonicalizer import URLCanonicalizer
+from crawler.url_filter import URLFilter
+
+
+@pytest.fixture
+def canonicalizer():
+    return URLCanonicalizer()
+
+@pytest.mark.parametrize("variant", [
+    "https://Example.COM/catalog/phones?page=2&sort=price",
+    "https://example.com:443/catalog/phones/?sort=price&page=2",
+    "https://example.com/catalog/phones?sort=price&page=2&utm_source=newsletter#reviews",
+    "https://example.com/catalog/phones;jsessionid=ABC123?sort=price&page=2&fbclid=xyz",
+])
+def test_variants_share_canonical_form(canonicalizer, variant):
+    assert canonicalizer.canonicalize(variant) == "https://example.com/catalog/phones?page=2&sort=price"
+
+def test_non_default_port_and_root_path_are_kept(canonicalizer):
+    assert canonicalizer.canonicalize("http://example.com:8080") == "http://example.com:8080/"
+
+def test_site_rules_drop_and_keep_params():
+    canonicalizer = URLCanonicalizer({'drop_params': ['ref', 'view_*'], 'keep_params': ['sid']})
+    url = "https://example.com/item?sid=42&ref=home&view_mode=grid&id=7"
+    assert canonicalizer.canonicalize(url) == "https://example.com/item?id=7&sid=42"
+
+def test_sorting_can_be_disabled():
+    canonicalizer = URLCanonicalizer({'sort_params': False})
+    assert canonicalizer.canonicalize("https://example.com/?b=1&a=2") == "https://example.com/?b=1&a=2"
+
+def test_url_filter_dedupes_on_canonical_form_and_counts_saved_fetches():
+    url_filter = URLFilter({})
+    url_filter.mark_as_visited("https://example.com/products?id=1")
+
+    assert not url_filter.is_valid_and_new("https://EXAMPLE.com/products/?id=1&utm_campaign=x")
+    assert not url_filter.is_valid_and_new("https://EXAMPLE.com/products/?id=1&utm_campaign=x")
+    assert not url_filter.is_valid_and_new("https://example.com/products?id=1")
+    assert url_filter.is_valid_and_new("https://example.com/products?id=2")
+    assert url_filter.get_fetches_saved() == 1
+
+def test_url_filter_applies_each_domains_rules():
+    url_filter = URLFilter({'domain_canonicalization': {'shop.com': {'drop_params': ['sort']}}})
+    url_filter.mark_as_visited("https://shop.com/list?page=1")
+    url_filter.mark_as_visited("https://blog.com/list?page=1")
+
+    assert not url_filter.is_valid_and_new("https://SHOP.com/list?page=1&sort=price")
+    assert url_filter.is_valid_and_new("https://blog.com/list?page=1&sort=price")
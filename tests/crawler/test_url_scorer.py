@@ -0,0 +1,25 @@
+from crawler.url_scorer import URLScorer, path_template
+
+
+def test_path_template_groups_detail_pages():
+    assert path_template("https://shop.com/phones/galaxy-a14-128gb-123.html?page=2&ref=x") == \
+        path_template("https://shop.com/phones/nokia-105-4521.html?ref=y&page=7") == \
+        "/phones/{id}.html?page&ref"
+    assert path_template("https://shop.com/phones/") == "/phones/"
+
+
+def test_score_combines_patterns_depth_and_learned_yield():
+    scorer = URLScorer({
+        'url_patterns': [r'/phones/'],
+        'priority': {'include_weight': 1.0, 'depth_penalty': 0.5, 'pattern_weights': {r'/help': -2.0}},
+    })
+    assert scorer.score("https://shop.com/phones/", 0) == 1.0
+    assert scorer.score("https://shop.com/help/faq", 2) == -3.0
+
+    for i in range(3):
+        scorer.record_yield(f"https://shop.com/phones/model-{i}.html", 4)
+        scorer.record_yield(f"https://shop.com/phones/?page={i}", 0)
+
+    # An unseen detail page now outranks an unseen listing page at the same depth
+    assert scorer.score("https://shop.com/phones/other-99.html", 2) > scorer.score("https://shop.com/phones/?page=9", 2)
+    assert scorer.expected_yield("https://shop.com/phones/other-99.html") == 3.0
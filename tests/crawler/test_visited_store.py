@@ -0,0 +1,69 @@
+import pytest
+from crawler.visited_store import BloomVisitedStore, DiskVisitedStore, MemoryVisitedStore, create_visited_store
+
+
+@pytest.fixture(params=['memory', 'bloom', 'disk'])
+def store(request, tmp_path):
+    if request.param == 'disk':
+        store = DiskVisitedStore(path=str(tmp_path / "visited.sqlite"), cache_size=10)
+        yield store
+        store.close()
+    elif request.param == 'bloom':
+        yield BloomVisitedStore(initial_capacity=50, error_rate=0.001)
+    else:
+        yield MemoryVisitedStore()
+
+def test_add_and_contains(store):
+    urls = [f"https://example.com/item/{i}" for i in range(200)]
+    for url in urls:
+        store.add(url)
+
+    assert all(url in store for url in urls)
+    assert len(store) == 200
+    store.add(urls[0])
+    assert len(store) == 200
+
+def test_stats_count_hits_and_misses(store):
+    store.add("https://example.com/a")
+    assert "https://example.com/a" in store
+    assert "https://example.com/b" not in store
+
+    stats = store.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["memory_bytes"] > 0
+
+def test_bloom_false_positive_rate_stays_bounded():
+    store = BloomVisitedStore(initial_capacity=1000, error_rate=0.01)
+    for i in range(5000):
+        store.add(f"https://example.com/seen/{i}")
+
+    false_positives = sum(f"https://example.com/unseen/{i}" in store for i in range(5000))
+    assert false_positives / 5000 < 0.01
+
+def test_disk_store_persists_between_instances(tmp_path):
+    path = str(tmp_path / "visited.sqlite")
+    store = DiskVisitedStore(path=path)
+    store.add("https://example.com/a")
+    store.close()
+
+    reopened = DiskVisitedStore(path=path)
+    assert "https://example.com/a" in reopened
+    assert len(reopened) == 1
+    reopened.close()
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_visited_store({'visited_backend': 'redis-cluster'})
+
+def test_url_filter_close_persists_the_disk_store(tmp_path):
+    from crawler.url_filter import URLFilter
+
+    path = str(tmp_path / "visited.sqlite")
+    url_filter = URLFilter({'visited_backend': 'disk', 'visited_options': {'path': path}})
+    assert url_filter.mark_as_visited("https://example.com/a")
+    url_filter.close()
+
+    reopened = DiskVisitedStore(path=path)
+    assert "https://example.com/a" in reopened
+    reopened.close()
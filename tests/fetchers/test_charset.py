@@ -0,0 +1,22 @@
+from crawler.link_extractor import LinkExtractor
+from fetchers.charset import resolve_encoding
+
+PAGE = '<html><head><meta charset="windows-1252"></head><body><a href="/café">Café</a></body></html>'
+
+
+def test_encoding_sources_in_order():
+    data = PAGE.encode('cp1252')
+    assert resolve_encoding(b'\xef\xbb\xbf' + data, {'Content-Type': 'text/html; charset=cp1252'}) == ('utf-8-sig', 'bom')
+    assert resolve_encoding(data, {'Content-Type': 'text/html; charset="ISO-8859-1"'}) == ('cp1252', 'header')
+    assert resolve_encoding(data, {'Content-Type': 'text/html'}) == ('cp1252', 'meta')
+    assert resolve_encoding('<p>café</p>'.encode('utf-8'), {}) == ('utf-8', 'detected')
+
+
+def test_detection_tolerates_a_character_cut_at_the_sample_boundary():
+    data = ('<p>' + 'x' * (16 * 1024 - 4) + 'ééé</p>').encode('utf-8')
+    assert resolve_encoding(data, {}) == ('utf-8', 'detected')
+
+
+def test_link_extractor_parses_bytes_in_the_given_encoding():
+    links = LinkExtractor().extract(PAGE.encode('cp1252'), 'https://shop.com/', encoding='cp1252')
+    assert links == {'https://shop.com/café'}
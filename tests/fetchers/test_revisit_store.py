@@ -0,0 +1,21 @@
+from fetchers.revisit_store import RevisitStore
+
+
+def test_validators_become_conditional_headers(tmp_path):
+    store = RevisitStore(str(tmp_path / "revisits.sqlite"))
+    store.save('crawler', 'https://shop.com/a', {'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Jan 2025 00:00:00 GMT'},
+               payload=['https://shop.com/b'])
+    store.save('crawler', 'https://shop.com/plain', {})  # No validators, nothing to store
+
+    assert store.conditional_headers('crawler', 'https://shop.com/a') == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Wed, 01 Jan 2025 00:00:00 GMT'}
+    assert store.conditional_headers('crawler', 'https://shop.com/plain') == {}
+    assert store.load_payload('crawler', 'https://shop.com/a') == ['https://shop.com/b']
+
+
+def test_namespaces_keep_their_own_validators():
+    store = RevisitStore()
+    store.save('crawler', 'https://shop.com/a', {'ETag': '"v1"'})
+
+    assert store.conditional_headers('scraper', 'https://shop.com/a') == {}
+    assert store.load_payload('scraper', 'https://shop.com/a') is None
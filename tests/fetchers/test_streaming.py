@@ -0,0 +1,61 @@
+import io
+
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from fetchers.streaming import ContentSkipped, StreamingFetcher, check_headers, sniff_content_type
+
+
+class _FakeSession:
+    def __init__(self, body: bytes, headers: dict, status_code: int = 200):
+        self.body, self.headers, self.status_code = body, headers, status_code
+
+    def get(self, url, stream=False, **kwargs):
+        response = requests.Response()
+        response.status_code = self.status_code
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.raw = io.BytesIO(self.body)
+        response.url = url
+        response.encoding = 'utf-8'
+        return response
+
+
+def test_headers_rule_out_binary_and_oversized_bodies():
+    allowed = {'text/html'}
+    assert check_headers({'Content-Type': 'application/pdf'}, allowed, 1000) == "content type application/pdf"
+    assert check_headers({'Content-Type': 'text/html', 'Content-Length': '5000'}, allowed, 1000).startswith("too large")
+    assert check_headers({'Content-Type': 'text/html; charset=utf-8', 'Content-Length': '500'}, allowed, 1000) is None
+    # No Content-Type: left to sniffing
+    assert check_headers({}, allowed, 1000) is None
+
+
+def test_sniff_content_type():
+    assert sniff_content_type(b'%PDF-1.7 ...') == 'application/pdf'
+    assert sniff_content_type(b'\xef\xbb\xbf  <!DOCTYPE html><html>') == 'text/html'
+    assert sniff_content_type(b'plain words') is None
+
+
+def test_fetcher_downloads_html_and_records_skips():
+    fetcher = StreamingFetcher(_FakeSession(b'<html>ok</html>', {'Content-Type': 'text/html'}), max_bytes=100)
+    assert fetcher.get('https://shop.com/').text == '<html>ok</html>'
+
+    fetcher.session = _FakeSession(b'<html>' + b'x' * 500 + b'</html>', {'Content-Type': 'text/html'})
+    with pytest.raises(ContentSkipped) as skipped:
+        fetcher.get('https://shop.com/huge', domain='shop.com')
+    assert skipped.value.reason == "too large (body > 100)"
+
+    fetcher.session = _FakeSession(b'\x89PNG\r\n', {'Content-Type': 'application/octet-stream'})
+    with pytest.raises(ContentSkipped):
+        fetcher.get('https://shop.com/download')
+
+    assert fetcher.stats()["skipped"] == {"too large": 1, "sniffed content type image/png": 1}
+    assert [url for url, _ in fetcher.skipped] == ['https://shop.com/huge', 'https://shop.com/download']
+
+
+def test_error_bodies_are_cut_off_at_the_size_cap():
+    fetcher = StreamingFetcher(_FakeSession(b'x' * 5000, {'Content-Type': 'text/html'}, status_code=404),
+                               max_bytes=100, chunk_size=64)
+    response = fetcher.get('https://shop.com/missing')
+    assert response.status_code == 404 and response.content == b'x' * 100
+    assert fetcher.stats()["bytes_downloaded"] == 128
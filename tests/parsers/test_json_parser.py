@@ -0,0 +1,50 @@
+import io
+
+import pytest
+
+from parsers.json_parser import JSONParser, compile_path
+
+SAMPLE_JSON = b"""
+{"data": {"products": [
+    {"name": "Phone", "price": {"amount": 199.0}, "tags": ["new", "5g"]},
+    {"name": "Tablet", "price": {"amount": 349.5}, "tags": []}
+]}}
+"""
+
+
+def test_container_and_fields_are_extracted_by_path():
+    config = {'parser_config': {
+        'container': '$.data.products[*]',
+        'fields': {'name': '$.name', 'price': '$.price.amount', 'first_tag': "$['tags'][0]", 'tags': '$.tags[*]'},
+    }}
+    assert JSONParser().parse(SAMPLE_JSON, config) == [
+        {'name': 'Phone', 'price': 199.0, 'first_tag': 'new', 'tags': ['new', '5g']},
+        {'name': 'Tablet', 'price': 349.5, 'first_tag': None, 'tags': []},
+    ]
+
+
+def test_root_container_invalid_json_and_unsupported_paths():
+    config = {'parser_config': {'container': '$', 'fields': {'last': '$.weather[-1].description'}}}
+    assert JSONParser().parse('{"weather": [{"description": "fog"}, {"description": "rain"}]}', config) == [{'last': 'rain'}]
+    assert JSONParser().parse('{"weather": ', config) == []
+    with pytest.raises(ValueError):
+        compile_path('$..name')
+    assert compile_path('$.a[*]') is compile_path('$.a[*]')
+
+
+OBJECT_JSON = b'{"data": {"a": {"name": "Phone"}, "b": {"name": "Tablet"}}, "next": "n1", "meta": {"next": "c2"}}'
+ARRAY_JSON = b'{"data": [{"name": "Phone"}], "links": [{"href": "/page/2"}], "meta": {"next": "c2"}}'
+
+
+@pytest.mark.parametrize('document, container, capture', [
+    (OBJECT_JSON, '$.data.*', '$.meta.next'),
+    (OBJECT_JSON, '$', '$.next'),
+    (ARRAY_JSON, '$.data[*]', '$.links[0].href'),
+    (ARRAY_JSON, '$.data[*]', '$.meta.next'),
+])
+def test_streamed_and_loaded_documents_give_the_same_result(document, container, capture):
+    config = {'parser_config': {'container': container, 'fields': {'name': '$.name'}}}
+    streamed, loaded = {}, {}
+    items = list(JSONParser().iter_parse(io.BytesIO(document), config, {'cursor': capture}, streamed))
+    assert items == list(JSONParser().iter_parse(document, config, {'cursor': capture}, loaded))
+    assert items and streamed == loaded and streamed['cursor'] is not None
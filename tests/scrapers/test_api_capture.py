@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+pytest.importorskip("playwright")
+
+import requests
+
+from scrapers.core.api_capture import ApiEndpoint, ResponseCapture, get_endpoint_store
+from scrapers.templates.spa_scraper import SPAScraper
+
+
+class _FakeRequest:
+    def __init__(self, url, resource_type='xhr'):
+        self.url, self.resource_type, self.method, self.post_data = url, resource_type, 'GET', None
+        self.headers = {'accept': 'application/json', 'cookie': 'session=1', ':authority': 'shop.com'}
+
+
+class _FakeResponse:
+    def __init__(self, url, payload, resource_type='xhr', status=200):
+        self.url, self.status, self.request = url, status, _FakeRequest(url, resource_type)
+        self.payload = payload
+
+    def body(self):
+        return json.dumps(self.payload).encode()
+
+
+class _FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def wait_for_timeout(self, ms):
+        pass
+
+
+def test_capture_records_matching_api_responses_with_replayable_endpoints():
+    page = _FakePage()
+    capture = ResponseCapture(page, r'/api/search')
+    for response in [
+        _FakeResponse('https://shop.com/api/search?page=1', {'items': []}),
+        _FakeResponse('https://shop.com/api/search?page=2', {}, status=500),
+        _FakeResponse('https://shop.com/app.js', {}, resource_type='script'),
+        _FakeResponse('https://shop.com/api/search.js', {}, resource_type='script'),
+    ]:
+        page.handlers['response'](response)
+
+    assert capture.wait_for(1, 0) and not capture.wait_for(2, 0)
+    [(endpoint, body)] = capture.take()
+    assert endpoint == ApiEndpoint('https://shop.com/api/search?page=1', 'GET', {'accept': 'application/json'})
+    assert json.loads(body) == {'items': []}
+    assert capture.pending == 0
+
+
+def test_known_endpoints_are_replayed_over_http(monkeypatch):
+    store = get_endpoint_store()
+    page_url = 'https://shop.com/search?q=phones'
+    store.save('replay-shop', page_url, [ApiEndpoint('https://shop.com/api/search?q=phones')])
+    scraper = SPAScraper({
+        'name': 'replay-shop',
+        'api_capture': {'url_pattern': '/api/search', 'replay': True, 'parser_config': {
+            'container': '$.items[*]', 'fields': {'name': '$.name'}}},
+    })
+
+    class _Reply:
+        content = b'{"items": [{"name": "A"}, {"name": "B"}]}'
+
+        def raise_for_status(self):
+            pass
+
+    requested = []
+    monkeypatch.setattr(requests.Session, 'request', lambda session, method, url, **kw: requested.append(url) or _Reply())
+    monkeypatch.setattr(scraper, '_new_page', lambda context: pytest.fail("replay must not open a browser"))
+
+    assert scraper.run(page_url) == [{'name': 'A'}, {'name': 'B'}]
+    assert requested == ['https://shop.com/api/search?q=phones']
@@ -0,0 +1,85 @@
+import io
+import json
+
+import requests
+
+from parsers import json_parser
+from scrapers.templates.api_scraper import APIScraper
+
+
+class _FakeSession:
+    """Serves JSON pages by URL and records the URLs requested."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.headers = {}
+        self.requested = []
+
+    def get(self, url, stream=False, timeout=None):
+        self.requested.append(url)
+        body, headers = self.pages[url]
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.headers.update(headers)
+        response.raw = io.BytesIO(json.dumps(body).encode())
+        return response
+
+
+def _scraper(session, pagination, **config):
+    return APIScraper({'name': 'api', 'parser_type': 'json', 'pagination': pagination, 'parser_config': {
+        'container': '$.data[*]', 'fields': {'id': '$.id'}}, **config}, session=session)
+
+
+def test_cursor_and_link_header_pagination():
+    session = _FakeSession({
+        'https://api.test/items?per_page=2': ({'data': [{'id': 1}, {'id': 2}], 'meta': {'next': 'c2'}}, {}),
+        'https://api.test/items?per_page=2&cursor=c2': ({'data': [{'id': 3}], 'meta': {'next': None}}, {}),
+    })
+    scraper = _scraper(session, {'type': 'cursor', 'cursor_path': '$.meta.next'}, params={'per_page': 2})
+    assert scraper.run('https://api.test/items') == [{'id': 1}, {'id': 2}, {'id': 3}]
+
+    session = _FakeSession({
+        'https://api.test/a': ({'data': [{'id': 1}]}, {'Link': '<https://api.test/b>; rel="next"'}),
+        'https://api.test/b': ({'data': [{'id': 2}]}, {}),
+    })
+    assert _scraper(session, {'type': 'link_header'}).run('https://api.test/a') == [{'id': 1}, {'id': 2}]
+
+
+def test_offset_pagination_is_lazy_and_stops_at_an_empty_page():
+    session = _FakeSession({
+        'https://api.test/items?offset=0&limit=2': ({'data': [{'id': 1}, {'id': 2}]}, {}),
+        'https://api.test/items?offset=2&limit=2': ({'data': [{'id': 3}]}, {}),
+        'https://api.test/items?offset=4&limit=2': ({'data': []}, {}),
+    })
+    items = _scraper(session, {'type': 'offset', 'limit': 2}).iter_items('https://api.test/items')
+    assert next(items) == {'id': 1}
+    assert len(session.requested) == 1
+    assert list(items) == [{'id': 2}, {'id': 3}]
+    assert len(session.requested) == 3
+
+
+def test_large_responses_are_parsed_incrementally(monkeypatch):
+    streamed = []
+    original = json_parser.JSONParser._iter_stream
+    monkeypatch.setattr(json_parser.JSONParser, '_iter_stream',
+                        lambda self, *args: streamed.append(True) or original(self, *args))
+    session = _FakeSession({'https://api.test/big': ({'data': [{'id': i} for i in range(100)]}, {})})
+    items = _scraper(session, {}, stream_threshold=10).run('https://api.test/big')
+    assert len(items) == 100
+    assert streamed == ([True] if json_parser.ijson is not None else [])
+
+
+def test_failed_responses_are_closed_before_retrying():
+    responses = []
+
+    class _FailingSession(_FakeSession):
+        def get(self, url, stream=False, timeout=None):
+            response = super().get(url, stream, timeout)
+            response.status_code = 500
+            responses.append(response)
+            return response
+
+    session = _FailingSession({'https://api.test/items': ({'data': []}, {})})
+    assert _scraper(session, None)._request('https://api.test/items', backoff_factor=0) is None
+    assert len(responses) == 3 and all(response.raw.closed for response in responses)
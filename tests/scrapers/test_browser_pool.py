@@ -0,0 +1,97 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from scrapers.core import browser_pool
+from scrapers.core.browser_pool import BrowserPool
+
+
+class _FakeContext:
+    def __init__(self, options):
+        self.options = options
+        self.handlers = {}
+        self.closed = False
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def new_page(self):
+        self.handlers['page'](object())
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.contexts = []
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def new_context(self, **options):
+        self.contexts.append(_FakeContext(options))
+        return self.contexts[-1]
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+    def crash(self):
+        self.connected = False
+        self.handlers['disconnected'](self)
+
+
+class _FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = self
+
+    def start(self):
+        return self
+
+    def launch(self, headless=True):
+        self.browsers.append(_FakeBrowser())
+        return self.browsers[-1]
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def playwright(monkeypatch):
+    fake = _FakePlaywright()
+    monkeypatch.setattr(browser_pool, 'sync_playwright', lambda: fake)
+    return fake
+
+
+def test_jobs_reuse_a_browser_with_fresh_configured_contexts(playwright):
+    pool = BrowserPool(max_pages_per_browser=10)
+    config = {'headless': True, 'viewport': {'width': 1920, 'height': 1080}, 'user_agent': 'UA', 'block_resources': []}
+    for _ in range(3):
+        with pool.context(config) as context:
+            context.new_page()
+            assert context.options == {'viewport': {'width': 1920, 'height': 1080}, 'user_agent': 'UA'}
+        assert context.closed
+    assert len(playwright.browsers) == 1
+    assert pool.stats() == {"jobs": 3, "browsers_launched": 1, "browsers_open": 1}
+
+
+def test_browsers_are_recycled_after_n_pages_and_on_crash(playwright):
+    pool = BrowserPool(max_pages_per_browser=2)
+    for _ in range(2):
+        with pool.context() as context:
+            context.new_page()
+    # The first browser opened two pages and was closed after its last job
+    assert not playwright.browsers[0].is_connected()
+
+    with pool.context() as context:
+        playwright.browsers[1].crash()
+    with pool.context() as context:
+        context.new_page()
+    assert len(playwright.browsers) == 3
+    assert pool.stats()["browsers_open"] == 1
@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from scrapers.core.page_waiter import PageWaiter
+
+
+class _FakeRequest:
+    resource_type = 'xhr'
+
+
+class _FakePage:
+    """Finishes its one XHR after finish_after seconds of waiting; the condition holds once it has."""
+
+    def __init__(self, finish_after):
+        self.handlers = {}
+        self.finish_after = finish_after
+        self.request = _FakeRequest()
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def start_request(self):
+        self.started = time.monotonic()
+        self.handlers['request'](self.request)
+
+    def wait_for_timeout(self, ms):
+        time.sleep(ms / 1000)
+        if time.monotonic() - self.started >= self.finish_after:
+            self.handlers['requestfinished'](self.request)
+
+    def wait_for_function(self, condition, arg=None, timeout=None, polling=None):
+        if self.finish_after * 1000 > timeout:
+            time.sleep(timeout / 1000)
+            raise PlaywrightTimeoutError("timed out")
+
+
+def test_waits_end_when_the_network_goes_quiet_and_are_bounded_by_the_delay():
+    page = _FakePage(finish_after=0.05)
+    waiter = PageWaiter(page, {'quiet_ms': 50, 'poll_ms': 10})
+
+    page.start_request()
+    started = time.monotonic()
+    assert waiter.for_network_idle(2000)
+    assert 0.1 <= time.monotonic() - started < 1
+
+    page = _FakePage(finish_after=5)
+    waiter = PageWaiter(page, {'quiet_ms': 50, 'poll_ms': 10})
+    page.start_request()
+    assert not waiter.until("() => window.loaded", timeout_ms=100)
+    assert not waiter.for_network_idle(100)
+    assert waiter.finish_page()["waits"] == 2 and waiter.finish_page()["met"] == 0
+    assert 0.2 <= waiter.finish_page()["seconds"] < 1
@@ -0,0 +1,91 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from scrapers.core.resource_blocker import ResourceBlocker
+
+
+class _FakeRequest:
+    def __init__(self, url, resource_type, size=0):
+        self.url, self.resource_type, self.size = url, resource_type, size
+
+    def sizes(self):
+        return {'responseBodySize': self.size}
+
+
+class _FakeRoute:
+    def __init__(self):
+        self.outcome = None
+
+    def continue_(self):
+        self.outcome = 'continued'
+
+    def abort(self, error_code=None):
+        self.outcome = 'aborted'
+
+
+class _FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def route(self, pattern, handler):
+        self.handlers['route'] = handler
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def load(self, requests):
+        outcomes = []
+        for request in requests:
+            route = _FakeRoute()
+            self.handlers['route'](route, request)
+            outcomes.append(route.outcome)
+            if route.outcome == 'continued':
+                self.handlers['requestfinished'](request)
+        return outcomes
+
+
+def test_should_block_defaults_config_forms_and_allowlist():
+    blocker = ResourceBlocker({'domains': ['tracker.example'], 'allow': [r'cdn\.shop\.com/critical']})
+    assert blocker.should_block('https://shop.com/logo.png', 'image') == 'image'
+    assert blocker.should_block('https://www.google-analytics.com/collect', 'xhr') == 'analytics'
+    assert blocker.should_block('https://a.tracker.example/t.js', 'script') == 'analytics'
+    assert blocker.should_block('https://cdn.shop.com/critical/hero.png', 'image') is None
+    assert blocker.should_block('https://shop.com/app.css', 'stylesheet') is None
+
+    assert ResourceBlocker(['stylesheet']).should_block('https://shop.com/app.css', 'stylesheet') == 'stylesheet'
+    assert not ResourceBlocker(False).active
+
+
+def test_blocked_pages_are_reported_against_calibration_pages():
+    blocker = ResourceBlocker({'calibrate_every': 10})
+    page = _FakePage()
+    resources = blocker.attach(page)
+    requests = [
+        _FakeRequest('https://shop.com/', 'document', 20000),
+        _FakeRequest('https://shop.com/a.jpg', 'image', 30000),
+        _FakeRequest('https://shop.com/b.jpg', 'image', 50000),
+        _FakeRequest('https://googletagmanager.com/gtm.js', 'script', 10000),
+    ]
+
+    # The first page of a site is loaded in full to learn what blocking saves
+    resources.start_page('https://shop.com/1')
+    assert page.load(requests) == ['continued'] * 4
+    assert resources.finish_page()["calibration"]
+
+    resources.start_page('https://shop.com/2')
+    assert page.load(requests) == ['continued', 'aborted', 'aborted', 'aborted']
+    report = resources.finish_page()
+    assert report["blocked"] == {'image': 2, 'analytics': 1}
+    assert report["bytes_saved"] == 2 * 40000 + 10000
+    assert blocker.totals["requests_blocked"] == 3
+
+
+@pytest.mark.parametrize("calibrate_every, expected", [
+    (1, [True, True, True, True]),
+    (3, [True, False, False, True]),
+    (0, [False, False, False, False]),
+])
+def test_calibration_schedule(calibrate_every, expected):
+    blocker = ResourceBlocker({'calibrate_every': calibrate_every})
+    assert [blocker._next_page_calibrates() for _ in expected] == expected
@@ -0,0 +1,86 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from scrapers.templates import spa_scraper
+from scrapers.templates.spa_scraper import SPAScraper, _DetailWorkers, _RateLimiter, _site_rate_limiter
+
+
+class _FakePage:
+    def __init__(self):
+        self.name = threading.current_thread().name
+
+    def on(self, event, handler):
+        pass
+
+
+class _FakePool:
+    @contextmanager
+    def context(self, browser_config=None):
+        yield self
+
+    def new_page(self):
+        return _FakePage()
+
+
+def test_detail_pages_are_scraped_concurrently_and_merged_by_item(monkeypatch):
+    monkeypatch.setattr(spa_scraper, 'get_browser_pool', lambda **options: _FakePool())
+    scraper = SPAScraper({
+        'name': 'shop',
+        'browser_config': {'block_resources': False},
+        'detail_parser': {'url_field': 'url', 'field_prefix': 'detail_', 'max_pages': 5,
+                          'concurrency': 3, 'rate_limit': {'delay': 0}, 'base_url': 'https://shop.com'},
+    })
+    pages_used = set()
+
+    def scrape_detail_page(page, url, config):
+        pages_used.add(page.name)
+        time.sleep(random.uniform(0, 0.02))
+        return {} if url.endswith('/3') else {'sku': url.rsplit('/', 1)[1]}
+
+    monkeypatch.setattr(scraper, '_scrape_detail_page', scrape_detail_page)
+    items = [{'url': f'/p/{i}'} for i in range(1, 7)]
+    items[1] = {'url': None}
+
+    result = scraper._scrape_detail_pages('listing-page', items)
+
+    assert result == [
+        {'url': '/p/1', 'detail_sku': '1'}, {'url': None}, {'url': '/p/3'},
+        {'url': '/p/4', 'detail_sku': '4'}, {'url': '/p/5', 'detail_sku': '5'},
+    ]
+    # Workers use their own pages, not the listing page's tab
+    assert pages_used and all(page.startswith('spa-detail') for page in pages_used)
+
+
+def test_rate_limiter_spaces_requests_across_threads():
+    limiter = _RateLimiter(0.05)
+    starts = []
+    threads = [threading.Thread(target=lambda: (limiter.wait(), starts.append(time.monotonic()))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    starts.sort()
+    assert all(later - earlier >= 0.045 for earlier, later in zip(starts, starts[1:]))
+
+
+def test_scrapes_of_a_site_share_one_rate_limiter():
+    first = _site_rate_limiter('limited-shop', 2)
+    assert _site_rate_limiter('limited-shop', 1) is first and first.interval == 1
+    assert _site_rate_limiter('other-shop', 1) is not first
+
+
+def test_worker_threads_close_their_own_browser_pools(monkeypatch):
+    closed_by = []
+    monkeypatch.setattr(spa_scraper, 'close_browser_pool', lambda: closed_by.append(threading.current_thread().name))
+    workers = _DetailWorkers(3)
+
+    assert workers.submit(lambda a, b: a + b, 1, 2).result() == 3
+    workers.shutdown()
+
+    assert sorted(closed_by) == ['spa-detail-0', 'spa-detail-1', 'spa-detail-2']
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("playwright")
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from scrapers.templates.spa_scraper import SPAScraper
+
+
+class _InfiniteScrollPage:
+    """Returns the next batch of unseen containers on each collection, like the page's JS does."""
+
+    def __init__(self, batches):
+        self.batches = list(batches)
+        self.collections = 0
+
+    def evaluate(self, script, args=None):
+        self.collections += 1
+        return self.batches.pop(0) if self.batches else []
+
+    def on(self, event, handler):
+        pass
+
+    def wait_for_function(self, condition, arg=None, timeout=None, polling=None):
+        if not self.batches:
+            raise PlaywrightTimeoutError("no new items")
+
+    def wait_for_timeout(self, ms):
+        pass
+
+    def content(self):
+        raise AssertionError("incremental scrolling must not re-read the whole page")
+
+
+def _card(sku, name):
+    return f'<div class="card" data-sku="{sku}"><h2>{name}</h2></div>'
+
+
+def test_scroll_pagination_parses_only_new_containers_and_dedupes():
+    scraper = SPAScraper({
+        'name': 'shop',
+        'parser_type': 'css',
+        'parser_config': {'container': 'main div.card', 'fields': {'name': 'h2'}},
+        'pagination': {'type': 'scroll', 'max_pages': 5, 'delay': 0, 'dedupe_key': 'name'},
+        'browser_config': {'block_resources': False, 'wait': {'quiet_ms': 0}},
+    })
+    scraper._scroll_page = lambda page: None
+    page = _InfiniteScrollPage([
+        [_card(1, 'A')],                   # already parsed with the first page
+        [_card(2, 'B'), _card(3, 'C')],
+        [_card(4, 'C')],
+    ])
+
+    items = scraper._handle_scroll_pagination(page)
+
+    assert [item['name'] for item in items] == ['B', 'C', 'C']
+    # Stopped after the first scroll that loaded nothing
+    assert page.collections == 4
+    assert [item['name'] for item in scraper._dedupe_items([{'name': 'A'}] + items)] == ['A', 'B', 'C']
@@ -0,0 +1,99 @@
+import pytest
+
+pytest.importorskip("playwright")
+pytest.importorskip("prometheus_client")
+
+from fetchers.page import FetchedPage
+from scrapers.core import static_probe
+from scrapers.core.static_probe import SPA, STATIC, StaticProbe
+from scrapers.core.universal_scraper import UniversalScraper
+from scrapers.templates.html_scraper import FAILED, NOT_MODIFIED, PARSED, HTMLScraper
+from scrapers.templates.spa_scraper import SPAScraper
+
+
+@pytest.fixture
+def runs(monkeypatch):
+    monkeypatch.setattr(static_probe, '_probe', StaticProbe())
+    runs = {'html': 0, 'spa': 0, 'static_items': 3, 'outcome': PARSED}
+
+    def html_scrape(scraper, url, prefetched=None):
+        runs['html'] += 1
+        if runs['outcome'] != PARSED:
+            return [], runs['outcome']
+        return [{'n': i} for i in range(runs['static_items'])], PARSED
+
+    def spa_run(scraper, url):
+        runs['spa'] += 1
+        return [{'n': 0}]
+
+    monkeypatch.setattr(HTMLScraper, 'scrape', html_scrape)
+    monkeypatch.setattr(SPAScraper, 'run', spa_run)
+    return runs
+
+
+def test_server_rendered_spa_sites_skip_the_browser(runs):
+    config = {'name': 'shop', 'type': 'spa', 'static_probe': {'min_items': 2}}
+    scraper = UniversalScraper()
+    assert len(scraper.scrape_site(config, 'https://shop.com/1')) == 3
+    assert len(scraper.scrape_site(config, 'https://shop.com/2')) == 3
+    assert runs['html'] == 2 and runs['spa'] == 0
+    assert static_probe.get_static_probe().decision('shop') == STATIC
+
+    # Once the static page comes up short, the browser is used until the decision expires
+    runs['static_items'] = 1
+    assert scraper.scrape_site(config, 'https://shop.com/3') == [{'n': 0}]
+    assert scraper.scrape_site(config, 'https://shop.com/4') == [{'n': 0}]
+    assert runs['html'] == 3 and runs['spa'] == 2
+    assert static_probe.get_static_probe().decision('shop') == SPA
+
+
+def test_unchanged_pages_are_skipped_without_a_decision(runs):
+    config = {'name': 'shop', 'type': 'spa', 'static_probe': {'min_items': 2}}
+    runs['outcome'] = NOT_MODIFIED
+    assert UniversalScraper().scrape_site(config, 'https://shop.com/1') == []
+    assert runs['spa'] == 0
+    assert static_probe.get_static_probe().decision('shop') is None
+
+
+def test_failed_static_fetches_use_the_browser_without_a_decision(runs):
+    config = {'name': 'shop', 'type': 'spa', 'static_probe': {'min_items': 2}}
+    scraper = UniversalScraper()
+    runs['outcome'] = FAILED
+    assert scraper.scrape_site(config, 'https://shop.com/1') == [{'n': 0}]
+    assert static_probe.get_static_probe().decision('shop') is None
+
+    # The next page is probed again
+    runs['outcome'] = PARSED
+    assert len(scraper.scrape_site(config, 'https://shop.com/2')) == 3
+    assert runs['html'] == 2 and runs['spa'] == 1
+
+
+def test_probe_is_opt_in_and_skipped_for_browser_only_features(runs):
+    scraper = UniversalScraper()
+    scraper.scrape_site({'name': 'a', 'type': 'spa'}, 'https://a.com/')
+    scraper.scrape_site({'name': 'b', 'type': 'spa', 'static_probe': True, 'pagination': {'type': 'click'}}, 'https://b.com/')
+    assert runs['html'] == 0 and runs['spa'] == 2
+
+
+def test_browser_time_estimate_falls_back_to_configured_then_global_average():
+    probe = StaticProbe()
+    assert probe.estimated_browser_seconds('new') is None
+
+    probe.record_browser_run('a', 4.0)
+    probe.record_browser_run('b', 8.0)
+    assert probe.estimated_browser_seconds('a') == 4.0
+    assert probe.estimated_browser_seconds('new', configured=5) == 5.0
+    assert probe.estimated_browser_seconds('new') == 6.0
+
+
+def test_html_scraper_tells_unchanged_and_failed_pages_from_parsed_ones(tmp_path, monkeypatch):
+    config = {'name': 'shop', 'revisit_cache': str(tmp_path / 'revisits.sqlite'), 'parser_type': 'xpath',
+              'parser_config': {'container': '//li', 'fields': {'name': './text()'}}}
+    page = FetchedPage(url='https://shop.com/', status_code=200, headers={'ETag': '"v1"'},
+                       content=b'<ul><li>Phone</li></ul>', encoding='utf-8')
+    scraper = HTMLScraper(config)
+
+    assert scraper.scrape(page.url, prefetched=page) == ([{'name': 'Phone'}], PARSED)
+    assert scraper.scrape(page.url, prefetched=page) == ([], NOT_MODIFIED)
+    monkeypatch.setattr(scraper, '_fetch_page', lambda url: None)
+    assert scraper.scrape('https://shop.com/gone') == ([], FAILED)